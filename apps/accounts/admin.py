@@ -1,9 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Count
 from django.utils.html import format_html
 from .models import (
     User, CandidateProfile, Education, Experience, 
-    Skill, Language, Certification, Reference
+    Skill, Language, Certification, Reference,
+    CanonicalSkill, SkillAlias, ResumeDocument
 )
 
 
@@ -61,11 +63,11 @@ class ReferenceInline(admin.TabularInline):
 class CandidateProfileAdmin(admin.ModelAdmin):
     list_display = (
         'user', 'current_position', 'years_of_experience', 
-        'profile_completion', 'is_active', 'updated_at'
+        'profile_completion', 'score', 'is_active', 'updated_at'
     )
     list_filter = ('is_active', 'gender', 'marital_status', 'willing_to_relocate', 'preferred_work_type')
     search_fields = ('user__first_name', 'user__last_name', 'user__email', 'current_position', 'current_company')
-    readonly_fields = ('profile_completion', 'created_at', 'updated_at')
+    readonly_fields = ('profile_completion', 'score', 'created_at', 'updated_at')
     
     fieldsets = (
         ('Utilisateur', {
@@ -95,7 +97,7 @@ class CandidateProfileAdmin(admin.ModelAdmin):
             'fields': ('willing_to_relocate', 'preferred_work_type')
         }),
         ('Métadonnées', {
-            'fields': ('profile_completion', 'is_active', 'created_at', 'updated_at'),
+            'fields': ('profile_completion', 'score', 'is_active', 'created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
@@ -124,9 +126,44 @@ class ExperienceAdmin(admin.ModelAdmin):
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
-    list_display = ('candidate', 'name', 'level', 'category', 'years_of_experience')
+    list_display = ('candidate', 'name', 'canonical_skill', 'level', 'category', 'years_of_experience')
     list_filter = ('level', 'category')
     search_fields = ('candidate__user__first_name', 'candidate__user__last_name', 'name')
+    list_select_related = ('candidate__user', 'canonical_skill')
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+    fields = ('alias',)
+
+
+@admin.register(CanonicalSkill)
+class CanonicalSkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'category', 'auto_created', 'candidate_count', 'job_count', 'created_at')
+    list_filter = ('category', 'auto_created')
+    search_fields = ('name', 'normalized_name', 'aliases__alias')
+    readonly_fields = ('normalized_name', 'auto_created', 'created_at')
+    inlines = [SkillAliasInline]
+    
+    def save_model(self, request, obj, form, change):
+        # Une compétence enregistrée dans l'administration est validée
+        obj.auto_created = False
+        super().save_model(request, obj, form, change)
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            candidate_total=Count('candidate_skills', distinct=True),
+            job_total=Count('job_skills', distinct=True),
+        )
+    
+    @admin.display(description='Candidats', ordering='candidate_total')
+    def candidate_count(self, obj):
+        return obj.candidate_total
+    
+    @admin.display(description='Offres', ordering='job_total')
+    def job_count(self, obj):
+        return obj.job_total
 
 
 @admin.register(Language)
@@ -148,3 +185,18 @@ class CertificationAdmin(admin.ModelAdmin):
 class ReferenceAdmin(admin.ModelAdmin):
     list_display = ('candidate', 'name', 'position', 'company', 'email')
     search_fields = ('candidate__user__first_name', 'candidate__user__last_name', 'name', 'company')
+
+
+@admin.register(ResumeDocument)
+class ResumeDocumentAdmin(admin.ModelAdmin):
+    list_display = ('candidate', 'source', 'application', 'status', 'extracted_at')
+    list_filter = ('source', 'status', 'extracted_at')
+    search_fields = ('candidate__user__first_name', 'candidate__user__last_name', 'tokens')
+    raw_id_fields = ('candidate', 'application')
+    readonly_fields = ('file_key', 'file_url', 'text', 'tokens', 'error', 'extracted_at', 'created_at', 'updated_at')
+    actions = ['reset_extraction']
+    
+    @admin.action(description="Relancer l'extraction")
+    def reset_extraction(self, request, queryset):
+        updated = queryset.update(status='pending', error='')
+        self.message_user(request, f"{updated} CV remis en file d'attente.")
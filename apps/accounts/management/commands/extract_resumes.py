@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from apps.accounts.resumes import extract_pending_resumes
+
+
+class Command(BaseCommand):
+    help = 'Extrait et indexe le texte des CV en attente'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help="Nombre de processus d'extraction",
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Réessayer aussi les CV en échec',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Nombre maximum de CV traités',
+        )
+
+    def handle(self, *args, **options):
+        processed = extract_pending_resumes(
+            workers=options['workers'],
+            retry_failed=options['retry_failed'],
+            limit=options['limit'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ {processed} CV traités'))
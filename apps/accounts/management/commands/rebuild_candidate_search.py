@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from apps.accounts.search import save_search_documents, search_document_queryset
+
+
+class Command(BaseCommand):
+    help = 'Reconstruit les documents de recherche de tous les candidats'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Nombre de profils traités par lot',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        profiles = search_document_queryset().order_by('pk')
+        
+        last_pk = 0
+        total = 0
+        while True:
+            chunk = list(profiles.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            total += save_search_documents(chunk)
+            last_pk = chunk[-1].pk
+            self.stdout.write(f'{total} profils indexés...')
+        
+        self.stdout.write(self.style.SUCCESS(f'✅ Documents de recherche reconstruits : {total}'))
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from apps.accounts.models import CandidateProfile
+from apps.accounts.utils import with_score_features, calculate_candidate_score
+
+
+class Command(BaseCommand):
+    help = 'Recalcule le score stocké de tous les candidats (et les scores de correspondance)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Nombre de profils traités par lot',
+        )
+        parser.add_argument(
+            '--with-matches',
+            action='store_true',
+            help='Recalculer aussi les scores de correspondance candidat/offre',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        queryset = with_score_features(
+            CandidateProfile.objects.order_by('pk')
+        ).only(
+            'id', 'profile_completion', 'years_of_experience', 'cv_file', 'cover_letter', 'score'
+        )
+        
+        last_pk = 0
+        total = 0
+        updated = 0
+        while True:
+            # Pagination par clé pour garder des requêtes constantes quel que soit le volume
+            chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            
+            changed = []
+            for candidate in chunk:
+                score = calculate_candidate_score(candidate)
+                if score != candidate.score:
+                    candidate.score = score
+                    changed.append(candidate)
+            
+            if changed:
+                CandidateProfile.objects.bulk_update(changed, ['score'])
+            
+            total += len(chunk)
+            updated += len(changed)
+            last_pk = chunk[-1].pk
+            self.stdout.write(f'{total} profils traités...')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Scores recalculés : {updated} modifiés sur {total} profils')
+        )
+        
+        if options['with_matches']:
+            self.recompute_match_scores()
+
+    def recompute_match_scores(self):
+        """Recalcule les scores de correspondance de toutes les offres ayant des candidatures"""
+        from apps.jobs.models import Job
+        from apps.dashboard.ranking import store_job_match_scores
+        
+        jobs = Job.objects.filter(applications__isnull=False).distinct().order_by('pk')
+        total = 0
+        for job in jobs.iterator():
+            total += store_job_match_scores(job)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Scores de correspondance recalculés : {total}')
+        )
@@ -0,0 +1,73 @@
+from itertools import groupby
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from apps.accounts.models import CandidateProfile, Experience
+from apps.accounts.utils import calculate_non_overlapping_years
+from apps.accounts.snapshot import CandidateSnapshot
+
+
+class Command(BaseCommand):
+    help = "Recalcule les années d'expérience de tous les candidats par lots"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Nombre de profils traités par lot',
+        )
+        parser.add_argument(
+            '--with-scores',
+            action='store_true',
+            help='Recalculer ensuite les scores des candidats',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        profiles = CandidateProfile.objects.order_by('pk').only('id', 'years_of_experience')
+
+        last_pk = 0
+        total = 0
+        updated = 0
+        while True:
+            chunk = list(profiles.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+
+            # Une seule requête par lot : les expériences arrivent groupées par candidat
+            experiences = Experience.objects.filter(
+                candidate_id__gte=chunk[0].pk, candidate_id__lte=chunk[-1].pk
+            ).order_by('candidate_id', 'start_date').values_list('candidate_id', 'start_date', 'end_date')
+
+            years_by_candidate = {
+                candidate_id: round(calculate_non_overlapping_years(
+                    (start, end) for _, start, end in rows
+                ))
+                for candidate_id, rows in groupby(experiences.iterator(), key=lambda row: row[0])
+            }
+
+            changed = []
+            for profile in chunk:
+                years = years_by_candidate.get(profile.pk, 0)
+                if years != profile.years_of_experience:
+                    profile.years_of_experience = years
+                    changed.append(profile)
+
+            if changed:
+                CandidateProfile.objects.bulk_update(changed, ['years_of_experience'])
+
+            total += len(chunk)
+            updated += len(changed)
+            last_pk = chunk[-1].pk
+            self.stdout.write(f'{total} profils traités...')
+
+        if updated:
+            # Les profils en cache ont été modifiés sans signaux
+            CandidateSnapshot.invalidate_all()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Années d'expérience recalculées : {updated} modifiées sur {total} profils")
+        )
+
+        if options['with_scores']:
+            call_command('recompute_candidate_scores', '--with-matches', stdout=self.stdout)
@@ -0,0 +1,73 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from apps.accounts.models import CandidateProfile, CandidateSearchDocument
+from apps.accounts.search import COMPLETION_BANDS, band_for
+from apps.accounts.utils import profile_completion_expression
+from apps.accounts.snapshot import CandidateSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Recalcule le pourcentage de completion de tous les profils par lots'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Nombre de profils traités par lot',
+        )
+        parser.add_argument(
+            '--with-scores',
+            action='store_true',
+            help='Recalculer ensuite les scores des candidats',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        # Le pourcentage est calculé par la base : seuls l'identifiant et les deux valeurs sont lus
+        profiles = CandidateProfile.objects.order_by('pk').annotate(
+            computed_completion=profile_completion_expression()
+        ).values_list('pk', 'profile_completion', 'computed_completion')
+
+        last_pk = 0
+        total = 0
+        updated = 0
+        while True:
+            chunk = list(profiles.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+
+            changed = [
+                CandidateProfile(pk=pk, profile_completion=computed)
+                for pk, current, computed in chunk
+                if current != computed
+            ]
+            if changed:
+                CandidateProfile.objects.bulk_update(changed, ['profile_completion'])
+                # bulk_update ne déclenche pas les signaux : tranches de recherche mises à jour ici
+                CandidateSearchDocument.objects.bulk_update(
+                    [
+                        CandidateSearchDocument(
+                            candidate_id=profile.pk,
+                            completion_band=band_for(profile.profile_completion, COMPLETION_BANDS),
+                        )
+                        for profile in changed
+                    ],
+                    ['completion_band'],
+                )
+
+            total += len(chunk)
+            updated += len(changed)
+            last_pk = chunk[-1][0]
+            self.stdout.write(f'{total} profils traités...')
+
+        if updated:
+            # Les profils en cache ont été modifiés sans signaux
+            CandidateSnapshot.invalidate_all()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Completion recalculée : {updated} profils modifiés sur {total}')
+        )
+
+        if options['with_scores']:
+            call_command('recompute_candidate_scores', '--with-matches', stdout=self.stdout)
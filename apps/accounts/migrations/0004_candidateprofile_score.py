@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_award_award_certificate_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='score',
+            field=models.FloatField(db_index=True, default=0, help_text='Score du candidat (0-100), calculé automatiquement'),
+        ),
+    ]
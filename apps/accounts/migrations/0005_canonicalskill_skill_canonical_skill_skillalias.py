@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-19 04:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_candidateprofile_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('normalized_name', models.CharField(help_text='Forme normalisée utilisée pour la résolution', max_length=100, unique=True)),
+                ('category', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Compétence de référence',
+                'verbose_name_plural': 'Compétences de référence',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='canonical_skill',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidate_skills', to='accounts.canonicalskill'),
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100)),
+                ('normalized_alias', models.CharField(max_length=100, unique=True)),
+                ('canonical_skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='accounts.canonicalskill')),
+            ],
+            options={
+                'verbose_name': 'Synonyme de compétence',
+                'verbose_name_plural': 'Synonymes de compétences',
+            },
+        ),
+    ]
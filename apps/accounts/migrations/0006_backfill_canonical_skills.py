@@ -0,0 +1,106 @@
+import re
+
+from django.db import migrations
+from unidecode import unidecode
+
+# Copie figée de apps.accounts.skills au moment de la migration : le module peut évoluer
+NON_SKILL_CHARS = re.compile(r'[^a-z0-9+#]')
+
+
+def normalize_skill_name(name):
+    return NON_SKILL_CHARS.sub('', unidecode(name or '').lower())[:100]
+
+
+# Référentiel initial : nom de référence, catégorie, synonymes
+INITIAL_SKILLS = [
+    ('JavaScript', 'programming', ['JS', 'ECMAScript', 'ES6']),
+    ('TypeScript', 'programming', ['TS']),
+    ('Python', 'programming', ['Python3', 'Py']),
+    ('Java', 'programming', ['J2EE', 'Java EE']),
+    ('C#', 'programming', ['CSharp', 'C Sharp']),
+    ('C++', 'programming', ['CPP']),
+    ('PHP', 'programming', []),
+    ('HTML', 'programming', ['HTML5']),
+    ('CSS', 'programming', ['CSS3']),
+    ('SQL', 'database', []),
+    ('PostgreSQL', 'database', ['Postgres', 'PSQL']),
+    ('MySQL', 'database', []),
+    ('MongoDB', 'database', ['Mongo']),
+    ('Django', 'framework', []),
+    ('React', 'framework', ['ReactJS', 'React.js']),
+    ('Vue.js', 'framework', ['Vue', 'VueJS']),
+    ('Angular', 'framework', ['AngularJS']),
+    ('Node.js', 'framework', ['Node', 'NodeJS']),
+    ('.NET', 'framework', ['Dotnet', 'ASP.NET']),
+    ('Docker', 'devops', []),
+    ('Kubernetes', 'devops', ['K8s']),
+    ('Amazon Web Services', 'cloud', ['AWS']),
+    ('Microsoft Azure', 'cloud', ['Azure']),
+    ('Git', 'tool', ['GitHub', 'GitLab']),
+    ('Microsoft Excel', 'tool', ['Excel', 'MS Excel']),
+    ('Microsoft Word', 'tool', ['Word', 'MS Word']),
+    ('Gestion de projet', 'management', ['Project management', 'Gestion des projets']),
+    ('Communication', 'communication', []),
+    ('Comptabilité', 'finance', ['Accounting']),
+]
+
+
+def backfill_canonical_skills(apps, schema_editor):
+    """Crée le référentiel initial puis rattache toutes les compétences existantes"""
+    CanonicalSkill = apps.get_model('accounts', 'CanonicalSkill')
+    SkillAlias = apps.get_model('accounts', 'SkillAlias')
+    Skill = apps.get_model('accounts', 'Skill')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+
+    index = {}
+    for name, category, aliases in INITIAL_SKILLS:
+        skill = CanonicalSkill.objects.create(
+            name=name, normalized_name=normalize_skill_name(name), category=category
+        )
+        index[skill.normalized_name] = skill.pk
+        alias_objects = []
+        for alias in aliases:
+            key = normalize_skill_name(alias)
+            if key and key not in index:
+                alias_objects.append(SkillAlias(canonical_skill=skill, alias=alias, normalized_alias=key))
+                index[key] = skill.pk
+        SkillAlias.objects.bulk_create(alias_objects)
+
+    # Compétences libres inconnues du référentiel : une entrée par forme normalisée
+    new_skills = {}
+    for model, field in ((Skill, 'name'), (JobSkill, 'skill_name')):
+        for raw_name in model.objects.values_list(field, flat=True).distinct().iterator():
+            key = normalize_skill_name(raw_name)
+            if key and key not in index and key not in new_skills:
+                new_skills[key] = CanonicalSkill(name=raw_name.strip()[:100], normalized_name=key)
+    if new_skills:
+        CanonicalSkill.objects.bulk_create(new_skills.values(), batch_size=1000)
+        index.update(CanonicalSkill.objects.values_list('normalized_name', 'id'))
+
+    # Rattachement par lots
+    for model, field in ((Skill, 'name'), (JobSkill, 'skill_name')):
+        batch = []
+        for row in model.objects.only('id', field).iterator(chunk_size=2000):
+            row.canonical_skill_id = index.get(normalize_skill_name(getattr(row, field)))
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ['canonical_skill'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['canonical_skill'])
+
+
+def clear_canonical_skills(apps, schema_editor):
+    apps.get_model('accounts', 'CanonicalSkill').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_canonicalskill_skill_canonical_skill_skillalias'),
+        ('jobs', '0004_jobskill_canonical_skill'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_canonical_skills, clear_canonical_skills),
+    ]
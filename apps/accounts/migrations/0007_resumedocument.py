@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-19 04:47
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_backfill_canonical_skills'),
+        ('applications', '0002_alter_application_additional_documents_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('profile_cv', 'CV du profil'), ('application_resume', 'CV de candidature')], max_length=20)),
+                ('file_key', models.CharField(help_text='Identifiant et version du fichier extrait', max_length=255)),
+                ('file_url', models.URLField(max_length=500)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('done', 'Extrait'), ('failed', 'Échec')], default='pending', max_length=10)),
+                ('error', models.CharField(blank=True, max_length=500)),
+                ('text', models.TextField(blank=True)),
+                ('tokens', models.TextField(blank=True, help_text='Mots-clés normalisés (sans accents, minuscules)')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resume_document', to='applications.application')),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_documents', to='accounts.candidateprofile')),
+            ],
+            options={
+                'verbose_name': 'CV indexé',
+                'verbose_name_plural': 'CV indexés',
+                'indexes': [models.Index(fields=['status'], name='accounts_re_status_be44d2_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('source', 'profile_cv')), fields=('candidate',), name='unique_profile_resume_document')],
+            },
+        ),
+    ]
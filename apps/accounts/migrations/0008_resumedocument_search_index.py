@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """Index GIN de la recherche plein texte (PostgreSQL uniquement)"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS accounts_resumedocument_search_gin '
+            'ON accounts_resumedocument USING GIN (search_vector)'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS accounts_resumedocument_search_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_resumedocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
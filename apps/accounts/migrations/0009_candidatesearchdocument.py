@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 04:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_resumedocument_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSearchDocument',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='accounts.candidateprofile')),
+                ('content', models.TextField(blank=True, help_text='Nom, email, poste, entreprises, compétences, technologies, formations et ville normalisés')),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('experience_band', models.PositiveSmallIntegerField(default=0)),
+                ('completion_band', models.PositiveSmallIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Document de recherche candidat',
+                'verbose_name_plural': 'Documents de recherche candidats',
+            },
+        ),
+    ]
@@ -0,0 +1,92 @@
+import re
+
+from django.db import migrations
+from unidecode import unidecode
+
+BATCH_SIZE = 2000
+
+# Copies figées de apps.accounts.search au moment de la migration : le module peut évoluer
+# (tranche, borne inférieure)
+EXPERIENCE_BANDS = [(0, 0), (1, 2), (2, 5), (3, 10)]
+COMPLETION_BANDS = [(0, 0), (1, 50), (2, 80)]
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def band_for(value, bands):
+    band = bands[0][0]
+    for key, lower_bound in bands:
+        if value >= lower_bound:
+            band = key
+    return band
+
+
+def build_search_content(values):
+    parts = dict.fromkeys(WHITESPACE.sub(' ', unidecode(value).lower()).strip() for value in values if value)
+    parts.pop('', None)
+    return ' | '.join(parts)
+
+
+def create_trigram_index(apps, schema_editor):
+    """Extension pg_trgm et index GIN trigramme (PostgreSQL uniquement)"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS accounts_candidatesearch_content_trgm '
+            'ON accounts_candidatesearchdocument USING GIN (content gin_trgm_ops)'
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS accounts_candidatesearch_content_trgm')
+
+
+def backfill_search_documents(apps, schema_editor):
+    """Construit les documents de recherche de tous les candidats existants, par lots"""
+    CandidateProfile = apps.get_model('accounts', 'CandidateProfile')
+    CandidateSearchDocument = apps.get_model('accounts', 'CandidateSearchDocument')
+
+    profiles = CandidateProfile.objects.select_related('user').prefetch_related(
+        'skills__canonical_skill', 'experiences', 'educations'
+    ).order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(profiles.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not chunk:
+            break
+        documents = []
+        for profile in chunk:
+            values = [
+                profile.user.first_name, profile.user.last_name, profile.user.email,
+                profile.current_position, profile.current_company, profile.city,
+            ]
+            for skill in profile.skills.all():
+                values.append(skill.name)
+                if skill.canonical_skill_id:
+                    values.append(skill.canonical_skill.name)
+            for experience in profile.experiences.all():
+                values.extend([experience.position, experience.company, experience.technologies_used])
+            for education in profile.educations.all():
+                values.extend([education.institution, education.degree, education.field_of_study])
+            documents.append(CandidateSearchDocument(
+                candidate_id=profile.pk,
+                content=build_search_content(values),
+                city=(profile.city or '').strip()[:100],
+                experience_band=band_for(profile.years_of_experience, EXPERIENCE_BANDS),
+                completion_band=band_for(profile.profile_completion, COMPLETION_BANDS),
+            ))
+        CandidateSearchDocument.objects.bulk_create(documents, ignore_conflicts=True)
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_candidatesearchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_candidatesearchdocument_indexes_and_backfill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='canonicalskill',
+            name='auto_created',
+            field=models.BooleanField(default=False, editable=False, help_text="Créée automatiquement depuis un nom libre, pas encore validée dans l'administration"),
+        ),
+    ]
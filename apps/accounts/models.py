@@ -1,10 +1,13 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from cloudinary.models import CloudinaryField
 from cloudinary_storage.storage import MediaCloudinaryStorage
+from django.contrib.postgres.search import SearchVectorField
 import uuid
 from django.utils import timezone
+from utils.models import DirtyFieldsMixin
 
 class User(AbstractUser):
     """Modèle utilisateur personnalisé"""
@@ -20,6 +23,8 @@ class User(AbstractUser):
     is_email_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Incrémenté pour révoquer le lien d'abonnement à l'agenda des entretiens
+    calendar_token_version = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
@@ -36,8 +41,11 @@ class User(AbstractUser):
         return f"{self.first_name} {self.last_name}"
 
 
-class CandidateProfile(models.Model):
-    """Profil détaillé du candidat"""
+class CandidateProfile(DirtyFieldsMixin, models.Model):
+    """Profil détaillé du candidat
+
+    save() n'écrit que les champs modifiés depuis le chargement (voir DirtyFieldsMixin).
+    """
     GENDER_CHOICES = (
         ('M', 'Masculin'),
         ('F', 'Féminin'),
@@ -118,6 +126,7 @@ class CandidateProfile(models.Model):
     
     # Métadonnées
     profile_completion = models.PositiveIntegerField(default=0)  # Pourcentage de completion
+    score = models.FloatField(default=0, db_index=True, help_text="Score du candidat (0-100), calculé automatiquement")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -129,77 +138,48 @@ class CandidateProfile(models.Model):
     def __str__(self):
         return f"Profil de {self.user.full_name}"
 
-    def save(self, *args, **kwargs):
-        # Plus besoin de redimensionner l'image manuellement, Cloudinary s'en charge
-        super().save(*args, **kwargs)
-
     def calculate_profile_completion(self):
-        """Calcule le pourcentage de completion du profil"""
-        fields = [
-            self.profile_picture, self.date_of_birth, self.gender, self.nationality,
-            self.address, self.city, self.country, self.mobile_phone,
-            self.current_position, self.years_of_experience, self.cv_file
-        ]
-        completed_fields = sum(1 for field in fields if field)
-        completion = (completed_fields / len(fields)) * 100
-        self.profile_completion = int(completion)
-        self.save(update_fields=['profile_completion'])
+        """Calcule le pourcentage de completion du profil à partir des valeurs en base
+
+        Le profil n'est réécrit que si le pourcentage a changé.
+        """
+        from .utils import profile_completion_expression
+
+        completion = CandidateProfile.objects.filter(pk=self.pk).annotate(
+            computed_completion=profile_completion_expression()
+        ).values_list('computed_completion', flat=True).get()
+        if completion != self.profile_completion:
+            self.profile_completion = completion
+            self.save(update_fields=['profile_completion'])
         return self.profile_completion
 
     def calculate_experience_years(self, target_position=None):
         """Calcule les années d'expérience totales et pertinentes"""
-        from datetime import date
-        from dateutil.relativedelta import relativedelta
+        from .utils import calculate_non_overlapping_years
         
-        experiences = self.experiences.all().order_by('start_date')
-        if not experiences:
-            return 0, 0
-        
-        # Fusionner les périodes qui se chevauchent
         periods = []
         relevant_periods = []
-        
-        for exp in experiences:
-            end_date = exp.end_date if exp.end_date else date.today()
-            periods.append((exp.start_date, end_date))
+        for exp in self.experiences.all():
+            periods.append((exp.start_date, exp.end_date))
             
             # Vérifier si l'expérience est pertinente
             if target_position and self._is_relevant_experience(exp.position, target_position):
-                relevant_periods.append((exp.start_date, end_date))
+                relevant_periods.append((exp.start_date, exp.end_date))
         
         # Calculer les années totales sans chevauchement
-        total_years = self._calculate_non_overlapping_years(periods)
-        relevant_years = self._calculate_non_overlapping_years(relevant_periods) if target_position else 0
+        total_years = calculate_non_overlapping_years(periods)
+        relevant_years = calculate_non_overlapping_years(relevant_periods) if target_position else 0
         
         # Mettre à jour les champs
-        self.years_of_experience = total_years
+        self.years_of_experience = round(total_years)
+        update_fields = ['years_of_experience']
         if target_position:
-            self.years_of_relevant_experience = relevant_years
-        self.save(update_fields=['years_of_experience', 'years_of_relevant_experience'])
+            self.years_of_relevant_experience = round(relevant_years)
+            update_fields.append('years_of_relevant_experience')
+        self.save(update_fields=update_fields)
         
         return total_years, relevant_years
     
-    def _calculate_non_overlapping_years(self, periods):
-        """Calcule les années sans chevauchement"""
-        if not periods:
-            return 0
-        
-        # Trier par date de début
-        periods = sorted(periods, key=lambda x: x[0])
-        
-        # Fusionner les périodes qui se chevauchent
-        merged = [periods[0]]
-        for current in periods[1:]:
-            last = merged[-1]
-            if current[0] <= last[1]:  # Chevauchement
-                merged[-1] = (last[0], max(last[1], current[1]))
-            else:
-                merged.append(current)
-        
-        # Calculer le total en années
-        total_days = sum((end - start).days for start, end in merged)
-        return round(total_days / 365.25, 1)
-    
     def _is_relevant_experience(self, position, target_position):
         """Vérifie si une expérience est pertinente pour un poste cible"""
         position_words = set(position.lower().split())
@@ -339,6 +319,61 @@ class Experience(models.Model):
         return len(common_words) > 0 or len(tech_match) > 0
 
 
+class CanonicalSkill(models.Model):
+    """Compétence de référence du référentiel (ex : JavaScript)"""
+    name = models.CharField(max_length=100, unique=True)
+    normalized_name = models.CharField(max_length=100, unique=True, help_text="Forme normalisée utilisée pour la résolution")
+    category = models.CharField(max_length=20, blank=True)
+    auto_created = models.BooleanField(
+        default=False, editable=False,
+        help_text="Créée automatiquement depuis un nom libre, pas encore validée dans l'administration"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Compétence de référence'
+        verbose_name_plural = 'Compétences de référence'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        from .skills import normalize_skill_name
+        self.normalized_name = normalize_skill_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class SkillAlias(models.Model):
+    """Synonyme d'une compétence de référence (ex : JS, Javascript, java script)"""
+    canonical_skill = models.ForeignKey(CanonicalSkill, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100)
+    normalized_alias = models.CharField(max_length=100, unique=True)
+    
+    class Meta:
+        verbose_name = 'Synonyme de compétence'
+        verbose_name_plural = 'Synonymes de compétences'
+
+    def __str__(self):
+        return f"{self.alias} → {self.canonical_skill.name}"
+
+    def clean(self):
+        from .skills import normalize_skill_name
+        # Seules les compétences créées automatiquement sont fusionnées sous un synonyme
+        curated = CanonicalSkill.objects.filter(
+            normalized_name=normalize_skill_name(self.alias), auto_created=False
+        ).exclude(pk=self.canonical_skill_id)
+        if curated.exists():
+            raise ValidationError({
+                'alias': "Une compétence de référence porte déjà ce nom : il ne peut pas servir de synonyme."
+            })
+
+    def save(self, *args, **kwargs):
+        from .skills import normalize_skill_name
+        self.normalized_alias = normalize_skill_name(self.alias)
+        super().save(*args, **kwargs)
+
+
 class Skill(models.Model):
     """Compétences"""
     SKILL_LEVELS = (
@@ -373,6 +408,10 @@ class Skill(models.Model):
 
     candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='skills')
     name = models.CharField(max_length=100)
+    canonical_skill = models.ForeignKey(
+        CanonicalSkill, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='candidate_skills', editable=False
+    )
     level = models.CharField(max_length=20, choices=SKILL_LEVELS)
     category = models.CharField(max_length=20, choices=SKILL_CATEGORIES)
     years_of_experience = models.PositiveIntegerField(default=0)
@@ -389,6 +428,11 @@ class Skill(models.Model):
     def __str__(self):
         return f"{self.name} ({self.level})"
 
+    def save(self, *args, **kwargs):
+        from .skills import resolve_skill
+        self.canonical_skill_id = resolve_skill(self.name, category=self.category)
+        super().save(*args, **kwargs)
+
 
 class Language(models.Model):
     """Langues parlées"""
@@ -599,4 +643,69 @@ class Award(models.Model):
         ordering = ['-date_received']
 
     def __str__(self):
-        return f"{self.title} - {self.issuing_organization}"
\ No newline at end of file
+        return f"{self.title} - {self.issuing_organization}"
+
+class ResumeDocument(models.Model):
+    """Texte extrait d'un CV (profil candidat ou candidature), indexé pour la recherche"""
+    SOURCES = (
+        ('profile_cv', 'CV du profil'),
+        ('application_resume', 'CV de candidature'),
+    )
+    
+    STATUS_CHOICES = (
+        ('pending', 'En attente'),
+        ('done', 'Extrait'),
+        ('failed', 'Échec'),
+    )
+
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='resume_documents')
+    application = models.OneToOneField(
+        'applications.Application', on_delete=models.CASCADE, null=True, blank=True,
+        related_name='resume_document'
+    )
+    source = models.CharField(max_length=20, choices=SOURCES)
+    file_key = models.CharField(max_length=255, help_text="Identifiant et version du fichier extrait")
+    file_url = models.URLField(max_length=500)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    error = models.CharField(max_length=500, blank=True)
+    text = models.TextField(blank=True)
+    tokens = models.TextField(blank=True, help_text="Mots-clés normalisés (sans accents, minuscules)")
+    search_vector = SearchVectorField(null=True, editable=False)
+    extracted_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'CV indexé'
+        verbose_name_plural = 'CV indexés'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['candidate'], condition=models.Q(source='profile_cv'),
+                name='unique_profile_resume_document'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_source_display()} - {self.candidate}"
+
+
+class CandidateSearchDocument(models.Model):
+    """Document de recherche dénormalisé d'un candidat, maintenu par signaux"""
+    candidate = models.OneToOneField(
+        CandidateProfile, on_delete=models.CASCADE, primary_key=True, related_name='search_document'
+    )
+    content = models.TextField(blank=True, help_text="Nom, email, poste, entreprises, compétences, technologies, formations et ville normalisés")
+    city = models.CharField(max_length=100, blank=True)
+    experience_band = models.PositiveSmallIntegerField(default=0)
+    completion_band = models.PositiveSmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Document de recherche candidat'
+        verbose_name_plural = 'Documents de recherche candidats'
+
+    def __str__(self):
+        return f"Recherche - {self.candidate}"
@@ -0,0 +1,83 @@
+"""Extraction du texte des CV (PDF et DOCX)
+
+Ce module n'importe pas Django : il est exécuté dans les processus de calcul
+du pipeline d'indexation.
+"""
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+import requests
+from unidecode import unidecode
+
+MAX_RESUME_BYTES = 10 * 1024 * 1024
+MAX_PDF_PAGES = 30
+DOWNLOAD_TIMEOUT = 30
+
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]{2,}')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class ResumeExtractionError(Exception):
+    """Fichier illisible ou format non pris en charge"""
+
+
+def download_file(url):
+    """Télécharge un fichier en refusant ceux qui dépassent la taille maximale"""
+    with requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        data = bytearray()
+        for chunk in response.iter_content(64 * 1024):
+            data.extend(chunk)
+            if len(data) > MAX_RESUME_BYTES:
+                raise ResumeExtractionError('Fichier trop volumineux')
+    return bytes(data)
+
+
+def extract_pdf_text(data):
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages[:MAX_PDF_PAGES])
+
+
+def extract_docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{_WORD_NAMESPACE}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{_WORD_NAMESPACE}t')))
+    return '\n'.join(paragraphs)
+
+
+def extract_text(data):
+    """Texte brut d'un CV, le format étant détecté sur le contenu"""
+    if data.startswith(b'%PDF'):
+        return extract_pdf_text(data)
+    if data.startswith(b'PK') and zipfile.is_zipfile(io.BytesIO(data)):
+        try:
+            return extract_docx_text(data)
+        except KeyError:
+            raise ResumeExtractionError('Archive ZIP qui n\'est pas un document Word')
+    raise ResumeExtractionError('Format non pris en charge (PDF ou DOCX attendu)')
+
+
+def normalize_text(text):
+    """Texte nettoyé : caractères nuls supprimés, espaces normalisés"""
+    return _WHITESPACE.sub(' ', text.replace('\x00', ' ')).strip()
+
+
+def tokenize(text):
+    """Mots-clés distincts, sans accents et en minuscules, dans l'ordre d'apparition"""
+    return list(dict.fromkeys(_TOKEN_PATTERN.findall(unidecode(text).lower())))
+
+
+def process_resume(document_id, url):
+    """Télécharge et analyse un CV ; ne lève pas d'exception"""
+    try:
+        text = normalize_text(extract_text(download_file(url)))
+        return {'id': document_id, 'url': url, 'text': text, 'tokens': ' '.join(tokenize(text)), 'error': ''}
+    except Exception as exc:
+        return {'id': document_id, 'url': url, 'text': '', 'tokens': '', 'error': str(exc)[:500] or exc.__class__.__name__}
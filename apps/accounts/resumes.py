@@ -0,0 +1,169 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ResumeDocument
+from .resume_extraction import process_resume, tokenize
+
+RESUME_BATCH_SIZE = 50
+SEARCH_CONFIG = 'simple'
+
+
+def file_key(resource):
+    """Identifiant stable d'une version de fichier (Cloudinary, ou empreinte d'un fichier déposé)"""
+    sha256 = getattr(resource, 'sha256', None)
+    if sha256:
+        return f"sha256:{sha256}"
+    return f"{resource.public_id}:{getattr(resource, 'version', '') or ''}"[:255]
+
+
+def file_url(resource):
+    """URL de téléchargement d'un fichier Cloudinary ou d'un fichier déposé"""
+    if getattr(resource, 'sha256', None):
+        return resource.url
+    return resource.build_url()
+
+
+def sync_resume_document(candidate_id, resource, application_id=None):
+    """Met en file d'attente l'extraction d'un CV si le fichier a changé
+
+    Retourne True si une extraction est nécessaire.
+    """
+    lookup = (
+        {'application_id': application_id}
+        if application_id else {'candidate_id': candidate_id, 'source': 'profile_cv'}
+    )
+    if not resource:
+        ResumeDocument.objects.filter(**lookup).delete()
+        return False
+
+    key = file_key(resource)
+    if ResumeDocument.objects.filter(file_key=key, **lookup).exists():
+        return False
+
+    ResumeDocument.objects.update_or_create(
+        defaults={
+            'candidate_id': candidate_id,
+            'source': 'application_resume' if application_id else 'profile_cv',
+            'file_key': key,
+            'file_url': file_url(resource),
+            'status': 'pending',
+            'error': '',
+            'text': '',
+            'tokens': '',
+            'search_vector': None,
+            'extracted_at': None,
+        },
+        **lookup
+    )
+    return True
+
+
+def iter_extractions(documents, workers):
+    """Extrait les CV dans un pool de processus borné"""
+    if workers <= 1:
+        for document_id, url in documents:
+            yield process_resume(document_id, url)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for document_id, url in documents:
+            pending.add(executor.submit(process_resume, document_id, url))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def extract_pending_resumes(workers=None, retry_failed=False, limit=None):
+    """Extrait le texte des CV en attente et met à jour l'index de recherche"""
+    workers = workers or min(os.cpu_count() or 1, 4)
+    statuses = ['pending', 'failed'] if retry_failed else ['pending']
+    documents = ResumeDocument.objects.filter(status__in=statuses).order_by('pk').values_list('pk', 'file_url')
+    if limit:
+        documents = documents[:limit]
+    documents = list(documents)
+
+    processed = 0
+    batch = []
+    for result in iter_extractions(documents, workers):
+        batch.append(result)
+        if len(batch) >= RESUME_BATCH_SIZE:
+            processed += save_extractions(batch)
+            batch = []
+    if batch:
+        processed += save_extractions(batch)
+    return processed
+
+
+def save_extractions(results):
+    """Enregistre un lot de résultats d'extraction
+
+    Un CV remplacé pendant l'extraction (autre URL) reste en attente : le
+    résultat, obtenu depuis l'ancien fichier, est ignoré.
+    """
+    now = timezone.now()
+    documents = ResumeDocument.objects.in_bulk([result['id'] for result in results])
+    for result in results:
+        document = documents.get(result['id'])
+        if document is None:
+            continue
+        if document.file_url != result['url']:
+            del documents[result['id']]
+            continue
+        document.text = result['text']
+        document.tokens = result['tokens']
+        document.error = result['error']
+        document.status = 'failed' if result['error'] else 'done'
+        document.extracted_at = now
+    ResumeDocument.objects.bulk_update(
+        documents.values(), ['text', 'tokens', 'error', 'status', 'extracted_at']
+    )
+
+    if connection.vendor == 'postgresql':
+        ResumeDocument.objects.filter(pk__in=documents.keys()).update(
+            search_vector=SearchVector('tokens', config=SEARCH_CONFIG)
+        )
+    return len(documents)
+
+
+def search_resume_documents(query):
+    """CV indexés correspondant à une recherche par mots-clés"""
+    terms = tokenize(query)
+    documents = ResumeDocument.objects.filter(status='done')
+    if not terms:
+        return documents.none()
+
+    if connection.vendor == 'postgresql':
+        return documents.filter(
+            search_vector=SearchQuery(' '.join(terms), config=SEARCH_CONFIG, search_type='websearch')
+        )
+
+    # Repli hors PostgreSQL (développement) : tous les mots-clés doivent apparaître
+    condition = Q()
+    for term in terms:
+        condition &= Q(tokens__contains=term)
+    return documents.filter(condition)
+
+
+def filter_candidates_by_resume(candidates, query):
+    """Restreint des profils candidats à ceux dont un CV correspond à la recherche"""
+    return candidates.filter(pk__in=search_resume_documents(query).values('candidate_id'))
+
+
+def filter_applications_by_resume(applications, query):
+    """Restreint des candidatures à celles dont le CV (joint ou du profil) correspond"""
+    documents = search_resume_documents(query)
+    return applications.filter(
+        Q(pk__in=documents.filter(application__isnull=False).values('application_id')) |
+        Q(candidate__in=documents.filter(source='profile_cv').values('candidate_id'))
+    )
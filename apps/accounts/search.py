@@ -0,0 +1,158 @@
+import re
+from unidecode import unidecode
+from django.db import connection
+from django.db.models import Count, Q
+
+# Tranches utilisées pour les facettes : (valeur, libellé, borne inférieure)
+EXPERIENCE_BANDS = [
+    (0, '0-2 ans', 0),
+    (1, '2-5 ans', 2),
+    (2, '5-10 ans', 5),
+    (3, '10 ans et +', 10),
+]
+COMPLETION_BANDS = [
+    (0, 'Moins de 50%', 0),
+    (1, '50-79%', 50),
+    (2, '80% et +', 80),
+]
+CITY_FACET_LIMIT = 10
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_search_text(text):
+    """Texte sans accents, en minuscules, espaces normalisés"""
+    return _WHITESPACE.sub(' ', unidecode(text or '').lower()).strip()
+
+
+def band_for(value, bands):
+    """Tranche correspondant à une valeur"""
+    band = bands[0][0]
+    for key, _, lower_bound in bands:
+        if value >= lower_bound:
+            band = key
+    return band
+
+
+def build_search_content(values):
+    """Concatène les champs indexés d'un candidat en un texte normalisé et dédoublonné"""
+    parts = dict.fromkeys(normalize_search_text(value) for value in values if value)
+    parts.pop('', None)
+    return ' | '.join(parts)
+
+
+def candidate_search_values(profile, skills, experiences, educations):
+    """Champs indexés d'un candidat, à partir des objets déjà chargés"""
+    values = [
+        profile.user.first_name, profile.user.last_name, profile.user.email,
+        profile.current_position, profile.current_company, profile.city,
+    ]
+    for skill in skills:
+        values.append(skill.name)
+        if skill.canonical_skill_id:
+            values.append(skill.canonical_skill.name)
+    for experience in experiences:
+        values.extend([experience.position, experience.company, experience.technologies_used])
+    for education in educations:
+        values.extend([education.institution, education.degree, education.field_of_study])
+    return values
+
+
+def make_search_document(profile, skills, experiences, educations):
+    from .models import CandidateSearchDocument
+
+    return CandidateSearchDocument(
+        candidate_id=profile.pk,
+        content=build_search_content(candidate_search_values(profile, skills, experiences, educations)),
+        city=(profile.city or '').strip()[:100],
+        experience_band=band_for(profile.years_of_experience, EXPERIENCE_BANDS),
+        completion_band=band_for(profile.profile_completion, COMPLETION_BANDS),
+    )
+
+
+def search_document_queryset():
+    """Profils avec tout ce qu'il faut pour construire leur document de recherche"""
+    from .models import CandidateProfile
+
+    return CandidateProfile.objects.select_related('user').prefetch_related(
+        'skills__canonical_skill', 'experiences', 'educations'
+    )
+
+
+def save_search_documents(profiles):
+    """Construit et enregistre en une requête les documents d'une liste de profils"""
+    from .models import CandidateSearchDocument
+
+    documents = [
+        make_search_document(
+            profile, profile.skills.all(), profile.experiences.all(), profile.educations.all()
+        )
+        for profile in profiles
+    ]
+    CandidateSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['candidate'],
+        update_fields=['content', 'city', 'experience_band', 'completion_band', 'updated_at'],
+    )
+    return len(documents)
+
+
+def refresh_search_document(candidate_id):
+    """Reconstruit le document de recherche d'un candidat"""
+    profile = search_document_queryset().filter(pk=candidate_id).first()
+    if profile is not None:
+        save_search_documents([profile])
+
+
+def filter_candidates_by_search(candidates, query):
+    """Recherche tolérante aux fautes dans les documents des candidats
+
+    Chaque mot doit apparaître en sous-chaîne ; sous PostgreSQL, un mot proche
+    (similarité trigramme) suffit. Les deux passent par l'index GIN trigramme.
+    """
+    for term in normalize_search_text(query).split():
+        condition = Q(search_document__content__contains=term)
+        if connection.vendor == 'postgresql' and len(term) > 3:
+            condition |= Q(search_document__content__trigram_word_similar=term)
+        candidates = candidates.filter(condition)
+    return candidates
+
+
+def candidate_facets(candidates):
+    """Statistiques et facettes d'une liste de candidats filtrée
+
+    Les compteurs et les tranches sont calculés en un seul agrégat ; les villes,
+    qui demandent un regroupement, en une seconde requête.
+    """
+    aggregates = {
+        'total': Count('pk'),
+        'active': Count('pk', filter=Q(is_active=True)),
+        'with_cv': Count('pk', filter=Q(cv_file__isnull=False) & ~Q(cv_file='')),
+        'high_completion': Count('pk', filter=Q(profile_completion__gte=80)),
+    }
+    for key, _, _ in EXPERIENCE_BANDS:
+        aggregates[f'experience_{key}'] = Count('pk', filter=Q(search_document__experience_band=key))
+    for key, _, _ in COMPLETION_BANDS:
+        aggregates[f'completion_{key}'] = Count('pk', filter=Q(search_document__completion_band=key))
+    counts = candidates.order_by().aggregate(**aggregates)
+
+    cities = (
+        candidates.exclude(search_document__city='')
+        .order_by()
+        .values('search_document__city')
+        .annotate(count=Count('pk'))
+        .order_by('-count')[:CITY_FACET_LIMIT]
+    )
+    return {
+        'stats': {key: counts[key] for key in ('total', 'active', 'with_cv', 'high_completion')},
+        'experience': [
+            {'value': key, 'label': label, 'count': counts[f'experience_{key}']}
+            for key, label, _ in EXPERIENCE_BANDS
+        ],
+        'completion': [
+            {'value': key, 'label': label, 'count': counts[f'completion_{key}']}
+            for key, label, _ in COMPLETION_BANDS
+        ],
+        'cities': [{'label': row['search_document__city'], 'count': row['count']} for row in cities],
+    }
@@ -1,7 +1,21 @@
-from django.db.models.signals import post_save
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import CandidateProfile
+from utils.cache import bump_cache_version
+from .models import (
+    CandidateProfile, Education, Experience, Skill, Language, Certification,
+    Reference, Project, SocialProfile, Award, CanonicalSkill, SkillAlias
+)
+from .search import refresh_search_document
+from .snapshot import CandidateSnapshot
+from apps.applications.models import Application
+from .resumes import sync_resume_document
+from .skills import SKILL_TAXONOMY_VERSION, merge_alias_duplicates
+from .utils import (
+    SCORE_FIELDS, deleted_with_candidate, fields_changed, refresh_candidate_score, refresh_experience_years
+)
 
 User = get_user_model()
 
@@ -13,8 +27,140 @@ def create_candidate_profile(sender, instance, created, **kwargs):
         CandidateProfile.objects.create(user=instance)
 
 
+# Champs du profil dont dépend le document de recherche
+SEARCH_FIELDS = {'current_position', 'current_company', 'city', 'years_of_experience', 'profile_completion'}
+USER_SEARCH_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver(post_save, sender=CandidateProfile)
+def update_candidate_score(sender, instance, update_fields=None, **kwargs):
+    """Maintenir le score stocké du candidat à jour"""
+    if fields_changed(update_fields, SCORE_FIELDS):
+        refresh_candidate_score(instance.pk)
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Certification)
+@receiver(post_delete, sender=Certification)
+def update_candidate_score_on_related_change(sender, instance, **kwargs):
+    """Recalculer le score quand une formation, compétence ou certification change"""
+    if not deleted_with_candidate(kwargs.get('origin')):
+        refresh_candidate_score(instance.candidate_id)
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def update_experience_years(sender, instance, **kwargs):
+    """Recalculer les années d'expérience quand une expérience change"""
+    if deleted_with_candidate(kwargs.get('origin')):
+        return
+    if refresh_experience_years(instance.candidate_id):
+        refresh_candidate_score(instance.candidate_id)
+
+
+@receiver(post_save, sender=SkillAlias)
+def merge_skill_alias(sender, instance, **kwargs):
+    """Fusionner la compétence créée automatiquement pour ce synonyme"""
+    merge_alias_duplicates(instance)
+
+
+@receiver(post_save, sender=CanonicalSkill)
+@receiver(post_delete, sender=CanonicalSkill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def invalidate_skill_index(sender, instance, **kwargs):
+    """Invalider l'index des compétences chargé en mémoire"""
+    bump_cache_version(SKILL_TAXONOMY_VERSION)
+
+
+def schedule_resume_extraction():
+    """Lancer l'extraction des CV en attente après la validation de la transaction"""
+    from apps.core.tasks import extract_resume_documents
+    transaction.on_commit(extract_resume_documents.delay)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def index_profile_resume(sender, instance, update_fields=None, **kwargs):
+    """Indexer le CV du profil quand un nouveau fichier est déposé"""
+    if fields_changed(update_fields, {'cv_file'}) and sync_resume_document(instance.pk, instance.cv_file):
+        schedule_resume_extraction()
+
+
+@receiver(post_save, sender=Application)
+def index_application_resume(sender, instance, **kwargs):
+    """Indexer le CV joint à une candidature"""
+    if sync_resume_document(instance.candidate_id, instance.resume_source, application_id=instance.pk):
+        schedule_resume_extraction()
+
+
+@receiver(post_save, sender=CandidateProfile)
+def update_profile_search_document(sender, instance, update_fields=None, **kwargs):
+    """Maintenir le document de recherche du candidat à jour"""
+    if fields_changed(update_fields, SEARCH_FIELDS):
+        refresh_search_document(instance.pk)
+
+
 @receiver(post_save, sender=User)
-def save_candidate_profile(sender, instance, **kwargs):
-    """Sauvegarder le profil candidat lors de la sauvegarde de l'utilisateur"""
-    if instance.user_type == 'candidate' and hasattr(instance, 'candidate_profile'):
-        instance.candidate_profile.save()
+def update_user_search_document(sender, instance, created, update_fields=None, **kwargs):
+    """Répercuter les changements de nom ou d'email dans la recherche et le profil en cache
+
+    Les sauvegardes partielles qui ne touchent pas ces champs (last_login à la
+    connexion) sont ignorées.
+    """
+    if created or instance.user_type != 'candidate' or not fields_changed(update_fields, USER_SEARCH_FIELDS):
+        return
+    candidate_id = CandidateProfile.objects.filter(user=instance).values_list('pk', flat=True).first()
+    if candidate_id:
+        refresh_search_document(candidate_id)
+        CandidateSnapshot.invalidate(candidate_id)
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def update_related_search_document(sender, instance, **kwargs):
+    """Réindexer le candidat quand une compétence, expérience ou formation change"""
+    if not deleted_with_candidate(kwargs.get('origin')):
+        refresh_search_document(instance.candidate_id)
+
+
+@receiver(post_save, sender=CandidateProfile)
+@receiver(post_delete, sender=CandidateProfile)
+def invalidate_profile_snapshot(sender, instance, **kwargs):
+    """Invalider le profil complet mis en cache"""
+    CandidateSnapshot.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+@receiver(post_save, sender=Certification)
+@receiver(post_delete, sender=Certification)
+@receiver(post_save, sender=Reference)
+@receiver(post_delete, sender=Reference)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=SocialProfile)
+@receiver(post_delete, sender=SocialProfile)
+@receiver(post_save, sender=Award)
+@receiver(post_delete, sender=Award)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_related_snapshot(sender, instance, **kwargs):
+    """Invalider le profil mis en cache quand un élément ou une candidature change
+
+    Après validation : une lecture concurrente ne peut pas remettre en cache
+    l'état d'avant la transaction sous la nouvelle version.
+    """
+    transaction.on_commit(partial(CandidateSnapshot.invalidate, instance.candidate_id))
@@ -0,0 +1,74 @@
+import re
+from unidecode import unidecode
+from utils.cache import get_cache_version
+
+SKILL_TAXONOMY_VERSION = 'skill_taxonomy'
+
+# On conserve + et # pour distinguer C, C++ et C#
+_NON_SKILL_CHARS = re.compile(r'[^a-z0-9+#]')
+
+# Index local au processus : forme normalisée -> identifiant de la compétence de référence
+_skill_index = {'version': None, 'index': {}}
+
+
+def normalize_skill_name(name):
+    """Normalise un nom de compétence : accents, casse, espaces et ponctuation
+
+    "Java Script", "javascript" et "JavaScript" donnent la même clé.
+    """
+    return _NON_SKILL_CHARS.sub('', unidecode(name or '').lower())[:100]
+
+
+def get_skill_index():
+    """Retourne l'index des noms et synonymes, rechargé quand le référentiel change"""
+    from .models import CanonicalSkill, SkillAlias
+
+    version = get_cache_version(SKILL_TAXONOMY_VERSION)
+    if _skill_index['version'] != version:
+        index = dict(CanonicalSkill.objects.values_list('normalized_name', 'id'))
+        # Les synonymes priment sur un nom de référence homonyme
+        index.update(SkillAlias.objects.values_list('normalized_alias', 'canonical_skill_id'))
+        _skill_index['index'] = index
+        _skill_index['version'] = version
+    return _skill_index['index']
+
+
+def resolve_skill(name, create=True, category=''):
+    """Résout un nom libre vers l'identifiant de sa compétence de référence
+
+    Un nom inconnu crée une nouvelle compétence de référence, sauf si `create` est faux.
+    """
+    from .models import CanonicalSkill
+
+    key = normalize_skill_name(name)
+    if not key:
+        return None
+
+    index = get_skill_index()
+    skill_id = index.get(key)
+    if skill_id is None and create:
+        skill, created = CanonicalSkill.objects.get_or_create(
+            normalized_name=key,
+            defaults={'name': name.strip()[:100], 'category': category or '', 'auto_created': True},
+        )
+        skill_id = index[key] = skill.pk
+    return skill_id
+
+
+
+def merge_alias_duplicates(alias):
+    """Rattache au bon référentiel les compétences créées automatiquement sous un synonyme
+
+    Les compétences validées (auto_created faux) ne sont jamais fusionnées :
+    SkillAlias.clean refuse un synonyme qui porte leur nom.
+    """
+    from apps.jobs.models import JobSkill
+    from .models import CanonicalSkill, Skill
+
+    duplicates = CanonicalSkill.objects.filter(
+        normalized_name=alias.normalized_alias, auto_created=True
+    ).exclude(pk=alias.canonical_skill_id)
+    for duplicate in duplicates:
+        Skill.objects.filter(canonical_skill=duplicate).update(canonical_skill=alias.canonical_skill_id)
+        JobSkill.objects.filter(canonical_skill=duplicate).update(canonical_skill=alias.canonical_skill_id)
+        duplicate.delete()
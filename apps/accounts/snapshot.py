@@ -0,0 +1,145 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from utils.cache import bump_cache_version, get_cache_version
+from .models import CandidateProfile
+
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60 * 6  # 6 heures, l'invalidation passe par les versions
+# Version globale, incrémentée par les traitements de masse (bulk_update sans signaux)
+CANDIDATE_SNAPSHOT_VERSION = 'candidate_snapshot'
+
+PROFILE_FIELDS = [
+    'id', 'current_position', 'current_company', 'city', 'country', 'mobile_phone',
+    'linkedin_url', 'website_url', 'years_of_experience', 'expected_salary',
+    'preferred_work_type', 'willing_to_relocate', 'profile_completion', 'is_active', 'created_at',
+]
+PROFILE_FILES = ['profile_picture', 'cv_file', 'cover_letter']
+
+# Champs conservés pour chaque section ; les champs à choix reçoivent aussi leur libellé (<champ>_display)
+SECTIONS = {
+    'educations': [
+        'id', 'institution', 'degree', 'field_of_study', 'degree_level',
+        'start_date', 'end_date', 'is_current', 'grade',
+    ],
+    'experiences': [
+        'id', 'company', 'position', 'employment_type', 'location',
+        'start_date', 'end_date', 'is_current', 'description', 'technologies_used',
+    ],
+    'skills': ['id', 'name', 'level', 'category', 'years_of_experience'],
+    'languages': ['id', 'language', 'proficiency'],
+    'certifications': ['id', 'name', 'issuing_organization', 'issue_date', 'expiration_date', 'credential_url'],
+    'references': ['id', 'name', 'position', 'company', 'email', 'phone', 'relationship'],
+    'projects': [
+        'id', 'title', 'description', 'project_type', 'status', 'start_date', 'end_date',
+        'is_ongoing', 'role', 'technologies_used', 'project_url',
+    ],
+    'social_profiles': ['id', 'platform', 'username', 'url', 'is_public'],
+    'awards': ['id', 'title', 'issuing_organization', 'award_type', 'date_received'],
+}
+
+
+def candidate_snapshot_namespace(candidate_id):
+    """Espace de cache du profil complet d'un candidat"""
+    return f"candidate_snapshot:{candidate_id}"
+
+
+def serialize(instance, field_names):
+    """Valeurs des champs d'un objet, avec le libellé des champs à choix"""
+    data = {}
+    for name in field_names:
+        data[name] = getattr(instance, name)
+        if instance._meta.get_field(name).choices:
+            data[f'{name}_display'] = getattr(instance, f'get_{name}_display')()
+    return data
+
+
+class CandidateSnapshot:
+    """Document compact d'un profil candidat complet, mis en cache
+
+    Le profil, l'utilisateur, les neuf sections et les statistiques de
+    candidatures sont chargés en une passe (une requête par relation) puis
+    sérialisés en types simples. Le cache est invalidé par la version du
+    candidat, incrémentée par les signaux du profil et de ses éléments.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__.get('data', {})[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    @classmethod
+    def cache_key(cls, candidate_id):
+        return "candidate_snapshot:{}:{}:{}".format(
+            candidate_id,
+            get_cache_version(CANDIDATE_SNAPSHOT_VERSION),
+            get_cache_version(candidate_snapshot_namespace(candidate_id)),
+        )
+
+    @classmethod
+    def get(cls, candidate_id):
+        """Snapshot d'un candidat, depuis le cache ou reconstruit (None si le profil n'existe pas)"""
+        key = cls.cache_key(candidate_id)
+        data = cache.get(key)
+        if data is None:
+            data = cls.build(candidate_id)
+            if data is None:
+                return None
+            cache.set(key, data, SNAPSHOT_CACHE_TIMEOUT)
+        return cls(data)
+
+    @classmethod
+    def build(cls, candidate_id):
+        profile = (
+            CandidateProfile.objects.select_related('user')
+            .prefetch_related(*SECTIONS)
+            .annotate(
+                total_applications=Count('applications'),
+                pending_applications=Count('applications', filter=Q(applications__status='pending')),
+                interviews=Count('applications', filter=Q(
+                    applications__status__in=['interview_scheduled', 'interview_completed']
+                )),
+                offers=Count('applications', filter=Q(applications__status='offer_made')),
+            )
+            .filter(pk=candidate_id)
+            .first()
+        )
+        if profile is None:
+            return None
+
+        data = {
+            'profile': serialize(profile, PROFILE_FIELDS),
+            'user': {
+                'id': profile.user_id,
+                'full_name': profile.user.full_name,
+                'email': profile.user.email,
+            },
+            'application_stats': {
+                'total_applications': profile.total_applications,
+                'pending_applications': profile.pending_applications,
+                'interviews': profile.interviews,
+                'offers': profile.offers,
+            },
+        }
+        for name in PROFILE_FILES:
+            resource = getattr(profile, name)
+            data['profile'][f'{name}_url'] = resource.url if resource else ''
+        for section, field_names in SECTIONS.items():
+            data[section] = [serialize(item, field_names) for item in getattr(profile, section).all()]
+        for experience in data['experiences']:
+            end_date = experience['end_date'] or date.today()
+            experience['duration_in_years'] = round((end_date - experience['start_date']).days / 365.25, 1)
+        return data
+
+    @staticmethod
+    def invalidate(candidate_id):
+        bump_cache_version(candidate_snapshot_namespace(candidate_id))
+
+    @staticmethod
+    def invalidate_all():
+        bump_cache_version(CANDIDATE_SNAPSHOT_VERSION)
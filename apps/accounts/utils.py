@@ -1,5 +1,8 @@
 from datetime import date, timedelta
-from django.db.models import Q
+from django.db.models import (
+    Q, Case, Count, ExpressionWrapper, IntegerField, OuterRef, Prefetch, Subquery, When
+)
+from django.db.models.functions import Coalesce
 from .models import CandidateProfile, Experience
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
@@ -36,8 +39,12 @@ def calculate_candidate_experience(candidate, target_position=None):
             relevant_periods.append(period)
     
     # Calculer les années sans chevauchement
-    total_years = calculate_non_overlapping_years(all_periods)
-    relevant_years = calculate_non_overlapping_years(relevant_periods) if target_position else 0
+    total_years = calculate_non_overlapping_years(
+        (period['start'], period['end']) for period in all_periods
+    )
+    relevant_years = calculate_non_overlapping_years(
+        (period['start'], period['end']) for period in relevant_periods
+    ) if target_position else 0
     
     return {
         'total_years': total_years,
@@ -48,38 +55,64 @@ def calculate_candidate_experience(candidate, target_position=None):
 
 
 def calculate_non_overlapping_years(periods):
-    """Calcule les années d'expérience sans compter les chevauchements"""
+    """Calcule les années d'expérience sans compter les chevauchements
+    
+    `periods` est un itérable de couples (début, fin) ; une fin vide
+    correspond à un poste en cours.
+    """
+    today = date.today()
+    periods = sorted((start, end or today) for start, end in periods)
     if not periods:
         return 0
     
-    # Trier par date de début
-    sorted_periods = sorted(periods, key=lambda x: x['start'])
-    
     # Fusionner les périodes qui se chevauchent
-    merged_periods = []
-    current_period = sorted_periods[0]
-    
-    for period in sorted_periods[1:]:
-        if period['start'] <= current_period['end']:
-            # Chevauchement détecté, fusionner
-            current_period['end'] = max(current_period['end'], period['end'])
-        else:
-            # Pas de chevauchement, ajouter la période actuelle et commencer une nouvelle
-            merged_periods.append(current_period)
-            current_period = period
-    
-    # Ajouter la dernière période
-    merged_periods.append(current_period)
-    
-    # Calculer le total en années
     total_days = 0
-    for period in merged_periods:
-        days = (period['end'] - period['start']).days
-        total_days += days
+    current_start, current_end = periods[0]
+    for start, end in periods[1:]:
+        if start <= current_end:
+            # Chevauchement détecté, prolonger la période courante
+            current_end = max(current_end, end)
+        else:
+            total_days += (current_end - current_start).days
+            current_start, current_end = start, end
+    total_days += (current_end - current_start).days
     
     return round(total_days / 365.25, 1)
 
 
+def refresh_experience_years(candidate_id):
+    """Recalcule et enregistre les années d'expérience d'un candidat
+    
+    Retourne True si la valeur stockée a changé.
+    """
+    periods = Experience.objects.filter(candidate_id=candidate_id).values_list('start_date', 'end_date')
+    years = round(calculate_non_overlapping_years(periods))
+    return bool(
+        CandidateProfile.objects.filter(pk=candidate_id)
+        .exclude(years_of_experience=years)
+        .update(years_of_experience=years)
+    )
+
+
+def refresh_ongoing_experience_years():
+    """Recalcule les années d'expérience des candidats ayant un poste en cours
+
+    Une expérience sans date de fin compte jusqu'à aujourd'hui : sa durée
+    augmente sans qu'aucune expérience ne soit modifiée. Retourne les
+    identifiants des profils mis à jour.
+    """
+    candidate_ids = (
+        Experience.objects.filter(end_date__isnull=True)
+        .order_by().values_list('candidate_id', flat=True).distinct()
+    )
+    updated = []
+    for candidate_id in candidate_ids.iterator():
+        if refresh_experience_years(candidate_id):
+            refresh_candidate_score(candidate_id)
+            updated.append(candidate_id)
+    return updated
+
+
 def is_relevant_experience(experience, target_position):
     """Détermine si une expérience est pertinente pour un poste cible"""
     # Mots-clés du poste de l'expérience
@@ -116,20 +149,74 @@ def is_relevant_experience(experience, target_position):
     return is_relevant
 
 
-def calculate_candidate_score(candidate, job=None):
-    """Calcule un score de compatibilité pour un candidat"""
+# Champs pris en compte dans le pourcentage de completion du profil
+PROFILE_COMPLETION_FIELDS = [
+    'profile_picture', 'date_of_birth', 'gender', 'nationality', 'address', 'city',
+    'country', 'mobile_phone', 'current_position', 'years_of_experience', 'cv_file',
+]
+
+
+def profile_completion_expression():
+    """Expression SQL du pourcentage de completion (division entière, comme int())"""
+    conditions = []
+    for name in PROFILE_COMPLETION_FIELDS:
+        if name == 'years_of_experience':
+            conditions.append(Q(years_of_experience__gt=0))
+        elif name == 'date_of_birth':
+            conditions.append(Q(date_of_birth__isnull=False))
+        else:
+            conditions.append(Q(**{f'{name}__isnull': False}) & ~Q(**{name: ''}))
+    completed = sum(Case(When(condition, then=1), default=0) for condition in conditions)
+    return ExpressionWrapper(completed * 100 / len(conditions), output_field=IntegerField())
+
+
+def related_count(model):
+    """Sous-requête comptant les lignes liées à chaque candidat (sans jointure multiplicatrice)"""
+    counts = model.objects.filter(
+        candidate=OuterRef('pk')
+    ).order_by().values('candidate').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts[:1]), 0)
+
+
+def with_score_features(queryset):
+    """Annote un queryset de profils avec les compteurs utilisés par le score"""
+    from .models import Education, Skill, Certification
+    return queryset.annotate(
+        education_count=related_count(Education),
+        skills_count=related_count(Skill),
+        certification_count=related_count(Certification),
+    )
+
+
+# Champs du profil dont dépend le score
+SCORE_FIELDS = {'profile_completion', 'years_of_experience', 'cv_file', 'cover_letter'}
+
+
+def fields_changed(update_fields, fields):
+    """Vrai si une sauvegarde a pu modifier l'un des champs (update_fields absent : tous)"""
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+def deleted_with_candidate(origin):
+    """Vrai si une suppression en cascade vient du candidat (profil ou compte) lui-même
+
+    origin est l'argument du signal post_delete : l'objet ou le queryset supprimé.
+    """
+    owners = (CandidateProfile, CandidateProfile.user.field.related_model)
+    return isinstance(origin, owners) or getattr(origin, 'model', None) in owners
+
+
+def compute_candidate_score(profile_completion, years_of_experience, education_count,
+                            skills_count, has_cv, has_cover_letter, has_certifications,
+                            relevant_years=None):
+    """Calcule le score d'un candidat à partir de caractéristiques déjà chargées"""
     score = 0
-    max_score = 100
     
     # Score de base sur la completion du profil (30 points)
-    profile_score = (candidate.profile_completion / 100) * 30
-    score += profile_score
+    score += (profile_completion / 100) * 30
     
     # Score d'expérience (25 points)
-    if job:
-        exp_data = calculate_candidate_experience(candidate, job.title)
-        relevant_years = exp_data['relevant_years']
-        
+    if relevant_years is not None:
         # Calculer le score basé sur l'expérience pertinente
         if relevant_years >= 5:
             exp_score = 25
@@ -138,44 +225,88 @@ def calculate_candidate_score(candidate, job=None):
         elif relevant_years >= 1:
             exp_score = 15
         else:
-            exp_score = candidate.years_of_experience * 2.5  # Expérience générale
-        
-        score += min(exp_score, 25)
+            exp_score = years_of_experience * 2.5  # Expérience générale
     else:
         # Score basé sur l'expérience totale
-        exp_score = min(candidate.years_of_experience * 2.5, 25)
-        score += exp_score
+        exp_score = years_of_experience * 2.5
+    score += min(exp_score, 25)
     
     # Score de formation (20 points)
-    education_count = candidate.educations.count()
-    education_score = min(education_count * 5, 20)
-    score += education_score
+    score += min(education_count * 5, 20)
     
     # Score de compétences (15 points)
-    skills_count = candidate.skills.count()
-    skills_score = min(skills_count * 1.5, 15)
-    score += skills_score
+    score += min(skills_count * 1.5, 15)
     
     # Score de documents (10 points)
     doc_score = 0
-    if candidate.cv_file:
+    if has_cv:
         doc_score += 5
-    if candidate.cover_letter:
+    if has_cover_letter:
         doc_score += 3
-    if candidate.certifications.exists():
+    if has_certifications:
         doc_score += 2
     score += min(doc_score, 10)
     
-    return min(round(score, 1), max_score)
+    return min(round(score, 1), 100)
+
+
+def calculate_candidate_score(candidate, job=None):
+    """Calcule un score de compatibilité pour un candidat
+    
+    Utilise les compteurs annotés par with_score_features() lorsqu'ils sont
+    présents, sinon les calcule avec une requête par relation.
+    """
+    education_count = getattr(candidate, 'education_count', None)
+    if education_count is None:
+        education_count = candidate.educations.count()
+    
+    skills_count = getattr(candidate, 'skills_count', None)
+    if skills_count is None:
+        skills_count = candidate.skills.count()
+    
+    certification_count = getattr(candidate, 'certification_count', None)
+    if certification_count is None:
+        certification_count = 1 if candidate.certifications.exists() else 0
+    
+    relevant_years = None
+    if job:
+        relevant_years = calculate_candidate_experience(candidate, job.title)['relevant_years']
+    
+    return compute_candidate_score(
+        candidate.profile_completion,
+        candidate.years_of_experience,
+        education_count,
+        skills_count,
+        bool(candidate.cv_file),
+        bool(candidate.cover_letter),
+        certification_count > 0,
+        relevant_years=relevant_years,
+    )
+
+
+def refresh_candidate_score(candidate_id):
+    """Recalcule et enregistre le score stocké d'un candidat"""
+    candidate = with_score_features(
+        CandidateProfile.objects.filter(pk=candidate_id)
+    ).first()
+    if candidate is None:
+        return None
+    
+    score = calculate_candidate_score(candidate)
+    if score != candidate.score:
+        # update() pour ne pas redéclencher les signaux post_save du profil
+        CandidateProfile.objects.filter(pk=candidate_id).update(score=score)
+    return score
 
 
 def get_matching_jobs(candidate, limit=10):
     """Trouve les offres correspondant au profil du candidat"""
-    from apps.jobs.models import Job
+    from apps.jobs.models import Job, JobSkill
     
-    # Récupérer les compétences du candidat
+    # Récupérer les compétences de référence du candidat
     candidate_skills = set(
-        skill.name.lower() for skill in candidate.skills.all()
+        candidate.skills.filter(canonical_skill__isnull=False)
+        .values_list('canonical_skill_id', flat=True)
     )
     
     # Récupérer les mots-clés de l'expérience
@@ -187,15 +318,16 @@ def get_matching_jobs(candidate, limit=10):
     
     # Rechercher les offres correspondantes
     matching_jobs = []
-    jobs = Job.objects.filter(status='published')
+    jobs = Job.objects.filter(status='published').prefetch_related(
+        Prefetch('required_skills', queryset=JobSkill.objects.only('id', 'job_id', 'canonical_skill_id'))
+    )
     
     for job in jobs:
         score = 0
         
-        # Score basé sur les compétences requises
-        job_skills = set()
-        for skill in job.required_skills.all():
-            job_skills.add(skill.skill_name.lower())
+        # Score basé sur les compétences requises (comparaison par identifiant)
+        job_skills = {skill.canonical_skill_id for skill in job.required_skills.all()}
+        job_skills.discard(None)
         
         skill_matches = len(candidate_skills.intersection(job_skills))
         if job_skills:
@@ -13,6 +13,7 @@ from .forms import (
     CustomUserCreationForm, CandidateProfileForm, EducationForm, 
     ExperienceForm, SkillForm, LanguageForm, CertificationForm, ReferenceForm
 )
+from .snapshot import CandidateSnapshot
 # Ajout des imports pour les emails
 from django.core.mail import send_mail
 from django.conf import settings
@@ -56,25 +57,28 @@ def profile(request):
         if created:
             profile.calculate_profile_completion()
         
-        # Calculer l'expérience
-        profile.calculate_experience_years()
-        
-        # Obtenir les recommandations d'emploi
-        from .utils import get_matching_jobs
-        recommended_jobs = get_matching_jobs(profile, limit=6)
+        # Obtenir les recommandations d'emploi (calcul nocturne, sinon calcul à la volée)
+        from apps.dashboard.matching import get_recommended_jobs
+        recommended_jobs = list(get_recommended_jobs(profile, limit=6))
+        if not recommended_jobs:
+            from .utils import get_matching_jobs
+            recommended_jobs = [item['job'] for item in get_matching_jobs(profile, limit=6)]
         
+        # Profil complet lu depuis le cache (reconstruit en une passe si besoin)
+        snapshot = CandidateSnapshot.get(profile.pk)
         context = {
-            'profile': profile,
-            'educations': profile.educations.all(),
-            'experiences': profile.experiences.all(),
-            'skills': profile.skills.all(),
-            'languages': profile.languages.all(),
-            'certifications': profile.certifications.all(),
-            'references': profile.references.all(),
-            'projects': profile.projects.all(),
-            'social_profiles': profile.social_profiles.all(),
-            'awards': profile.awards.all(),
-            'recommended_jobs': [item['job'] for item in recommended_jobs],
+            'snapshot': snapshot,
+            'profile': snapshot.profile,
+            'educations': snapshot.educations,
+            'experiences': snapshot.experiences,
+            'skills': snapshot.skills,
+            'languages': snapshot.languages,
+            'certifications': snapshot.certifications,
+            'references': snapshot.references,
+            'projects': snapshot.projects,
+            'social_profiles': snapshot.social_profiles,
+            'awards': snapshot.awards,
+            'recommended_jobs': recommended_jobs,
         }
         return render(request, 'accounts/profile.html', context)
     else:
@@ -3,38 +3,44 @@ from django.utils.html import format_html
 from django.urls import reverse
 from .models import (
     Application, ApplicationRating, ApplicationComment, 
-    Interview, ApplicationStatusHistory, ApplicationDocument
+    Interview, ApplicationStatusHistory, ApplicationDocument, StoredFile
 )
+from .utils import bulk_update_application_status
 
 
 class ApplicationRatingInline(admin.TabularInline):
     model = ApplicationRating
     extra = 0
     readonly_fields = ('created_at',)
+    autocomplete_fields = ('evaluator',)
 
 
 class ApplicationCommentInline(admin.TabularInline):
     model = ApplicationComment
     extra = 1
     readonly_fields = ('created_at', 'updated_at')
+    autocomplete_fields = ('author',)
 
 
 class InterviewInline(admin.TabularInline):
     model = Interview
     extra = 0
     readonly_fields = ('created_at', 'updated_at')
+    autocomplete_fields = ('interviewers', 'created_by')
 
 
 class ApplicationStatusHistoryInline(admin.TabularInline):
     model = ApplicationStatusHistory
     extra = 0
     readonly_fields = ('changed_at',)
+    autocomplete_fields = ('changed_by',)
 
 
 class ApplicationDocumentInline(admin.TabularInline):
     model = ApplicationDocument
     extra = 0
     readonly_fields = ('uploaded_at', 'file_size_mb')
+    autocomplete_fields = ('uploaded_by',)
 
 
 @admin.register(Application)
@@ -52,6 +58,8 @@ class ApplicationAdmin(admin.ModelAdmin):
         'candidate__user__email', 'job__title', 'job__company'
     )
     readonly_fields = ('applied_at', 'updated_at', 'days_since_applied')
+    raw_id_fields = ('resume_upload', 'documents_upload')
+    autocomplete_fields = ('candidate', 'job', 'reviewed_by')
     date_hierarchy = 'applied_at'
     
     fieldsets = (
@@ -59,7 +67,7 @@ class ApplicationAdmin(admin.ModelAdmin):
             'fields': ('candidate', 'job', 'status', 'priority')
         }),
         ('Documents et motivation', {
-            'fields': ('cover_letter', 'resume_file', 'additional_documents')
+            'fields': ('cover_letter', 'resume_file', 'additional_documents', 'resume_upload', 'documents_upload')
         }),
         ('Informations supplémentaires', {
             'fields': ('expected_salary', 'availability_date', 'willing_to_relocate', 'custom_answers')
@@ -77,6 +85,31 @@ class ApplicationAdmin(admin.ModelAdmin):
         ApplicationRatingInline, ApplicationCommentInline, 
         InterviewInline, ApplicationStatusHistoryInline, ApplicationDocumentInline
     ]
+    actions = ['mark_reviewing', 'mark_shortlisted', 'mark_rejected']
+    
+    def change_status(self, request, queryset, new_status):
+        results = bulk_update_application_status(
+            list(queryset.values_list('pk', flat=True)), new_status, request.user,
+            reason="Action groupée depuis l'administration"
+        )
+        updated = sum(1 for result in results if result['outcome'] == 'updated')
+        self.message_user(
+            request,
+            f"{updated} candidature(s) passée(s) au statut « {dict(Application.STATUS_CHOICES)[new_status]} », "
+            f"{len(results) - updated} inchangée(s)."
+        )
+    
+    @admin.action(description="Passer en cours d'examen")
+    def mark_reviewing(self, request, queryset):
+        self.change_status(request, queryset, 'reviewing')
+    
+    @admin.action(description="Présélectionner")
+    def mark_shortlisted(self, request, queryset):
+        self.change_status(request, queryset, 'shortlisted')
+    
+    @admin.action(description="Rejeter")
+    def mark_rejected(self, request, queryset):
+        self.change_status(request, queryset, 'rejected')
     
     def candidate_name(self, obj):
         return obj.candidate.user.full_name
@@ -113,6 +146,7 @@ class ApplicationRatingAdmin(admin.ModelAdmin):
         'application__job__title'
     )
     readonly_fields = ('created_at', 'score_percentage')
+    autocomplete_fields = ('application', 'evaluator')
 
 
 @admin.register(ApplicationComment)
@@ -125,6 +159,7 @@ class ApplicationCommentAdmin(admin.ModelAdmin):
         'content'
     )
     readonly_fields = ('created_at', 'updated_at')
+    autocomplete_fields = ('application', 'author')
 
 
 @admin.register(Interview)
@@ -141,7 +176,7 @@ class InterviewAdmin(admin.ModelAdmin):
     )
     readonly_fields = ('created_at', 'updated_at', 'is_upcoming', 'is_overdue')
     date_hierarchy = 'scheduled_date'
-    filter_horizontal = ('interviewers',)
+    autocomplete_fields = ('application', 'interviewers', 'created_by')
     
     fieldsets = (
         ('Entretien', {
@@ -170,6 +205,7 @@ class ApplicationStatusHistoryAdmin(admin.ModelAdmin):
         'reason'
     )
     readonly_fields = ('changed_at',)
+    autocomplete_fields = ('application', 'changed_by')
     date_hierarchy = 'changed_at'
 
 
@@ -182,3 +218,12 @@ class ApplicationDocumentAdmin(admin.ModelAdmin):
         'application__candidate__user__last_name'
     )
     readonly_fields = ('uploaded_at', 'file_size_mb')
+    autocomplete_fields = ('application', 'uploaded_by')
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ('original_name', 'content_type', 'size', 'status', 'created_at', 'stored_at')
+    list_filter = ('status', 'content_type', 'created_at')
+    search_fields = ('original_name', 'sha256')
+    readonly_fields = ('sha256', 'size', 'content_type', 'storage_name', 'url', 'created_at', 'stored_at')
@@ -5,3 +5,6 @@ class ApplicationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.applications'
     verbose_name = 'Candidatures'
+
+    def ready(self):
+        import apps.applications.signals
@@ -0,0 +1,140 @@
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from utils.cache import bump_cache_version, get_cache_version
+from .models import Interview
+
+CALENDAR_SIGNING_SALT = 'applications.interview_calendar'
+CALENDAR_CACHE_TIMEOUT = 60 * 60 * 24  # 24 heures, l'invalidation passe par les versions
+CALENDAR_PAST_DAYS = 90  # Entretiens passés conservés dans le flux
+
+
+def interview_calendar_namespace(user_id):
+    """Espace de cache du flux d'entretiens d'un interviewer"""
+    return f"interview_calendar:{user_id}"
+
+
+def calendar_token(user):
+    """Jeton signé qui authentifie l'abonnement au flux d'un interviewer
+
+    La version du jeton fait partie de la valeur signée : l'incrémenter
+    (rotate_calendar_token) révoque les liens déjà distribués.
+    """
+    return signing.Signer(salt=CALENDAR_SIGNING_SALT).sign(f"{user.pk}.{user.calendar_token_version}")
+
+
+def parse_calendar_token(token):
+    """(identifiant de l'utilisateur, version du jeton), ou None si le jeton est invalide"""
+    try:
+        user_id, version = signing.Signer(salt=CALENDAR_SIGNING_SALT).unsign(token).split('.')
+        return int(user_id), int(version)
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def rotate_calendar_token(user):
+    """Nouveau lien d'abonnement : l'ancien jeton ne donne plus accès au flux"""
+    User = get_user_model()
+    User.objects.filter(pk=user.pk).update(calendar_token_version=F('calendar_token_version') + 1)
+    user.refresh_from_db(fields=['calendar_token_version'])
+    transaction.on_commit(partial(bump_cache_version, interview_calendar_namespace(user.pk)))
+
+
+def ics_escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def ics_datetime(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def ics_line(name, value):
+    """Ligne de propriété repliée à 75 caractères (RFC 5545)"""
+    line = f"{name}:{value}"
+    parts = [line[:75]]
+    line = line[75:]
+    while line:
+        parts.append(' ' + line[:74])
+        line = line[74:]
+    return '\r\n'.join(parts)
+
+
+def build_interview_calendar(user):
+    """Contenu ICS des entretiens d'un interviewer"""
+    interviews = (
+        user.conducted_interviews
+        .filter(scheduled_date__gte=timezone.now() - timedelta(days=CALENDAR_PAST_DAYS))
+        .select_related('application__candidate__user', 'application__job')
+        .order_by('scheduled_date')
+    )
+    site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000').rstrip('/')
+    host = site_url.split('://')[-1]
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Plateforme de recrutement//Entretiens//FR',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        ics_line('X-WR-CALNAME', ics_escape(f"Entretiens - {user.full_name.strip() or user.username}")),
+    ]
+    for interview in interviews:
+        application = interview.application
+        end = interview.scheduled_date + timedelta(minutes=interview.duration_minutes)
+        url = site_url + reverse('applications:application_detail', kwargs={'pk': application.pk})
+        lines += [
+            'BEGIN:VEVENT',
+            f"UID:interview-{interview.pk}@{host}",
+            f"DTSTAMP:{ics_datetime(interview.updated_at)}",
+            f"DTSTART:{ics_datetime(interview.scheduled_date)}",
+            f"DTEND:{ics_datetime(end)}",
+            ics_line('SUMMARY', ics_escape(
+                f"Entretien {interview.get_interview_type_display()} - "
+                f"{application.candidate.user.full_name} ({application.job.title})"
+            )),
+            ics_line('DESCRIPTION', ics_escape(f"Statut : {interview.get_status_display()}\n{url}")),
+            ics_line('URL', url),
+            'STATUS:CANCELLED' if interview.status == 'cancelled' else 'STATUS:CONFIRMED',
+        ]
+        if interview.location:
+            lines.append(ics_line('LOCATION', ics_escape(interview.location)))
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def get_interview_calendar(user_id):
+    """Flux d'un interviewer depuis le cache : {'etag', 'body', 'token_version'}
+
+    body est None si le compte n'a pas droit au flux. Le flux n'est reconstruit
+    que lorsque la version de l'interviewer a été incrémentée par un signal
+    (entretiens, noms affichés) ou par la rotation de son jeton.
+    """
+    key = "interview_calendar:{}:{}".format(
+        user_id, get_cache_version(interview_calendar_namespace(user_id))
+    )
+    feed = cache.get(key)
+    if feed is None:
+        User = get_user_model()
+        user = User.objects.filter(pk=user_id, is_active=True, user_type__in=['admin', 'hr']).first()
+        body = build_interview_calendar(user) if user is not None else None
+        feed = {
+            'etag': f'"{hashlib.md5(body.encode()).hexdigest()}"' if body is not None else None,
+            'body': body,
+            'token_version': user.calendar_token_version if user is not None else None,
+        }
+        cache.set(key, feed, CALENDAR_CACHE_TIMEOUT)
+    return feed
@@ -1,13 +1,25 @@
 from django import forms
 from django.core.exceptions import ValidationError
+from django.urls import reverse_lazy
+from django.utils import timezone
 from crispy_forms.helper import FormHelper
-from crispy_forms.layout import Layout, Submit, Row, Column, Div, HTML, Field
+from crispy_forms.layout import Layout, Submit, Row, Column, Div, HTML
+from django.core.files.uploadedfile import UploadedFile
+from .lookups import interviewers, job_label, published_jobs, user_label
 from .models import Application, ApplicationComment, Interview, ApplicationRating
-from apps.jobs.models import Job
+from .scheduling import find_conflicts
+from .uploads import discard_staged_uploads, is_resume_file, stage_upload
+from utils.widgets import RemoteSelect, RemoteSelectMultiple
 
 
 class ApplicationForm(forms.ModelForm):
     """Formulaire de candidature"""
+    # Champ du formulaire -> fichier déposé correspondant sur la candidature
+    UPLOAD_FIELDS = {
+        'resume_file': 'resume_upload',
+        'additional_documents': 'documents_upload',
+    }
+
     class Meta:
         model = Application
         fields = [
@@ -65,9 +77,41 @@ class ApplicationForm(forms.ModelForm):
             file_extension = resume_file.name.lower().split('.')[-1]
             if f'.{file_extension}' not in allowed_extensions:
                 raise ValidationError("Seuls les fichiers PDF, DOC et DOCX sont autorisés pour le CV.")
+            
+            # Vérifier le contenu réel (type détecté, puis document Word dans les conteneurs ZIP et OLE)
+            if isinstance(resume_file, UploadedFile):
+                if not is_resume_file(resume_file):
+                    raise ValidationError("Le contenu du fichier ne correspond pas à un document PDF, DOC ou DOCX.")
         
         return resume_file
 
+    def save(self, commit=True):
+        """Les fichiers sont confiés au pipeline d'envoi en arrière-plan au lieu d'être envoyés ici
+
+        Avec commit=False, la vue appelle stage_uploads dans la transaction qui
+        enregistre la candidature.
+        """
+        application = super().save(commit=False)
+        if commit:
+            self.stage_uploads(application)
+            application.save()
+        return application
+
+    def stage_uploads(self, application):
+        """Met en attente d'envoi les fichiers reçus et les rattache à la candidature"""
+        self.staged_files = []
+        for field_name, upload_field in self.UPLOAD_FIELDS.items():
+            uploaded = self.cleaned_data.get(field_name)
+            if isinstance(uploaded, UploadedFile):
+                stored = stage_upload(uploaded)
+                self.staged_files.append(stored)
+                setattr(application, upload_field, stored)
+                setattr(application, field_name, None)
+
+    def discard_staged_uploads(self):
+        """Nettoie les fichiers mis en attente par une transaction annulée"""
+        discard_staged_uploads(getattr(self, 'staged_files', []))
+
 
 class ApplicationStatusForm(forms.ModelForm):
     """Formulaire pour changer le statut d'une candidature"""
@@ -95,6 +139,12 @@ class ApplicationStatusForm(forms.ModelForm):
         )
 
 
+class BulkApplicationStatusForm(forms.Form):
+    """Formulaire de changement de statut groupé"""
+    status = forms.ChoiceField(choices=Application.STATUS_CHOICES)
+    reason = forms.CharField(required=False, widget=forms.Textarea(attrs={'rows': 2}))
+
+
 class ApplicationCommentForm(forms.ModelForm):
     """Formulaire pour ajouter un commentaire"""
     class Meta:
@@ -128,18 +178,18 @@ class InterviewForm(forms.ModelForm):
         ]
         widgets = {
             'scheduled_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
-            'interviewers': forms.CheckboxSelectMultiple(),
+            'interviewers': RemoteSelectMultiple(
+                url=reverse_lazy('applications:lookup', args=['interviewers']),
+                placeholder='Rechercher un interviewer...',
+            ),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Filtrer les interviewers (admin et HR seulement)
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        self.fields['interviewers'].queryset = User.objects.filter(
-            user_type__in=['admin', 'hr']
-        )
+        # Filtrer les interviewers (admin et HR seulement) : seuls les sélectionnés sont chargés
+        self.fields['interviewers'].queryset = interviewers()
+        self.fields['interviewers'].label_from_instance = user_label
         
         self.helper = FormHelper()
         self.helper.layout = Layout(
@@ -153,10 +203,33 @@ class InterviewForm(forms.ModelForm):
                 Column('location', css_class='form-group col-md-6 mb-0'),
                 css_class='form-row'
             ),
-            Field('interviewers', template='crispy/checkbox_select_multiple.html'),
+            'interviewers',
             Submit('submit', 'Programmer l\'entretien', css_class='btn btn-primary')
         )
 
+    def clean(self):
+        cleaned_data = super().clean()
+        scheduled_date = cleaned_data.get('scheduled_date')
+        duration_minutes = cleaned_data.get('duration_minutes')
+        interviewers = cleaned_data.get('interviewers')
+        
+        # Refuser un créneau qui chevauche un autre entretien d'un interviewer
+        if scheduled_date and duration_minutes and interviewers:
+            names = {
+                interviewer.pk: interviewer.full_name.strip() or interviewer.username
+                for interviewer in interviewers
+            }
+            conflicts = find_conflicts(
+                list(names), scheduled_date, duration_minutes, exclude_interview=self.instance.pk
+            )
+            for interviewer_id, start, end in conflicts:
+                start, end = timezone.localtime(start), timezone.localtime(end)
+                self.add_error('scheduled_date', ValidationError(
+                    f"{names[interviewer_id]} a déjà un entretien le {start:%d/%m/%Y} "
+                    f"de {start:%H:%M} à {end:%H:%M}."
+                ))
+        return cleaned_data
+
 
 class InterviewFeedbackForm(forms.ModelForm):
     """Formulaire pour le feedback d'entretien"""
@@ -226,10 +299,19 @@ class ApplicationSearchForm(forms.Form):
         required=False,
         widget=forms.TextInput(attrs={'placeholder': 'Nom, email, poste...'})
     )
+    cv_keywords = forms.CharField(
+        max_length=200,
+        required=False,
+        label='Contenu du CV',
+        widget=forms.TextInput(attrs={'placeholder': 'Compétences, diplômes, entreprises...'})
+    )
     job = forms.ModelChoiceField(
-        queryset=Job.objects.filter(status='published'),
+        queryset=published_jobs(),
         required=False,
-        empty_label="Toutes les offres"
+        widget=RemoteSelect(
+            url=reverse_lazy('applications:lookup', args=['jobs']),
+            placeholder='Toutes les offres',
+        )
     )
     status = forms.ChoiceField(
         choices=[('', 'Tous les statuts')] + list(Application.STATUS_CHOICES),
@@ -250,6 +332,7 @@ class ApplicationSearchForm(forms.Form):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields['job'].label_from_instance = job_label
         self.helper = FormHelper()
         self.helper.form_method = 'get'
         self.helper.layout = Layout(
@@ -265,5 +348,9 @@ class ApplicationSearchForm(forms.Form):
                 Column('date_to', css_class='form-group col-md-4 mb-0'),
                 css_class='form-row'
             ),
+            Row(
+                Column('cv_keywords', css_class='form-group col-md-12 mb-0'),
+                css_class='form-row'
+            ),
             Submit('submit', 'Rechercher', css_class='btn btn-primary')
         )
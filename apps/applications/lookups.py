@@ -0,0 +1,63 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from apps.jobs.models import Job
+
+# Résultats par page des listes alimentées à distance (utils/widgets.py)
+LOOKUP_PAGE_SIZE = 20
+
+
+def published_jobs():
+    return Job.objects.filter(status='published')
+
+
+def interviewers():
+    """Utilisateurs pouvant mener un entretien (admin et HR)"""
+    return get_user_model().objects.filter(user_type__in=['admin', 'hr'])
+
+
+def job_label(job):
+    return f"{job.title} — {job.company}"
+
+
+def user_label(user):
+    return user.full_name.strip() or user.username
+
+
+# Source -> (objets proposés, champs recherchés, tri, colonnes chargées, libellé)
+LOOKUPS = {
+    'jobs': (
+        published_jobs,
+        ('title', 'company', 'location'),
+        ('-created_at', '-pk'),
+        ('pk', 'title', 'company'),
+        job_label,
+    ),
+    'interviewers': (
+        interviewers,
+        ('first_name', 'last_name', 'username', 'email'),
+        ('last_name', 'first_name', 'pk'),
+        ('pk', 'first_name', 'last_name', 'username'),
+        user_label,
+    ),
+}
+
+
+def search_lookup(source, term='', page=1):
+    """Une page de résultats d'une source : ([{'id', 'text'}], il reste des résultats)
+
+    Une seule requête de PAGE_SIZE + 1 lignes, sans COUNT : la ligne de plus
+    indique seulement s'il existe une page suivante.
+    """
+    queryset, search_fields, ordering, columns, label = LOOKUPS[source]
+    objects = queryset().only(*columns).order_by(*ordering)
+    for word in term.split():
+        objects = objects.filter(reduce(or_, (Q(**{f'{field}__icontains': word}) for field in search_fields)))
+
+    offset = (page - 1) * LOOKUP_PAGE_SIZE
+    rows = list(objects[offset:offset + LOOKUP_PAGE_SIZE + 1])
+    results = [{'id': obj.pk, 'text': label(obj)} for obj in rows[:LOOKUP_PAGE_SIZE]]
+    return results, len(rows) > LOOKUP_PAGE_SIZE
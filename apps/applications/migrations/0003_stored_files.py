@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_alter_application_additional_documents_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('content_type', models.CharField(help_text='Type MIME détecté sur le contenu', max_length=100)),
+                ('original_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('storing', 'Envoi en cours'), ('stored', 'Stocké'), ('failed', 'Échec')], db_index=True, default='pending', max_length=10)),
+                ('storage_name', models.CharField(blank=True, help_text='Nom du fichier dans le stockage', max_length=500)),
+                ('url', models.URLField(blank=True, max_length=500)),
+                ('error', models.CharField(blank=True, max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('stored_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Fichier déposé',
+                'verbose_name_plural': 'Fichiers déposés',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='documents_upload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='document_applications', to='applications.storedfile'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='resume_upload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resume_applications', to='applications.storedfile'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_candidatesearchdocument_indexes_and_backfill'),
+        ('applications', '0004_interview_scheduling'),
+        ('jobs', '0005_published_partial_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='applicationstatushistory',
+            name='changed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='interview',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Programmé'), ('in_progress', 'En cours'), ('completed', 'Terminé'), ('cancelled', 'Annulé'), ('rescheduled', 'Reprogrammé'), ('overdue', 'En retard')], default='scheduled', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['applied_at'], name='application_pending_idx'),
+        ),
+    ]
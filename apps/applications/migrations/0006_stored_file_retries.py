@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_sweeper_statuses'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedfile',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text="Nombre d'envois au stockage tentés"),
+        ),
+        migrations.AddField(
+            model_name='storedfile',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='Début du dernier envoi', null=True),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -8,6 +10,53 @@ from cloudinary.models import CloudinaryField
 
 User = get_user_model()
 
+# Durée maximale d'un entretien, qui borne aussi la recherche des conflits d'agenda
+MAX_INTERVIEW_MINUTES = 8 * 60
+
+
+class StoredFile(models.Model):
+    """Fichier déposé, dédoublonné par empreinte SHA-256
+
+    Le fichier est d'abord écrit dans un répertoire temporaire local, puis une
+    tâche de fond l'envoie au stockage (Cloudinary ou système de fichiers).
+    """
+    STATUS_CHOICES = (
+        ('pending', 'En attente'),
+        ('storing', 'Envoi en cours'),
+        ('stored', 'Stocké'),
+        ('failed', 'Échec'),
+    )
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100, help_text="Type MIME détecté sur le contenu")
+    original_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+    storage_name = models.CharField(max_length=500, blank=True, help_text="Nom du fichier dans le stockage")
+    url = models.URLField(max_length=500, blank=True)
+    error = models.CharField(max_length=500, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Nombre d'envois au stockage tentés")
+    claimed_at = models.DateTimeField(blank=True, null=True, help_text="Début du dernier envoi")
+    created_at = models.DateTimeField(auto_now_add=True)
+    stored_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Fichier déposé'
+        verbose_name_plural = 'Fichiers déposés'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.original_name} ({self.sha256[:12]})"
+
+
+def uploaded_file_url(upload, legacy_file):
+    """URL d'un document de candidature : fichier déposé une fois stocké, sinon champ Cloudinary"""
+    if upload is not None:
+        return upload.url if upload.status == 'stored' else ''
+    if legacy_file and getattr(settings, 'CLOUDINARY_ACTIVE', False):
+        return legacy_file.url
+    return ''
+
 
 class Application(models.Model):
     """Candidature à une offre d'emploi"""
@@ -57,6 +106,16 @@ class Application(models.Model):
         resource_type='raw'
     )
     
+    # Fichiers déposés via le pipeline asynchrone (remplacent les champs Cloudinary ci-dessus)
+    resume_upload = models.ForeignKey(
+        StoredFile, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='resume_applications'
+    )
+    documents_upload = models.ForeignKey(
+        StoredFile, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='document_applications'
+    )
+    
     # Informations supplémentaires
     expected_salary = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     availability_date = models.DateField(blank=True, null=True)
@@ -78,6 +137,13 @@ class Application(models.Model):
         verbose_name_plural = 'Candidatures'
         unique_together = ['candidate', 'job']
         ordering = ['-applied_at']
+        indexes = [
+            # Candidatures en attente, parcourues par le rejet automatique
+            models.Index(
+                fields=['applied_at'], name='application_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.candidate.user.full_name} - {self.job.title}"
@@ -90,6 +156,21 @@ class Application(models.Model):
         """Nombre de jours depuis la candidature"""
         return (timezone.now().date() - self.applied_at.date()).days
 
+    @property
+    def resume_url(self):
+        return uploaded_file_url(self.resume_upload, self.resume_file)
+
+    @property
+    def documents_url(self):
+        return uploaded_file_url(self.documents_upload, self.additional_documents)
+
+    @property
+    def resume_source(self):
+        """Fichier du CV joint à indexer : fichier déposé une fois stocké, sinon champ Cloudinary"""
+        if self.resume_upload_id:
+            return self.resume_upload if self.resume_upload.status == 'stored' else None
+        return self.resume_file
+
     def mark_as_reviewed(self, reviewer):
         """Marquer comme examiné"""
         self.reviewed_by = reviewer
@@ -174,6 +255,7 @@ class Interview(models.Model):
         ('completed', 'Terminé'),
         ('cancelled', 'Annulé'),
         ('rescheduled', 'Reprogrammé'),
+        ('overdue', 'En retard'),
     )
 
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='interviews')
@@ -182,7 +264,9 @@ class Interview(models.Model):
     
     # Planification
     scheduled_date = models.DateTimeField()
-    duration_minutes = models.PositiveIntegerField(default=60)
+    duration_minutes = models.PositiveIntegerField(
+        default=60, validators=[MinValueValidator(5), MaxValueValidator(MAX_INTERVIEW_MINUTES)]
+    )
     location = models.CharField(max_length=200, blank=True)  # Adresse ou lien de visio
     
     # Participants
@@ -206,6 +290,10 @@ class Interview(models.Model):
         verbose_name = 'Entretien'
         verbose_name_plural = 'Entretiens'
         ordering = ['scheduled_date']
+        indexes = [
+            # Recherche des occupations des interviewers sur une période
+            models.Index(fields=['scheduled_date', 'status'], name='interview_date_status_idx'),
+        ]
 
     def __str__(self):
         return f"Entretien {self.get_interview_type_display()} - {self.application}"
@@ -218,6 +306,8 @@ class Interview(models.Model):
     @property
     def is_overdue(self):
         """Vérifie si l'entretien est en retard"""
+        if self.status == 'overdue':
+            return True
         return self.scheduled_date < timezone.now() and self.status == 'scheduled'
 
 
@@ -226,7 +316,10 @@ class ApplicationStatusHistory(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_history')
     previous_status = models.CharField(max_length=30, choices=Application.STATUS_CHOICES)
     new_status = models.CharField(max_length=30, choices=Application.STATUS_CHOICES)
-    changed_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='status_changes')
+    # Vide pour les changements automatiques (rejet après délai)
+    changed_by = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='status_changes', null=True, blank=True
+    )
     reason = models.TextField(blank=True)
     changed_at = models.DateTimeField(auto_now_add=True)
 
@@ -0,0 +1,131 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import MAX_INTERVIEW_MINUTES, Interview
+
+# Entretiens qui occupent encore l'agenda des interviewers
+ACTIVE_INTERVIEW_STATUSES = ('scheduled', 'in_progress')
+
+WORKDAY_START = time(9, 0)
+WORKDAY_END = time(18, 0)
+WORKING_DAYS = (0, 1, 2, 3, 4)  # Du lundi au vendredi
+SLOT_STEP_MINUTES = 15
+DEFAULT_SEARCH_DAYS = 14
+DEFAULT_SLOT_COUNT = 5
+
+
+def busy_rows(interviewer_ids, start, end, exclude_interview=None):
+    """Créneaux occupés par des interviewers entre deux dates : [(interviewer_id, début, fin)]
+
+    Une seule requête sur la table de liaison, bornée sur scheduled_date
+    (index scheduled_date, status) ; le chevauchement exact est vérifié ici.
+    """
+    through = Interview.interviewers.through.objects.filter(
+        user_id__in=interviewer_ids,
+        interview__status__in=ACTIVE_INTERVIEW_STATUSES,
+        interview__scheduled_date__lt=end,
+        interview__scheduled_date__gt=start - timedelta(minutes=MAX_INTERVIEW_MINUTES),
+    )
+    if exclude_interview is not None:
+        through = through.exclude(interview_id=exclude_interview)
+
+    rows = []
+    for user_id, scheduled_date, duration in through.values_list(
+        'user_id', 'interview__scheduled_date', 'interview__duration_minutes'
+    ):
+        interview_end = scheduled_date + timedelta(minutes=duration)
+        if interview_end > start:
+            rows.append((user_id, scheduled_date, interview_end))
+    return rows
+
+
+def merge_intervals(intervals):
+    """Fusionne des intervalles (début, fin) qui se chevauchent ou se touchent"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def busy_intervals(interviewer_ids, start, end, exclude_interview=None):
+    """Intervalles occupés et fusionnés de chaque interviewer : {interviewer_id: [(début, fin)]}"""
+    per_interviewer = {}
+    for user_id, busy_start, busy_end in busy_rows(interviewer_ids, start, end, exclude_interview):
+        per_interviewer.setdefault(user_id, []).append((busy_start, busy_end))
+    return {user_id: merge_intervals(intervals) for user_id, intervals in per_interviewer.items()}
+
+
+def find_conflicts(interviewer_ids, scheduled_date, duration_minutes, exclude_interview=None):
+    """Entretiens existants qui chevauchent le créneau demandé : [(interviewer_id, début, fin)]"""
+    end = scheduled_date + timedelta(minutes=duration_minutes)
+    return sorted(
+        busy_rows(interviewer_ids, scheduled_date, end, exclude_interview),
+        key=lambda row: (row[1], row[0]),
+    )
+
+
+def lock_interviewers(interviewer_ids):
+    """Verrouille les interviewers jusqu'à la fin de la transaction
+
+    Deux réservations concurrentes pour un même interviewer sont ainsi
+    vérifiées l'une après l'autre (sans effet sur SQLite).
+    """
+    User = get_user_model()
+    list(User.objects.select_for_update().filter(pk__in=interviewer_ids).values_list('pk', flat=True))
+
+
+def round_up(moment):
+    """Arrondit une date au pas de créneau supérieur"""
+    if moment.second or moment.microsecond:
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    return moment + timedelta(minutes=-moment.minute % SLOT_STEP_MINUTES)
+
+
+def find_free_slots(interviewer_ids, duration_minutes, start=None,
+                    days=DEFAULT_SEARCH_DAYS, count=DEFAULT_SLOT_COUNT):
+    """Premiers créneaux libres communs à tous les interviewers : [(début, fin)]
+
+    Les occupations de tous les interviewers sont chargées en une requête
+    puis fusionnées ; les créneaux sont cherchés dans les heures ouvrées des
+    jours ouvrés, à partir de maintenant au plus tôt.
+    """
+    duration = timedelta(minutes=duration_minutes)
+    now = timezone.now()
+    start = round_up(max(start or now, now))
+    first_day = timezone.localtime(start).date()
+
+    def at(day, moment):
+        return timezone.make_aware(datetime.combine(day, moment))
+
+    search_end = at(first_day + timedelta(days=days - 1), WORKDAY_END)
+    busy = merge_intervals(
+        (busy_start, busy_end)
+        for _, busy_start, busy_end in busy_rows(interviewer_ids, start, search_end)
+    )
+
+    slots = []
+    index = 0
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        if day.weekday() not in WORKING_DAYS:
+            continue
+        cursor = max(at(day, WORKDAY_START), start)
+        day_end = at(day, WORKDAY_END)
+        while cursor + duration <= day_end:
+            # Les occupations étant triées, celles terminées avant le curseur sont ignorées
+            while index < len(busy) and busy[index][1] <= cursor:
+                index += 1
+            if index < len(busy) and busy[index][0] < cursor + duration:
+                cursor = round_up(busy[index][1])
+                continue
+            slots.append((cursor, cursor + duration))
+            if len(slots) >= count:
+                return slots
+            cursor += duration
+    return slots
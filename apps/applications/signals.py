@@ -0,0 +1,90 @@
+from datetime import timedelta
+from functools import partial
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from utils.cache import bump_cache_version
+from .calendar import CALENDAR_PAST_DAYS, interview_calendar_namespace
+from apps.jobs.categories import add_category_applications
+from apps.jobs.models import Job
+from .models import Application, Interview
+
+# Champs affichés dans les flux ICS (nom du candidat ou de l'interviewer, accès au flux)
+CALENDAR_USER_FIELDS = {'first_name', 'last_name', 'user_type', 'is_active'}
+
+
+def invalidate_interview_calendars(user_ids):
+    for user_id in user_ids:
+        bump_cache_version(interview_calendar_namespace(user_id))
+
+
+def schedule_calendar_invalidation(user_ids):
+    """Invalider les flux ICS des interviewers après validation de la transaction"""
+    user_ids = set(user_ids)
+    if user_ids:
+        transaction.on_commit(partial(invalidate_interview_calendars, user_ids))
+
+
+@receiver(post_save, sender=Interview)
+@receiver(pre_delete, sender=Interview)
+def invalidate_calendars_on_interview(sender, instance, **kwargs):
+    """Invalider les flux des interviewers d'un entretien modifié ou supprimé"""
+    # pre_delete : les interviewers sont encore liés à l'entretien
+    schedule_calendar_invalidation(instance.interviewers.values_list('pk', flat=True))
+
+
+def feed_interviewer_ids(**filters):
+    """Interviewers dont le flux contient un entretien correspondant aux filtres"""
+    return Interview.interviewers.through.objects.filter(
+        interview__scheduled_date__gte=timezone.now() - timedelta(days=CALENDAR_PAST_DAYS),
+        **{f'interview__{lookup}': value for lookup, value in filters.items()},
+    ).values_list('user_id', flat=True)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_calendars_on_user(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Invalider les flux qui affichent le nom d'un utilisateur renommé
+
+    Les sauvegardes partielles qui ne touchent pas ces champs (last_login à la
+    connexion) sont ignorées.
+    """
+    if created or raw or (update_fields is not None and not CALENDAR_USER_FIELDS & set(update_fields)):
+        return
+    user_ids = set(feed_interviewer_ids(application__candidate__user=instance))
+    user_ids.add(instance.pk)
+    schedule_calendar_invalidation(user_ids)
+
+
+@receiver(post_save, sender=Job)
+def invalidate_calendars_on_job(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Invalider les flux qui affichent le titre d'une offre modifiée"""
+    if created or raw or (update_fields is not None and 'title' not in update_fields):
+        return
+    schedule_calendar_invalidation(feed_interviewer_ids(application__job=instance))
+
+
+@receiver(m2m_changed, sender=Interview.interviewers.through)
+def invalidate_calendars_on_interviewers(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalider les flux des interviewers ajoutés ou retirés d'un entretien"""
+    if reverse:
+        # user.conducted_interviews.add(...) : seul le flux de cet utilisateur change
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_calendar_invalidation([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        schedule_calendar_invalidation(pk_set)
+    elif action == 'pre_clear':
+        schedule_calendar_invalidation(instance.interviewers.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Application)
+def count_category_application(sender, instance, created, raw=False, **kwargs):
+    """Nombre de candidatures de la catégorie de l'offre"""
+    if created and not raw:
+        add_category_applications(instance.job_id, 1)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_category_application(sender, instance, **kwargs):
+    add_category_applications(instance.job_id, -1)
@@ -0,0 +1,299 @@
+import hashlib
+import os
+import struct
+import zipfile
+from datetime import timedelta
+
+import magic
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import StoredFile
+
+SNIFF_BYTES = 2048
+STORE_BATCH_SIZE = 20
+# Un envoi en échec est retenté jusqu'à STORE_MAX_ATTEMPTS fois, au plus une fois par STORE_RETRY_DELAY
+STORE_MAX_ATTEMPTS = 5
+STORE_RETRY_DELAY = timedelta(minutes=5)
+# Un envoi « en cours » depuis plus longtemps a été interrompu (worker arrêté) : il est repris
+STORE_CLAIM_TIMEOUT = timedelta(minutes=30)
+
+OLE_SIGNATURE = bytes.fromhex('d0cf11e0a1b11ae1')
+OLE_MAX_SECTOR = 0xFFFFFFFA  # Au-delà : fin de chaîne, secteur libre ou réservé
+
+
+def read_upload(uploaded):
+    uploaded.seek(0)
+    try:
+        return uploaded.read()
+    finally:
+        uploaded.seek(0)
+
+
+def is_docx(uploaded):
+    """Archive ZIP contenant le corps d'un document Word (word/document.xml)"""
+    uploaded.seek(0)
+    try:
+        with zipfile.ZipFile(uploaded) as archive:
+            return 'word/document.xml' in archive.namelist()
+    except (zipfile.BadZipFile, OSError):
+        return False
+    finally:
+        uploaded.seek(0)
+
+
+def ole_stream_names(data):
+    """Noms des flux d'un fichier OLE (Compound File Binary), lus dans son répertoire
+
+    Suffisant pour les fichiers dont la FAT tient dans l'en-tête (environ 7 Mo
+    avec des secteurs de 512 octets) ; les CV sont limités à 5 Mo.
+    """
+    if len(data) < 512 or data[:8] != OLE_SIGNATURE:
+        return set()
+    sector_size = 1 << struct.unpack_from('<H', data, 30)[0]
+    if sector_size not in (512, 4096):
+        return set()
+
+    def sector(number):
+        start = (number + 1) * sector_size
+        block = data[start:start + sector_size]
+        return block if len(block) == sector_size else None
+
+    fat = []
+    for number in struct.unpack_from('<109I', data, 76):
+        block = sector(number) if number <= OLE_MAX_SECTOR else None
+        if block is not None:
+            fat.extend(struct.unpack(f'<{sector_size // 4}I', block))
+
+    names = set()
+    current, seen = struct.unpack_from('<I', data, 48)[0], set()
+    while current < len(fat) and current not in seen:
+        seen.add(current)
+        block = sector(current)
+        if block is None:
+            break
+        for offset in range(0, sector_size, 128):
+            name_length = struct.unpack_from('<H', block, offset + 64)[0]
+            if block[offset + 66] == 2 and 2 <= name_length <= 64:  # Entrée de type flux
+                names.add(block[offset:offset + name_length - 2].decode('utf-16-le', 'ignore'))
+        current = fat[current]
+    return names
+
+
+def is_word_binary(uploaded):
+    """Fichier OLE contenant le flux WordDocument d'un document Word 97-2003"""
+    return 'WordDocument' in ole_stream_names(read_upload(uploaded))
+
+
+# Types acceptés pour un CV -> vérification du contenu (None : le type détecté suffit).
+# DOC et DOCX peuvent n'être reconnus que par leur conteneur (ZIP, OLE) : le
+# document Word doit alors être présent dans le conteneur.
+RESUME_CONTENT_TYPES = {
+    'application/pdf': None,
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': is_docx,
+    'application/zip': is_docx,
+    'application/msword': is_word_binary,
+    'application/x-ole-storage': is_word_binary,
+    'application/CDFV2': is_word_binary,
+}
+
+
+def sniff_content_type(head):
+    """Type MIME réel d'un fichier, détecté par libmagic sur ses premiers octets"""
+    if not head:
+        return 'application/x-empty'
+    return magic.from_buffer(head, mime=True)
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """Écrit le fichier sur disque par morceaux en calculant son empreinte et son type réel"""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+        self.head = b''
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        if len(self.head) < SNIFF_BYTES:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.hasher.hexdigest()
+        uploaded.sniffed_content_type = sniff_content_type(self.head)
+        return uploaded
+
+
+def file_signature(uploaded):
+    """Empreinte SHA-256 et type MIME d'un fichier reçu
+
+    Calculés pendant la réception par HashingUploadHandler ; recalculés par
+    morceaux si le fichier a été reçu par un autre gestionnaire.
+    """
+    if not hasattr(uploaded, 'sha256'):
+        hasher = hashlib.sha256()
+        head = b''
+        for chunk in uploaded.chunks():
+            hasher.update(chunk)
+            if len(head) < SNIFF_BYTES:
+                head += chunk[:SNIFF_BYTES - len(head)]
+        uploaded.seek(0)
+        uploaded.sha256 = hasher.hexdigest()
+        uploaded.sniffed_content_type = sniff_content_type(head)
+    return uploaded.sha256, uploaded.sniffed_content_type
+
+
+def is_resume_file(uploaded):
+    """Le fichier reçu est-il un PDF, DOC ou DOCX, d'après son contenu ?"""
+    _, content_type = file_signature(uploaded)
+    if content_type not in RESUME_CONTENT_TYPES:
+        return False
+    check = RESUME_CONTENT_TYPES[content_type]
+    return check is None or check(uploaded)
+
+
+def spool_path(sha256):
+    return os.path.join(settings.UPLOAD_SPOOL_DIR, sha256)
+
+
+def spool_file(uploaded, path):
+    """Place le fichier reçu dans le répertoire d'attente (déplacement sans copie si possible)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if hasattr(uploaded, 'temporary_file_path'):
+        file_move_safe(uploaded.temporary_file_path(), path, allow_overwrite=True)
+    else:
+        with open(path, 'wb') as destination:
+            for chunk in uploaded.chunks():
+                destination.write(chunk)
+
+
+def stage_upload(uploaded):
+    """Enregistre un fichier reçu pour envoi en arrière-plan et retourne son StoredFile
+
+    Un fichier déjà connu (même empreinte) n'est ni réécrit ni renvoyé au stockage.
+    """
+    sha256, content_type = file_signature(uploaded)
+    stored, created = StoredFile.objects.get_or_create(
+        sha256=sha256,
+        defaults={
+            'size': uploaded.size,
+            'content_type': content_type[:100],
+            'original_name': os.path.basename(uploaded.name)[:255],
+        }
+    )
+    if created or stored.status == 'failed':
+        spool_file(uploaded, spool_path(sha256))
+        if not created:
+            StoredFile.objects.filter(pk=stored.pk).update(status='pending', error='', attempts=0)
+            stored.status = 'pending'
+        transaction.on_commit(schedule_upload_storage)
+    return stored
+
+
+def discard_staged_uploads(stored_files):
+    """Supprime les fichiers en attente des envois annulés par le rollback de leur transaction
+
+    Un fichier dont la ligne n'existe plus, ou n'a plus de tentative, ne sera
+    jamais envoyé au stockage.
+    """
+    for stored in stored_files:
+        current = StoredFile.objects.filter(pk=stored.pk).values_list('status', 'attempts').first()
+        if current is None or (current[0] == 'failed' and current[1] >= STORE_MAX_ATTEMPTS):
+            path = spool_path(stored.sha256)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def schedule_upload_storage():
+    from apps.core.tasks import store_uploaded_files
+    store_uploaded_files.delay()
+
+
+def get_upload_storage():
+    return import_string(settings.UPLOAD_STORAGE_BACKEND)()
+
+
+def absolute_url(url):
+    if url.startswith('/'):
+        return getattr(settings, 'SITE_URL', 'http://localhost:8000').rstrip('/') + url
+    return url
+
+
+def store_file(stored, storage):
+    """Envoie un fichier en attente au stockage ; retourne True en cas de succès"""
+    path = spool_path(stored.sha256)
+    extension = os.path.splitext(stored.original_name)[1].lower()[:10]
+    try:
+        with open(path, 'rb') as source:
+            name = storage.save(
+                f'recruitment/uploads/{stored.sha256[:2]}/{stored.sha256}{extension}', File(source)
+            )
+        url = absolute_url(storage.url(name))
+    except Exception as exc:
+        StoredFile.objects.filter(pk=stored.pk).update(
+            status='failed', error=str(exc)[:500] or exc.__class__.__name__
+        )
+        if stored.attempts >= STORE_MAX_ATTEMPTS and os.path.exists(path):
+            # Dernière tentative : le fichier ne sera renvoyé que s'il est déposé à nouveau
+            os.remove(path)
+        return False
+
+    StoredFile.objects.filter(pk=stored.pk).update(
+        status='stored', storage_name=name[:500], url=url[:500], error='', stored_at=timezone.now()
+    )
+    os.remove(path)
+    stored.status, stored.storage_name, stored.url = 'stored', name, url
+    index_stored_resume(stored)
+    return True
+
+
+def index_stored_resume(stored):
+    """Indexe le CV stocké pour les candidatures qui le référencent"""
+    from apps.accounts.resumes import sync_resume_document
+    from apps.accounts.signals import schedule_resume_extraction
+
+    pending = False
+    for application_id, candidate_id in stored.resume_applications.values_list('pk', 'candidate_id'):
+        pending |= sync_resume_document(candidate_id, stored, application_id=application_id)
+    if pending:
+        schedule_resume_extraction()
+
+
+def storable_files(now):
+    """Fichiers à envoyer : en attente, en échec à retenter, ou dont l'envoi a été interrompu"""
+    # claimed_at vide : fichiers réservés avant le suivi des tentatives
+    retry = Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - STORE_RETRY_DELAY)
+    reclaim = Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - STORE_CLAIM_TIMEOUT)
+    return (
+        Q(status='pending')
+        | Q(retry, status='failed', attempts__lt=STORE_MAX_ATTEMPTS)
+        | Q(reclaim, status='storing')
+    )
+
+
+def store_pending_uploads(limit=None):
+    """Envoie au stockage les fichiers déposés en attente
+
+    Chaque fichier est réservé par une mise à jour conditionnelle : deux
+    workers ne l'envoient jamais tous les deux. Les échecs sont retentés
+    (STORE_MAX_ATTEMPTS) et les envois interrompus repris après STORE_CLAIM_TIMEOUT.
+    """
+    storage = get_upload_storage()
+    now = timezone.now()
+    candidates = StoredFile.objects.filter(storable_files(now)).order_by('pk').values_list('pk', flat=True)
+    stored_count = 0
+    for pk in list(candidates[:limit or STORE_BATCH_SIZE]):
+        claimed = StoredFile.objects.filter(storable_files(now), pk=pk).update(
+            status='storing', claimed_at=timezone.now(), attempts=F('attempts') + 1
+        )
+        if claimed:
+            stored_count += store_file(StoredFile.objects.get(pk=pk), storage)
+    return stored_count
@@ -13,10 +13,15 @@ urlpatterns = [
     # Gestion admin/hr
     path('', views.applications_list, name='applications_list'),
     path('<int:pk>/update-status/', views.update_application_status, name='update_status'),
+    path('bulk-status/', views.bulk_update_status, name='bulk_update_status'),
+    path('lookup/<slug:source>/', views.lookup, name='lookup'),
     path('<int:pk>/add-comment/', views.add_comment, name='add_comment'),
     path('<int:pk>/rate/', views.rate_application, name='rate_application'),
     
     # Entretiens
     path('<int:pk>/schedule-interview/', views.schedule_interview, name='schedule_interview'),
+    path('interview-slots/', views.interview_slots, name='interview_slots'),
+    path('calendar/<str:token>/entretiens.ics', views.interview_calendar, name='interview_calendar'),
+    path('calendar/regenerate/', views.regenerate_calendar_link, name='regenerate_calendar_link'),
     path('interview/<int:interview_id>/feedback/', views.interview_feedback, name='interview_feedback'),
 ]
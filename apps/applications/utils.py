@@ -0,0 +1,66 @@
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Application, ApplicationStatusHistory
+
+BULK_STATUS_MAX_APPLICATIONS = 1000
+
+
+def notify_bulk_status_change(application_ids, candidate_ids):
+    """Effets de bord d'un changement de statut groupé, après validation de la transaction"""
+    from apps.accounts.snapshot import CandidateSnapshot
+    from apps.core.tasks import send_application_status_emails
+
+    for candidate_id in candidate_ids:
+        CandidateSnapshot.invalidate(candidate_id)
+    send_application_status_emails.delay(application_ids)
+
+
+def bulk_update_application_status(application_ids, new_status, changed_by, reason=''):
+    """Change le statut de plusieurs candidatures en une transaction
+
+    Les lignes sont verrouillées puis mises à jour en un seul UPDATE, l'historique
+    est écrit en un seul INSERT et les candidats sont notifiés par une seule tâche.
+    Retourne le résultat de chaque candidature demandée :
+    {'id', 'outcome' ('updated', 'unchanged' ou 'not_found'), 'previous_status'}.
+    """
+    application_ids = list(dict.fromkeys(application_ids))
+    results = []
+    with transaction.atomic():
+        current = {
+            pk: (status, candidate_id)
+            for pk, status, candidate_id in Application.objects.select_for_update()
+            .filter(pk__in=application_ids)
+            .values_list('pk', 'status', 'candidate_id')
+        }
+
+        changed = []
+        for pk in application_ids:
+            if pk not in current:
+                results.append({'id': pk, 'outcome': 'not_found', 'previous_status': None})
+                continue
+            previous_status = current[pk][0]
+            if previous_status == new_status:
+                results.append({'id': pk, 'outcome': 'unchanged', 'previous_status': previous_status})
+            else:
+                results.append({'id': pk, 'outcome': 'updated', 'previous_status': previous_status})
+                changed.append(pk)
+
+        if changed:
+            Application.objects.filter(pk__in=changed).update(status=new_status, updated_at=timezone.now())
+            ApplicationStatusHistory.objects.bulk_create([
+                ApplicationStatusHistory(
+                    application_id=pk,
+                    previous_status=current[pk][0],
+                    new_status=new_status,
+                    changed_by=changed_by,
+                    reason=reason,
+                )
+                for pk in changed
+            ])
+            # update() ne déclenche pas les signaux : caches et emails traités après validation
+            candidate_ids = {current[pk][1] for pk in changed}
+            transaction.on_commit(partial(notify_bulk_status_change, changed, candidate_ids))
+    return results
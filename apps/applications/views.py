@@ -3,27 +3,55 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.db.models import Q, Avg, Count
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags
 from django.views.decorators.http import require_http_methods
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.utils import timezone
+from django.db import IntegrityError, transaction
+from functools import partial
 from .models import (
     Application, ApplicationComment, Interview, 
-    ApplicationRating, ApplicationStatusHistory
+    ApplicationRating, ApplicationStatusHistory, MAX_INTERVIEW_MINUTES
 )
 from .forms import (
     ApplicationForm, ApplicationStatusForm, ApplicationCommentForm,
     InterviewForm, InterviewFeedbackForm, ApplicationRatingForm,
-    ApplicationSearchForm
+    ApplicationSearchForm, BulkApplicationStatusForm
 )
+from .utils import BULK_STATUS_MAX_APPLICATIONS, bulk_update_application_status
+from .calendar import get_interview_calendar, parse_calendar_token, rotate_calendar_token
+from .lookups import LOOKUPS, search_lookup
+from .scheduling import DEFAULT_SLOT_COUNT, find_free_slots, lock_interviewers
+from .uploads import HashingUploadHandler
 from apps.jobs.models import Job
 from apps.accounts.models import CandidateProfile
+from apps.accounts.resumes import filter_applications_by_resume
 # Ajout des imports pour les emails
 from apps.core.tasks import send_application_received_email, send_interview_invitation_email
 
 
 @login_required
+@csrf_exempt
 def apply_to_job(request, job_id):
-    """Postuler à une offre d'emploi"""
+    """Postuler à une offre d'emploi
+    
+    Les fichiers sont reçus par HashingUploadHandler (empreinte et type réel
+    calculés pendant la réception) : le gestionnaire doit être installé avant
+    la lecture de request.POST, d'où la vérification CSRF dans la vue interne.
+    """
+    request.upload_handlers = [HashingUploadHandler(request)]
+    return _apply_to_job(request, job_id)
+
+
+@csrf_protect
+def _apply_to_job(request, job_id):
+    """Traitement de la candidature
+    
+    La candidature et le compteur de l'offre sont écrits dans une transaction ;
+    le doublon est détecté par la contrainte d'unicité (candidat, offre) et les
+    effets de bord (email, scores) partent après validation.
+    """
     job = get_object_or_404(Job, id=job_id, status='published')
     
     # Vérifier que l'utilisateur est un candidat
@@ -31,6 +59,11 @@ def apply_to_job(request, job_id):
         messages.error(request, "Seuls les candidats peuvent postuler aux offres.")
         return redirect('jobs:job_detail', slug=job.slug)
     
+    # Vérifier si l'offre est encore active (sans requête)
+    if not job.is_active:
+        messages.error(request, "Cette offre n'est plus disponible.")
+        return redirect('jobs:job_detail', slug=job.slug)
+    
     # Vérifier que le candidat a un profil
     try:
         candidate_profile = request.user.candidate_profile
@@ -38,33 +71,32 @@ def apply_to_job(request, job_id):
         messages.error(request, "Vous devez compléter votre profil avant de postuler.")
         return redirect('accounts:edit_profile')
     
-    # Vérifier si le candidat a déjà postulé
-    if Application.objects.filter(candidate=candidate_profile, job=job).exists():
-        messages.warning(request, "Vous avez déjà postulé à cette offre.")
-        return redirect('jobs:job_detail', slug=job.slug)
-    
-    # Vérifier si l'offre est encore active
-    if not job.is_active:
-        messages.error(request, "Cette offre n'est plus disponible.")
-        return redirect('jobs:job_detail', slug=job.slug)
-    
     if request.method == 'POST':
         form = ApplicationForm(request.POST, request.FILES, job=job)
         if form.is_valid():
             application = form.save(commit=False)
             application.candidate = candidate_profile
             application.job = job
-            application.save()
-            
-            # Envoyer l'email de confirmation
-            send_application_received_email.delay(application.id)
-            
-            # Incrémenter le compteur de candidatures du job
-            job.increment_applications()
+            try:
+                with transaction.atomic():
+                    # Fichiers mis en attente dans la transaction : un doublon ne laisse aucun envoi
+                    form.stage_uploads(application)
+                    application.save()
+                    # Incrément atomique en dernier : le verrou sur l'offre est tenu le moins longtemps possible
+                    job.increment_applications()
+                    transaction.on_commit(partial(send_application_received_email.delay, application.id))
+            except IntegrityError:
+                form.discard_staged_uploads()
+                messages.warning(request, "Vous avez déjà postulé à cette offre.")
+                return redirect('jobs:job_detail', slug=job.slug)
             
             messages.success(request, 'Votre candidature a été envoyée avec succès!')
             return redirect('applications:my_applications')
     else:
+        # Simple confort d'affichage : la contrainte d'unicité reste la garantie
+        if Application.objects.filter(candidate=candidate_profile, job=job).exists():
+            messages.warning(request, "Vous avez déjà postulé à cette offre.")
+            return redirect('jobs:job_detail', slug=job.slug)
         form = ApplicationForm(job=job)
     
     return render(request, 'applications/apply.html', {
@@ -119,7 +151,9 @@ def my_applications(request):
 @login_required
 def application_detail(request, pk):
     """Détail d'une candidature"""
-    application = get_object_or_404(Application, pk=pk)
+    application = get_object_or_404(
+        Application.objects.select_related('resume_upload', 'documents_upload'), pk=pk
+    )
     
     # Vérifier les permissions
     if request.user.user_type == 'candidate':
@@ -192,6 +226,48 @@ def update_application_status(request, pk):
     })
 
 
+@login_required
+@require_http_methods(["POST"])
+def bulk_update_status(request):
+    """Changer le statut de plusieurs candidatures en une opération"""
+    if request.user.user_type not in ['admin', 'hr']:
+        messages.error(request, "Accès non autorisé.")
+        return redirect('home')
+    
+    wants_json = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    form = BulkApplicationStatusForm(request.POST)
+    try:
+        application_ids = [int(pk) for pk in request.POST.getlist('application_ids')]
+    except ValueError:
+        application_ids = []
+    
+    error = None
+    if not form.is_valid():
+        error = "Statut invalide."
+    elif not application_ids:
+        error = "Veuillez sélectionner au moins une candidature."
+    elif len(application_ids) > BULK_STATUS_MAX_APPLICATIONS:
+        error = f"Au plus {BULK_STATUS_MAX_APPLICATIONS} candidatures par opération."
+    if error:
+        if wants_json:
+            return JsonResponse({'success': False, 'error': error}, status=400)
+        messages.error(request, error)
+        return redirect('applications:applications_list')
+    
+    results = bulk_update_application_status(
+        application_ids,
+        form.cleaned_data['status'],
+        request.user,
+        reason=form.cleaned_data['reason'],
+    )
+    updated = sum(1 for result in results if result['outcome'] == 'updated')
+    
+    if wants_json:
+        return JsonResponse({'success': True, 'updated': updated, 'results': results})
+    messages.success(request, f"{updated} candidature(s) mise(s) à jour sur {len(results)}.")
+    return redirect('applications:applications_list')
+
+
 @login_required
 def add_comment(request, pk):
     """Ajouter un commentaire à une candidature"""
@@ -231,21 +307,26 @@ def schedule_interview(request, pk):
     
     if request.method == 'POST':
         form = InterviewForm(request.POST)
-        if form.is_valid():
-            interview = form.save(commit=False)
-            interview.application = application
-            interview.created_by = request.user
-            interview.save()
-            form.save_m2m()  # Pour les ManyToMany fields
-            
-            # Envoyer l'email d'invitation
-            send_interview_invitation_email.delay(interview.id)
-            
-            # Mettre à jour le statut de la candidature
-            if application.status in ['pending', 'reviewing']:
-                application.status = 'interview_scheduled'
-                application.save()
-            
+        # Interviewers verrouillés avant la vérification des conflits : pas de double réservation
+        with transaction.atomic():
+            lock_interviewers([value for value in request.POST.getlist('interviewers') if value.isdigit()])
+            scheduled = form.is_valid()
+            if scheduled:
+                interview = form.save(commit=False)
+                interview.application = application
+                interview.created_by = request.user
+                interview.save()
+                form.save_m2m()  # Pour les ManyToMany fields
+                
+                # Envoyer l'email d'invitation
+                transaction.on_commit(partial(send_interview_invitation_email.delay, interview.id))
+                
+                # Mettre à jour le statut de la candidature
+                if application.status in ['pending', 'reviewing']:
+                    application.status = 'interview_scheduled'
+                    application.save()
+        
+        if scheduled:
             messages.success(request, 'Entretien programmé avec succès!')
             return redirect('applications:application_detail', pk=application.pk)
     else:
@@ -257,6 +338,74 @@ def schedule_interview(request, pk):
     })
 
 
+@login_required
+def interview_slots(request):
+    """Premiers créneaux libres communs aux interviewers sélectionnés (JSON)"""
+    if request.user.user_type not in ['admin', 'hr']:
+        return JsonResponse({'success': False, 'error': "Accès non autorisé."}, status=403)
+    
+    try:
+        interviewer_ids = [int(pk) for pk in request.GET.getlist('interviewers')]
+        duration_minutes = int(request.GET.get('duration') or 60)
+        count = max(1, min(int(request.GET.get('count') or DEFAULT_SLOT_COUNT), 20))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': "Paramètres invalides."}, status=400)
+    if not interviewer_ids:
+        return JsonResponse({'success': False, 'error': "Veuillez sélectionner au moins un interviewer."}, status=400)
+    if not 5 <= duration_minutes <= MAX_INTERVIEW_MINUTES:
+        return JsonResponse({'success': False, 'error': "Durée invalide."}, status=400)
+    
+    slots = []
+    for start, end in find_free_slots(interviewer_ids, duration_minutes, count=count):
+        start, end = timezone.localtime(start), timezone.localtime(end)
+        slots.append({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'value': start.strftime('%Y-%m-%dT%H:%M'),
+            'label': f"{start:%d/%m/%Y} {start:%H:%M} - {end:%H:%M}",
+        })
+    return JsonResponse({'success': True, 'slots': slots})
+
+
+def interview_calendar(request, token):
+    """Flux ICS des entretiens d'un interviewer
+    
+    Les clients d'agenda ne partagent pas la session : l'accès passe par un
+    jeton signé dans l'URL. Le flux est servi depuis le cache et un client
+    qui présente l'ETag courant reçoit un 304 sans corps. Un jeton d'une
+    version antérieure (lien régénéré) est refusé.
+    """
+    parsed = parse_calendar_token(token)
+    if parsed is None:
+        raise Http404
+    user_id, token_version = parsed
+    feed = get_interview_calendar(user_id)
+    if feed['body'] is None or feed['token_version'] != token_version:
+        raise Http404
+    
+    if feed['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(feed['body'], content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="entretiens.ics"'
+    response['ETag'] = feed['etag']
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@login_required
+@require_http_methods(["POST"])
+def regenerate_calendar_link(request):
+    """Régénérer le lien d'abonnement à l'agenda : l'ancien lien cesse de fonctionner"""
+    if request.user.user_type not in ['admin', 'hr']:
+        messages.error(request, "Accès non autorisé.")
+        return redirect('home')
+    
+    rotate_calendar_token(request.user)
+    messages.success(request, "Nouveau lien d'agenda généré. L'ancien lien ne fonctionne plus.")
+    return redirect('dashboard:admin_dashboard')
+
+
 @login_required
 def interview_feedback(request, interview_id):
     """Feedback d'entretien"""
@@ -320,6 +469,22 @@ def rate_application(request, pk):
     })
 
 
+@login_required
+def lookup(request, source):
+    """Page de résultats d'une liste de choix distante (JSON, format Select2)"""
+    if request.user.user_type not in ['admin', 'hr']:
+        return JsonResponse({'error': "Accès non autorisé."}, status=403)
+    if source not in LOOKUPS:
+        raise Http404
+    
+    try:
+        page = max(int(request.GET.get('page') or 1), 1)
+    except ValueError:
+        page = 1
+    results, more = search_lookup(source, request.GET.get('q', '')[:100], page)
+    return JsonResponse({'results': results, 'pagination': {'more': more}})
+
+
 @login_required
 def applications_list(request):
     """Liste des candidatures (pour admin/hr)"""
@@ -335,6 +500,7 @@ def applications_list(request):
     form = ApplicationSearchForm(request.GET)
     if form.is_valid():
         keywords = form.cleaned_data.get('keywords')
+        cv_keywords = form.cleaned_data.get('cv_keywords')
         job = form.cleaned_data.get('job')
         status = form.cleaned_data.get('status')
         priority = form.cleaned_data.get('priority')
@@ -349,6 +515,9 @@ def applications_list(request):
                 Q(job__title__icontains=keywords)
             )
         
+        if cv_keywords:
+            applications = filter_applications_by_resume(applications, cv_keywords)
+        
         if job:
             applications = applications.filter(job=job)
         
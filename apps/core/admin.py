@@ -6,7 +6,7 @@ from django.shortcuts import render
 from django.utils.html import format_html
 from .models import (
     ContactMessage, FAQ, SiteSettings, Newsletter, 
-    BlogPost, PageContent, ThemeSettings, TeamMember, Value, Statistic
+    BlogPost, BlogTag, PageContent, ThemeSettings, TeamMember, Value, Statistic
 )
 from .forms import NewsletterAdminForm, ComposeNewsletterForm
 from .emails import send_newsletter, send_bulk_newsletter  # IMPORT MODIFIÉ ICI
@@ -251,6 +251,17 @@ class BlogPostAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+@admin.register(BlogTag)
+class BlogTagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'post_count')
+    search_fields = ('name', 'slug')
+    readonly_fields = ('slug', 'post_count')
+    
+    def has_add_permission(self, request):
+        # Les tags sont créés depuis le champ « tags » des articles
+        return False
+
+
 @admin.register(PageContent)
 class PageContentAdmin(admin.ModelAdmin):
     list_display = ('page_type', 'title', 'is_active', 'show_in_menu', 'order', 'updated_at')
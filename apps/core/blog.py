@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.text import slugify
+
+from utils.cache import bump_cache_version, get_cache_version
+from .models import BlogPost, BlogTag
+
+BLOG_TAGS_VERSION = 'blog_tags'
+POPULAR_TAGS_CACHE_TIMEOUT = 60 * 60 * 24  # 24 heures, l'invalidation passe par la version
+
+
+def parse_tags(value):
+    """Tags d'une chaîne séparée par des virgules : [(slug, nom)] sans doublons, dans l'ordre saisi"""
+    tags = {}
+    for name in (value or '').split(','):
+        name = ' '.join(name.split())[:50]
+        slug = slugify(name)
+        if slug and slug not in tags:
+            tags[slug] = name
+    return list(tags.items())
+
+
+def published_count_subquery(through):
+    """Nombre d'articles publiés d'un tag, calculé par la base"""
+    return Coalesce(
+        Subquery(
+            through.objects.filter(blogtag_id=OuterRef('pk'), blogpost__status='published')
+            .values('blogtag_id')
+            .annotate(total=Count('blogpost_id'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def refresh_tag_counts(tag_ids):
+    """Recalcule en un UPDATE le nombre d'articles publiés des tags donnés"""
+    if not tag_ids:
+        return
+    BlogTag.objects.filter(pk__in=tag_ids).update(
+        post_count=published_count_subquery(BlogPost.blog_tags.through)
+    )
+    bump_cache_version(BLOG_TAGS_VERSION)
+
+
+def sync_post_tags(post):
+    """Aligne les tags normalisés d'un article sur son champ texte et met à jour les compteurs"""
+    parsed = parse_tags(post.tags)
+    existing = dict(BlogTag.objects.filter(slug__in=[slug for slug, _ in parsed]).values_list('slug', 'pk'))
+    missing = [BlogTag(slug=slug, name=name) for slug, name in parsed if slug not in existing]
+    if missing:
+        BlogTag.objects.bulk_create(missing, ignore_conflicts=True)
+        existing = dict(BlogTag.objects.filter(slug__in=[slug for slug, _ in parsed]).values_list('slug', 'pk'))
+
+    current = set(post.blog_tags.values_list('pk', flat=True))
+    wanted = set(existing.values())
+    if wanted != current:
+        post.blog_tags.set(wanted)
+    # Le statut de l'article compte aussi : compteurs recalculés pour les anciens et nouveaux tags
+    refresh_tag_counts(current | wanted)
+
+
+def get_popular_tags(limit=10):
+    """Tags les plus utilisés par les articles publiés, depuis le cache : [{'name', 'slug', 'post_count'}]"""
+    key = f"popular_blog_tags:{limit}:{get_cache_version(BLOG_TAGS_VERSION)}"
+    tags = cache.get(key)
+    if tags is None:
+        tags = list(
+            BlogTag.objects.filter(post_count__gt=0)
+            .order_by('-post_count', 'name')
+            .values('name', 'slug', 'post_count')[:limit]
+        )
+        cache.set(key, tags, POPULAR_TAGS_CACHE_TIMEOUT)
+    return tags
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core import checks
+
+# Caches propres à chaque processus
+LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Un worker Celery séparé doit partager le cache du site
+
+    Le contenu de l'accueil reconstruit par les tâches et les versions de cache
+    (paramètres, thème, catégories) ne seraient sinon jamais vus par le site.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False) or backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        checks.Warning(
+            "Les tâches Celery s'exécutent dans un worker séparé mais le cache est local au processus.",
+            hint="Configurez CACHES avec un cache partagé (REDIS_URL).",
+            id='core.W001',
+        )
+    ]
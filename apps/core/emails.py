@@ -2,6 +2,7 @@ from django.core.mail import EmailMultiAlternatives
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from apps.jobs.cards import attach_job_cards
 from apps.jobs.models import Job
 from django.utils import timezone
 from .models import BlogPost, PageContent  # IMPORT AJOUTÉ
@@ -10,15 +11,13 @@ def get_featured_jobs_for_newsletter(limit=3):
     """Récupère les offres vedettes pour la newsletter"""
     return Job.objects.filter(
         status='published',
-        featured=True,
-        application_deadline__gte=timezone.now()
+        featured=True
     ).select_related('category').order_by('-created_at')[:limit]
 
 def get_recent_jobs_for_alert(limit=5):
     """Récupère les offres récentes pour les alertes"""
     return Job.objects.filter(
-        status='published',
-        application_deadline__gte=timezone.now()
+        status='published'
     ).select_related('category').order_by('-created_at')[:limit]
 
 def get_career_tips():
@@ -40,7 +39,7 @@ def get_upcoming_events():
         # Récupérer les événements depuis le blog ou une page dédiée
         events = BlogPost.objects.filter(
             status='published',
-            tags__icontains='événement',
+            blog_tags__slug='evenement',
             published_at__gte=timezone.now()
         ).order_by('published_at')[:3]
         
@@ -105,6 +104,12 @@ def send_newsletter(newsletter_id, subject, template_name, context):
         template_name = 'newsletter.html'
     
     try:
+        # Cartes d'offres partagées avec les autres envois (cache des fragments)
+        site_url = context.get('SITE_URL', settings.SITE_URL)
+        for key in ('featured_jobs', 'recent_jobs', 'matching_jobs'):
+            if key in context:
+                context[key] = attach_job_cards(context[key], 'email', site_url=site_url)
+        
         html_content = render_to_string(f'emails/{template_name}', context)
         text_content = strip_tags(html_content)
         
@@ -1,6 +1,7 @@
 from django import forms
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Submit, Row, Column, HTML
+from apps.jobs.autocomplete import autocomplete_attrs
 from .models import ContactMessage, Newsletter
 
 class ContactForm(forms.ModelForm):
@@ -56,7 +57,8 @@ class SearchForm(forms.Form):
         max_length=200,
         widget=forms.TextInput(attrs={
             'placeholder': 'Rechercher des offres, entreprises...',
-            'class': 'form-control'
+            'class': 'form-control',
+            **autocomplete_attrs('title', 'company', 'skill'),
         })
     )
 
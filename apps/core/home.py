@@ -0,0 +1,98 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.accounts.models import CandidateProfile
+from apps.applications.models import Application
+from apps.jobs.cards import attach_job_cards
+from apps.jobs.categories import get_active_categories
+from apps.jobs.models import Company, Job
+from .tasks import refresh_home_payload_task
+
+# Contenu partagé par les processus du site et le worker Celery qui le reconstruit :
+# demande un cache commun (Redis), vérifié par core.W001
+HOME_PAYLOAD_KEY = 'home_payload'
+# Filet de sécurité : la tâche planifiée reconstruit le contenu toutes les 10 minutes
+HOME_PAYLOAD_TIMEOUT = 60 * 30  # 30 minutes
+# Les modifications rapprochées ne déclenchent qu'une reconstruction, après ce délai
+HOME_PAYLOAD_DEBOUNCE = 60  # secondes
+HOME_PAYLOAD_REFRESH_LOCK = 'home_payload:refresh_scheduled'
+
+
+def build_home_payload():
+    """Calcule le contenu de la page d'accueil et les statistiques partagées
+
+    Une requête d'agrégats par table (offres, entreprises, candidats, candidatures)
+    et une par liste d'offres ; les catégories viennent de la mémoire du processus. Les cartes des
+    offres sont rendues ici (cache des fragments) : l'accueil s'affiche
+    depuis une seule lecture du cache.
+    """
+    published = Q(status='published')
+    job_stats = Job.objects.aggregate(
+        jobs_published=Count('pk', filter=published),
+        jobs_posted=Count('pk'),
+        jobs_filled=Count('pk', filter=Q(status='filled')),
+    )
+    company_stats = Company.objects.aggregate(
+        companies_published=Count('pk', filter=Q(published_jobs_count__gt=0)),
+        companies_served=Count('pk'),
+    )
+    candidate_stats = CandidateProfile.objects.aggregate(
+        candidates_active=Count('pk', filter=Q(is_active=True)),
+        candidates_registered=Count('pk'),
+    )
+    categories = sorted(get_active_categories(), key=lambda category: -category.published_jobs_count)
+
+    featured_jobs = attach_job_cards(
+        Job.objects.filter(published, featured=True).select_related('category')[:6],
+        'grid',
+    )
+    recent_jobs = attach_job_cards(
+        Job.objects.filter(published).select_related('category').order_by('-created_at')[:8],
+        'row',
+    )
+
+    return {
+        'stats': {
+            'total_jobs': job_stats['jobs_published'],
+            'total_companies': company_stats['companies_published'],
+            'total_candidates': candidate_stats['candidates_active'],
+            'total_categories': len(categories),
+        },
+        'about_stats': {
+            'jobs_posted': job_stats['jobs_posted'],
+            'candidates_registered': candidate_stats['candidates_registered'],
+            'successful_placements': job_stats['jobs_filled'],
+            'companies_served': company_stats['companies_served'],
+        },
+        'total_applications': Application.objects.count(),
+        'featured_jobs': featured_jobs,
+        'recent_jobs': recent_jobs,
+        'popular_categories': categories[:6],
+        'generated_at': timezone.now(),
+    }
+
+
+def refresh_home_payload():
+    """Reconstruit le contenu de l'accueil et le remplace dans le cache"""
+    cache.delete(HOME_PAYLOAD_REFRESH_LOCK)
+    payload = build_home_payload()
+    cache.set(HOME_PAYLOAD_KEY, payload, HOME_PAYLOAD_TIMEOUT)
+    return payload
+
+
+def get_home_payload():
+    """Contenu de l'accueil depuis le cache, reconstruit s'il est absent"""
+    payload = cache.get(HOME_PAYLOAD_KEY)
+    if payload is None:
+        payload = refresh_home_payload()
+    return payload
+
+
+def schedule_home_payload_refresh():
+    """Programme une reconstruction après validation, au plus une par fenêtre HOME_PAYLOAD_DEBOUNCE"""
+    if cache.add(HOME_PAYLOAD_REFRESH_LOCK, True, HOME_PAYLOAD_DEBOUNCE * 2):
+        transaction.on_commit(partial(refresh_home_payload_task.apply_async, countdown=HOME_PAYLOAD_DEBOUNCE))
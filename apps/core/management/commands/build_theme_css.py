@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from apps.core.models import ThemeSettings
+from apps.core.settings_cache import invalidate_site_settings
+from apps.core.theme import compile_theme_css, theme_stylesheet_digest, write_theme_stylesheet
+
+
+class Command(BaseCommand):
+    help = 'Compile les feuilles de style des thèmes et écrit celle du thème actif dans le stockage statique'
+
+    def handle(self, *args, **options):
+        themes = list(ThemeSettings.objects.all())
+        changed = []
+        for theme in themes:
+            digest = theme_stylesheet_digest(compile_theme_css(theme))
+            if theme.stylesheet_digest != digest:
+                theme.stylesheet_digest = digest
+                changed.append(theme)
+        if changed:
+            ThemeSettings.objects.bulk_update(changed, ['stylesheet_digest'])
+            invalidate_site_settings()
+
+        active = next((theme for theme in themes if theme.is_active), None)
+        if active is not None:
+            write_theme_stylesheet(active)
+            self.stdout.write(f'Thème actif « {active.name} » : {active.stylesheet_url}')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {len(themes)} thèmes compilés, {len(changed)} empreintes mises à jour')
+        )
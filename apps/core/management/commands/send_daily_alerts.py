@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.conf import settings
 from apps.jobs.models import Job, JobAlert
+from apps.jobs.salaries import salary_at_least
 from apps.accounts.models import CandidateProfile
 from apps.core.emails import send_newsletter
 from django.db.models import Q
@@ -54,8 +55,7 @@ class Command(BaseCommand):
     def get_matching_jobs(self, alert):
         """Retourne les offres correspondant aux critÃ¨res de l'alerte"""
         queryset = Job.objects.filter(
-            status='published',
-            application_deadline__gte=timezone.now()
+            status='published'
         )
         
         # Filtres basÃ©s sur les critÃ¨res de l'alerte
@@ -81,10 +81,7 @@ class Command(BaseCommand):
             queryset = queryset.filter(experience_level=alert.experience_level)
         
         if alert.salary_min:
-            queryset = queryset.filter(
-                Q(salary_min__gte=alert.salary_min) | 
-                Q(salary_max__gte=alert.salary_min)
-            )
+            queryset = queryset.filter(salary_at_least(alert.salary_min))
         
         if alert.remote_work:
             queryset = queryset.filter(remote_work=True)
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:12
+
+import hashlib
+import re
+
+from django.db import migrations, models
+
+# Copie figée de apps.core.theme au moment de la migration : le module peut évoluer.
+# Une empreinte différente de celle du code actuel est recalculée par build_theme_css
+# ou au prochain enregistrement du thème.
+THEME_CSS_TEMPLATE = """
+:root {{
+    --bs-primary: {primary_color};
+    --bs-secondary: {secondary_color};
+    --bs-success: {success_color};
+    --bs-info: {info_color};
+    --bs-warning: {warning_color};
+    --bs-danger: {danger_color};
+    --bs-light: {light_color};
+    --bs-dark: {dark_color};
+    --bs-border-radius: {border_radius}px;
+    --bs-font-family: {font_family};
+    --bs-font-size-base: {font_size_base}px;
+}}
+
+body {{
+    font-family: var(--bs-font-family);
+    font-size: var(--bs-font-size-base);
+}}
+
+.btn, .card, .form-control, .modal-content {{
+    border-radius: var(--bs-border-radius);
+}}
+"""
+
+THEME_FIELDS = [
+    'primary_color', 'secondary_color', 'success_color', 'info_color', 'warning_color',
+    'danger_color', 'light_color', 'dark_color', 'border_radius', 'font_family', 'font_size_base',
+]
+
+CSS_STRINGS_AND_COMMENTS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/)', re.S)
+
+
+def minify_css(css):
+    parts = []
+    for index, part in enumerate(CSS_STRINGS_AND_COMMENTS.split(css)):
+        if index % 2:
+            if not part.startswith('/*'):
+                parts.append(part)
+            continue
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};])\s*', r'\1', part)
+        parts.append(part.replace(';}', '}'))
+    return ''.join(parts).strip()
+
+
+def theme_stylesheet_digest(theme):
+    css = THEME_CSS_TEMPLATE.format(**{name: getattr(theme, name) for name in THEME_FIELDS})
+    css = minify_css(css + '\n' + (theme.custom_css or ''))
+    return hashlib.md5(css.encode()).hexdigest()[:12]
+
+
+def backfill_stylesheet_digests(apps, schema_editor):
+    """Calcule l'empreinte des feuilles de style existantes ; les fichiers sont écrits à la première demande"""
+    ThemeSettings = apps.get_model('core', 'ThemeSettings')
+    themes = list(ThemeSettings.objects.all())
+    for theme in themes:
+        theme.stylesheet_digest = theme_stylesheet_digest(theme)
+    ThemeSettings.objects.bulk_update(themes, ['stylesheet_digest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_sitesettings_options_alter_teammember_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='themesettings',
+            name='stylesheet_digest',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(backfill_stylesheet_digests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:13
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.text import slugify
+
+
+# Copies figées de apps.core.blog au moment de la migration : le module peut évoluer
+def parse_tags(value):
+    tags = {}
+    for name in (value or '').split(','):
+        name = ' '.join(name.split())[:50]
+        slug = slugify(name)
+        if slug and slug not in tags:
+            tags[slug] = name
+    return list(tags.items())
+
+
+def published_count_subquery(through):
+    return Coalesce(
+        Subquery(
+            through.objects.filter(blogtag_id=OuterRef('pk'), blogpost__status='published')
+            .values('blogtag_id')
+            .annotate(total=Count('blogpost_id'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def backfill_blog_tags(apps, schema_editor):
+    """Crée les tags normalisés depuis le champ texte des articles et calcule leurs compteurs"""
+    BlogPost = apps.get_model('core', 'BlogPost')
+    BlogTag = apps.get_model('core', 'BlogTag')
+    Through = BlogPost.blog_tags.through
+
+    post_tags = [
+        (post_id, parse_tags(tags))
+        for post_id, tags in BlogPost.objects.exclude(tags='').values_list('pk', 'tags').iterator()
+    ]
+    names = {}
+    for _, parsed in post_tags:
+        for slug, name in parsed:
+            names.setdefault(slug, name)
+    BlogTag.objects.bulk_create(
+        [BlogTag(slug=slug, name=name) for slug, name in names.items()], ignore_conflicts=True
+    )
+    tag_ids = dict(BlogTag.objects.values_list('slug', 'pk'))
+    Through.objects.bulk_create(
+        [
+            Through(blogpost_id=post_id, blogtag_id=tag_ids[slug])
+            for post_id, parsed in post_tags
+            for slug, _ in parsed
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    BlogTag.objects.update(post_count=published_count_subquery(Through))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_theme_stylesheet_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, verbose_name='nom')),
+                ('slug', models.SlugField(max_length=60, unique=True, verbose_name='slug')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name="nombre d'articles")),
+            ],
+            options={
+                'verbose_name': 'Tag de blog',
+                'verbose_name_plural': 'Tags de blog',
+                'ordering': ['-post_count', 'name'],
+                'indexes': [models.Index(fields=['-post_count', 'name'], name='blogtag_popular_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='blog_tags',
+            field=models.ManyToManyField(blank=True, related_name='posts', to='core.blogtag', verbose_name='tags normalisés'),
+        ),
+        migrations.RunPython(backfill_blog_tags, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,12 @@
-﻿from django.db import models
+﻿from functools import partial
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from .settings_cache import invalidate_site_settings
+from .theme import compile_theme_css, theme_stylesheet_digest, write_theme_stylesheet
+
 User = get_user_model()
 
 
@@ -174,6 +179,13 @@ class SiteSettings(models.Model):
         if not self.pk and SiteSettings.objects.exists():
             raise ValueError(_('Il ne peut y avoir qu\'une seule instance de SiteSettings'))
         super().save(*args, **kwargs)
+        # Les processus rechargent leur copie en mémoire après validation
+        transaction.on_commit(invalidate_site_settings)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(invalidate_site_settings)
+        return result
 
 
 class Newsletter(models.Model):
@@ -192,6 +204,28 @@ class Newsletter(models.Model):
         return self.email
 
 
+class BlogTag(models.Model):
+    """Tag normalisé des articles de blog"""
+    name = models.CharField(max_length=50, verbose_name=_('nom'))
+    slug = models.SlugField(max_length=60, unique=True, verbose_name=_('slug'))
+    # Nombre d'articles publiés, recalculé à chaque enregistrement d'un article
+    post_count = models.PositiveIntegerField(default=0, verbose_name=_('nombre d\'articles'))
+
+    class Meta:
+        verbose_name = _('Tag de blog')
+        verbose_name_plural = _('Tags de blog')
+        ordering = ['-post_count', 'name']
+        indexes = [
+            models.Index(fields=['-post_count', 'name'], name='blogtag_popular_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse('core:blog_by_tag', kwargs={'tag': self.slug})
+
+
 class BlogPost(models.Model):
     """Articles de blog"""
     STATUS_CHOICES = (
@@ -211,6 +245,8 @@ class BlogPost(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blog_posts', verbose_name=_('auteur'))
     tags = models.CharField(max_length=200, blank=True, help_text=_('Tags séparés par des virgules'), 
                           verbose_name=_('tags'))
+    # Tags normalisés, tenus à jour depuis le champ texte à l'enregistrement
+    blog_tags = models.ManyToManyField(BlogTag, related_name='posts', blank=True, verbose_name=_('tags normalisés'))
     
     # SEO
     meta_description = models.CharField(max_length=160, blank=True, verbose_name=_('meta description'))
@@ -237,6 +273,18 @@ class BlogPost(models.Model):
             from django.utils.text import slugify
             self.slug = slugify(self.title)
         super().save(*args, **kwargs)
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'tags', 'status'} & set(update_fields):
+            from .blog import sync_post_tags
+            sync_post_tags(self)
+
+    def delete(self, *args, **kwargs):
+        from .blog import refresh_tag_counts
+        tag_ids = list(self.blog_tags.values_list('pk', flat=True))
+        result = super().delete(*args, **kwargs)
+        refresh_tag_counts(tag_ids)
+        return result
 
     def get_absolute_url(self):
         from django.urls import reverse
@@ -322,6 +370,9 @@ class ThemeSettings(models.Model):
     # CSS personnalisé
     custom_css = models.TextField(blank=True, help_text=_('CSS personnalisé'), verbose_name=_('CSS personnalisé'))
     
+    # Empreinte de la feuille de style compilée (nom du fichier dans le stockage statique)
+    stylesheet_digest = models.CharField(max_length=12, blank=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('créé le'))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_('modifié le'))
 
@@ -336,7 +387,23 @@ class ThemeSettings(models.Model):
         if self.is_active:
             # Désactiver les autres thèmes
             ThemeSettings.objects.filter(is_active=True).update(is_active=False)
+        self.stylesheet_digest = theme_stylesheet_digest(compile_theme_css(self))
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'stylesheet_digest'}
         super().save(*args, **kwargs)
+        if self.is_active:
+            transaction.on_commit(partial(write_theme_stylesheet, self))
+        transaction.on_commit(invalidate_site_settings)
+
+    @property
+    def stylesheet_url(self):
+        """URL de la feuille de style compilée, mise en cache sans limite par les navigateurs"""
+        return reverse('core:theme_stylesheet', kwargs={'digest': self.stylesheet_digest})
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(invalidate_site_settings)
+        return result
 
 
 class TeamMember(models.Model):
@@ -0,0 +1,64 @@
+from django.db import DatabaseError
+
+from utils.cache import bump_cache_version, get_cache_version
+
+# Version partagée (cache Django) : incrémentée à chaque modification des paramètres ou d'un thème
+SITE_SETTINGS_VERSION = 'site_settings'
+
+# Paramètres affichés tant qu'aucun SiteSettings n'a été enregistré
+DEFAULT_SITE_SETTINGS = {
+    'site_name': "Plateforme de Recrutement Expert",
+    'site_description': "Plateforme complète de gestion de recrutement et de mise en relation talents-entreprises",
+    'contact_email': "mohamedsaiddiallo88@gmail.com",
+    'contact_phone': "+33 06 28 53 09 45",
+    'address': "2 A rue du commandant l'Herminier, Rouen, France",
+    'company_name': "SARL",
+    'about_title': "À propos de SARL",
+    'about_content': "SARL est une plateforme innovante de recrutement qui connecte les talents aux meilleures opportunités professionnelles.",
+    'about_mission': "Notre mission est de simplifier et optimiser le processus de recrutement.",
+    'about_vision': "Devenir la référence en matière de plateforme de recrutement en Europe.",
+    'about_values': "Innovation, Transparence, Excellence, Collaboration, Diversité",
+    'hero_title': "Trouvez votre emploi idéal",
+    'hero_subtitle': "Découvrez des milliers d'opportunités d'emploi et connectez-vous avec les meilleures entreprises.",
+    'footer_text': "© 2025 SARL. Tous droits réservés.",
+    'email_signature': "L'équipe SARL \nmohamedsaiddiallo88@gmail.com\n+33 06 28 53 09 45",
+}
+
+# (version, paramètres du site, thème actif) chargés par ce processus
+_snapshot = (None, None, None)
+
+
+def _load():
+    """Paramètres et thème en mémoire du processus, rechargés quand la version partagée change"""
+    global _snapshot
+    version = get_cache_version(SITE_SETTINGS_VERSION)
+    if _snapshot[0] != version:
+        from .models import SiteSettings, ThemeSettings
+
+        try:
+            site_settings = SiteSettings.objects.first()
+            theme = ThemeSettings.objects.filter(is_active=True).first()
+        except DatabaseError:
+            # Migrations non appliquées : valeurs par défaut, sans les mémoriser
+            return SiteSettings(**DEFAULT_SITE_SETTINGS), None
+        if site_settings is None:
+            site_settings = SiteSettings(**DEFAULT_SITE_SETTINGS)
+        _snapshot = (version, site_settings, theme)
+    return _snapshot[1], _snapshot[2]
+
+
+def get_site_settings():
+    """Paramètres du site (instance non enregistrée avec les valeurs par défaut s'il n'y en a pas)
+
+    L'instance est partagée par les requêtes du processus : lecture seule.
+    """
+    return _load()[0]
+
+
+def get_active_theme():
+    """Thème actif, ou None"""
+    return _load()[1]
+
+
+def invalidate_site_settings():
+    bump_cache_version(SITE_SETTINGS_VERSION)
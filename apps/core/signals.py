@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import CandidateProfile
+from apps.jobs.models import Job, JobCategory
+from .home import schedule_home_payload_refresh
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+@receiver(post_save, sender=CandidateProfile)
+@receiver(post_delete, sender=CandidateProfile)
+def refresh_home_on_change(sender, **kwargs):
+    """Contenu de l'accueil reconstruit après les modifications d'offres, de catégories et de profils"""
+    if kwargs.get('raw'):
+        return
+    schedule_home_payload_refresh()
@@ -0,0 +1,109 @@
+from datetime import timedelta
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.applications.models import Application, Interview
+from apps.applications.signals import schedule_calendar_invalidation
+from apps.applications.utils import bulk_update_application_status
+from apps.jobs.autocomplete import job_terms, update_job_terms
+from apps.jobs.categories import refresh_category_counts
+from apps.jobs.companies import refresh_company_counts
+from apps.jobs.models import Job
+from .settings_cache import get_site_settings
+
+SWEEP_BATCH_SIZE = 500
+
+
+def sweep(queryset, fields, apply, batch_size=SWEEP_BATCH_SIZE):
+    """Parcourt une requête par lots bornés et applique une mise à jour ensemble par lot
+
+    Chaque lot est lu en avançant sur la clé primaire puis traité dans sa
+    propre transaction. Les lignes verrouillées par une autre transaction
+    sont sautées (skip_locked) et reprises au passage suivant.
+    apply(rows) reçoit les tuples (pk, *fields) du lot et retourne le nombre
+    de lignes modifiées.
+    """
+    last_pk = 0
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.select_for_update(skip_locked=True)
+                .filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', *fields)[:batch_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            total += apply(rows)
+    return total
+
+
+def expire_jobs(now=None):
+    """Passe au statut « expiré » les offres publiées dont la date limite est dépassée"""
+    now = now or timezone.now()
+
+    def apply(rows):
+        updated = Job.objects.filter(
+            pk__in=[row[0] for row in rows], status='published'
+        ).update(status='expired', updated_at=now)
+        # update() ne déclenche pas les signaux : compteurs et suggestions de recherche recalculés ici
+        refresh_company_counts({row[1] for row in rows})
+        refresh_category_counts({row[2] for row in rows})
+        terms = set()
+        for _, _, _, title, company, location in rows:
+            terms |= job_terms({'title': title, 'company': company, 'location': location})
+        transaction.on_commit(partial(update_job_terms, terms))
+        return updated
+
+    return sweep(
+        Job.objects.filter(status='published', application_deadline__lt=now),
+        ['employer_id', 'category_id', 'title', 'company', 'location'],
+        apply,
+    )
+
+
+def auto_reject_applications(now=None):
+    """Rejette les candidatures en attente depuis plus de auto_reject_after_days jours (paramètres du site)"""
+    now = now or timezone.now()
+    days = get_site_settings().auto_reject_after_days
+    if not days:
+        return 0
+    reason = f"Rejet automatique : candidature en attente depuis plus de {days} jours"
+
+    def apply(rows):
+        # Historique en un INSERT et notification des candidats après validation
+        results = bulk_update_application_status([row[0] for row in rows], 'rejected', None, reason=reason)
+        return sum(1 for result in results if result['outcome'] == 'updated')
+
+    return sweep(
+        Application.objects.filter(status='pending', applied_at__lt=now - timedelta(days=days)), [], apply
+    )
+
+
+def mark_overdue_interviews(now=None):
+    """Passe au statut « en retard » les entretiens programmés dont l'heure de fin est passée"""
+    now = now or timezone.now()
+
+    def apply(rows):
+        ended = [pk for pk, start, duration in rows if start + timedelta(minutes=duration) <= now]
+        if not ended:
+            return 0
+        updated = Interview.objects.filter(pk__in=ended, status='scheduled').update(
+            status='overdue', updated_at=now
+        )
+        # update() ne déclenche pas les signaux : flux ICS des interviewers invalidés ici
+        schedule_calendar_invalidation(
+            Interview.interviewers.through.objects.filter(interview_id__in=ended)
+            .values_list('user_id', flat=True)
+        )
+        return updated
+
+    return sweep(
+        Interview.objects.filter(status='scheduled', scheduled_date__lt=now),
+        ['scheduled_date', 'duration_minutes'],
+        apply,
+    )
@@ -3,7 +3,7 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
-from .utils.email_utils import send_template_email
+from .utils.email_utils import build_template_email, send_template_email
 from .emails import send_bulk_newsletter  
 from apps.jobs.models import Job
 
@@ -48,6 +48,41 @@ def send_application_received_email(application_id):
     except Application.DoesNotExist:
         return False
 
+@shared_task
+def send_application_status_emails(application_ids):
+    """
+    Notifie les candidats d'un changement de statut groupé, en une seule connexion SMTP
+    """
+    from django.core.mail import get_connection
+    from apps.applications.models import Application
+    
+    applications = Application.objects.filter(id__in=application_ids).select_related('candidate__user', 'job')
+    site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
+    emails = [
+        build_template_email(
+            f"Mise à jour de votre candidature - {application.job.title}",
+            "application_status_update.html",
+            {
+                'candidate_name': application.candidate.user.full_name,
+                'job_title': application.job.title,
+                'company_name': application.job.company,
+                'application_id': application.id,
+                'status_display': application.get_status_display(),
+                'site_url': site_url,
+            },
+            application.candidate.user.email,
+        )
+        for application in applications
+    ]
+    if not emails:
+        return 0
+    try:
+        with get_connection() as connection:
+            return connection.send_messages(emails)
+    except Exception as e:
+        print(f"Erreur lors de l'envoi des notifications de statut: {e}")
+        return 0
+
 @shared_task
 def send_contact_confirmation_email(user_email, user_name, message_subject):
     """
@@ -157,4 +192,86 @@ def send_weekly_newsletter():
         print(f"Préparation de la newsletter pour {subscribers.count()} abonnés")
         return f"Newsletter préparée pour {subscribers.count()} abonnés"
     except Exception as e:
-        return f"Erreur lors de l'envoi de la newsletter: {str(e)}"
\ No newline at end of file
+        return f"Erreur lors de l'envoi de la newsletter: {str(e)}"
+
+@shared_task
+def compute_match_recommendations():
+    """
+    Calcul nocturne de la matrice de correspondance candidats × offres
+    """
+    from multiprocessing import current_process
+    from apps.dashboard.matching import store_match_recommendations
+    
+    # Un worker Celery (prefork) ne peut pas lancer de processus enfants
+    workers = 1 if current_process().daemon else None
+    stored = store_match_recommendations(workers=workers)
+    return f"{stored} recommandations enregistrées"
+
+@shared_task
+def extract_resume_documents():
+    """
+    Extraction du texte des CV en attente d'indexation
+    """
+    from multiprocessing import current_process
+    from apps.accounts.resumes import extract_pending_resumes
+    
+    # Un worker Celery (prefork) ne peut pas lancer de processus enfants
+    workers = 1 if current_process().daemon else None
+    processed = extract_pending_resumes(workers=workers)
+    return f"{processed} CV traités"
+
+@shared_task
+def store_uploaded_files():
+    """
+    Envoi au stockage des fichiers déposés en attente (CV et pièces jointes)
+    """
+    from apps.applications.uploads import store_pending_uploads
+    
+    stored = store_pending_uploads()
+    return f"{stored} fichiers stockés"
+
+@shared_task
+def run_sweepers():
+    """
+    Balayage périodique : offres échues, candidatures en attente trop anciennes, entretiens passés
+    """
+    from .sweepers import auto_reject_applications, expire_jobs, mark_overdue_interviews
+    
+    expired = expire_jobs()
+    rejected = auto_reject_applications()
+    overdue = mark_overdue_interviews()
+    return f"{expired} offres expirées, {rejected} candidatures rejetées, {overdue} entretiens en retard"
+
+@shared_task
+def refresh_home_payload_task():
+    """
+    Reconstruction du contenu de la page d'accueil (statistiques, catégories, offres)
+    """
+    from .home import refresh_home_payload
+    
+    payload = refresh_home_payload()
+    return f"Accueil reconstruit : {payload['stats']['total_jobs']} offres publiées"
+
+@shared_task
+def reconcile_job_counters():
+    """
+    Correction nocturne des compteurs dénormalisés des catégories et des entreprises
+    """
+    from apps.jobs.categories import reconcile_counters
+    
+    categories, companies = reconcile_counters()
+    return f"{categories} catégories et {companies} entreprises corrigées"
+
+@shared_task
+def refresh_experience_years():
+    """
+    Recalcul nocturne des années d'expérience des candidats ayant un poste en cours
+    """
+    from apps.accounts.utils import refresh_ongoing_experience_years
+    from apps.dashboard.ranking import refresh_candidate_match_scores
+    
+    updated = refresh_ongoing_experience_years()
+    for candidate_id in updated:
+        # Profils mis à jour par update(), sans signal : scores et classements des offres concernées
+        refresh_candidate_match_scores(candidate_id)
+    return f"{len(updated)} profils mis à jour"
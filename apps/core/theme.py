@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+import re
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+
+THEME_CSS_DIR = 'theme'
+
+THEME_CSS_TEMPLATE = """
+:root {{
+    --bs-primary: {primary_color};
+    --bs-secondary: {secondary_color};
+    --bs-success: {success_color};
+    --bs-info: {info_color};
+    --bs-warning: {warning_color};
+    --bs-danger: {danger_color};
+    --bs-light: {light_color};
+    --bs-dark: {dark_color};
+    --bs-border-radius: {border_radius}px;
+    --bs-font-family: {font_family};
+    --bs-font-size-base: {font_size_base}px;
+}}
+
+body {{
+    font-family: var(--bs-font-family);
+    font-size: var(--bs-font-size-base);
+}}
+
+.btn, .card, .form-control, .modal-content {{
+    border-radius: var(--bs-border-radius);
+}}
+"""
+
+THEME_FIELDS = [
+    'primary_color', 'secondary_color', 'success_color', 'info_color', 'warning_color',
+    'danger_color', 'light_color', 'dark_color', 'border_radius', 'font_family', 'font_size_base',
+]
+
+
+# Chaînes entre guillemets (laissées telles quelles) et commentaires (supprimés)
+_CSS_STRINGS_AND_COMMENTS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/)', re.S)
+
+
+def minify_css(css):
+    """Minification prudente : commentaires, espaces répétés et espaces autour des accolades et points-virgules
+
+    Les chaînes entre guillemets sont conservées telles quelles ; les
+    deux-points et les virgules sont laissés intacts.
+    """
+    parts = []
+    for index, part in enumerate(_CSS_STRINGS_AND_COMMENTS.split(css)):
+        if index % 2:
+            if not part.startswith('/*'):
+                parts.append(part)
+            continue
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};])\s*', r'\1', part)
+        parts.append(part.replace(';}', '}'))
+    return ''.join(parts).strip()
+
+
+def compile_theme_css(theme):
+    """Feuille de style minifiée d'un thème"""
+    css = THEME_CSS_TEMPLATE.format(**{name: getattr(theme, name) for name in THEME_FIELDS})
+    return minify_css(css + '\n' + (theme.custom_css or ''))
+
+
+def theme_stylesheet_digest(css):
+    """Empreinte du contenu, au format des fichiers du manifeste statique"""
+    return hashlib.md5(css.encode()).hexdigest()[:12]
+
+
+def theme_stylesheet_name_for(digest):
+    """Nom du fichier dans le stockage statique"""
+    return f"{THEME_CSS_DIR}/theme.{digest}.css"
+
+
+def write_theme_stylesheet(theme):
+    """Écrit la feuille de style d'un thème et sa version gzip, si elles n'existent pas encore
+
+    Le nom dépend du contenu : un fichier existant est toujours à jour.
+    Retourne le contenu compilé.
+    """
+    css = compile_theme_css(theme)
+    name = theme_stylesheet_name_for(theme_stylesheet_digest(css))
+    content = css.encode()
+    if not staticfiles_storage.exists(name):
+        staticfiles_storage.save(name, ContentFile(content))
+    if not staticfiles_storage.exists(f'{name}.gz'):
+        staticfiles_storage.save(f'{name}.gz', ContentFile(gzip.compress(content, mtime=0)))
+    return css
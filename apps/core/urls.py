@@ -12,6 +12,7 @@ urlpatterns = [
     path('terms/', views.terms, name='terms'),
     path('privacy/', views.privacy, name='privacy'),
     path('sitemap/', views.sitemap, name='sitemap'),
+    path('theme/theme.<slug:digest>.css', views.theme_stylesheet, name='theme_stylesheet'),
     
     # Recherche
     path('search/', views.search, name='search'),
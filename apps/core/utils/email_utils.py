@@ -3,9 +3,9 @@ from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils.html import strip_tags
 
-def send_template_email(subject, template_name, context, to_emails, from_email=None):
+def build_template_email(subject, template_name, context, to_emails, from_email=None):
     """
-    Envoie un email basé sur un template HTML
+    Construit (sans l'envoyer) un email basé sur un template HTML
     """
     if from_email is None:
         from_email = settings.DEFAULT_FROM_EMAIL
@@ -22,6 +22,13 @@ def send_template_email(subject, template_name, context, to_emails, from_email=N
         to=to_emails if isinstance(to_emails, list) else [to_emails]
     )
     email.attach_alternative(html_content, "text/html")
+    return email
+
+def send_template_email(subject, template_name, context, to_emails, from_email=None):
+    """
+    Envoie un email basé sur un template HTML
+    """
+    email = build_template_email(subject, template_name, context, to_emails, from_email)
     
     try:
         email.send()
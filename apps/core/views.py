@@ -1,20 +1,27 @@
 ﻿from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Count
-from django.http import JsonResponse
+from django.db.models import Q
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import Http404, HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+from django.utils.text import slugify
 from django.views import View
 from datetime import datetime
 import requests
 import psutil
 import os
 
-from .models import ContactMessage, FAQ, SiteSettings, Newsletter, BlogPost, PageContent, TeamMember, Value, Statistic
+from .models import ContactMessage, FAQ, Newsletter, BlogPost, BlogTag, PageContent, TeamMember, Value, Statistic, ThemeSettings
+from .blog import get_popular_tags
 from .forms import ContactForm, NewsletterForm, SearchForm
-from apps.jobs.models import Job, JobCategory
-from apps.accounts.models import CandidateProfile
+from .home import get_home_payload
+from .settings_cache import get_site_settings
+from .theme import theme_stylesheet_name_for, write_theme_stylesheet
+from apps.jobs.categories import get_active_categories
+from apps.jobs.companies import normalize_company_name
+from apps.jobs.models import Company, Job
 # Ajout des imports pour les emails
 from django.core.mail import send_mail
 from django.conf import settings
@@ -67,11 +74,13 @@ class StatusView(View):
     """Endpoint de statut étendu"""
     def get(self, request):
         # Statistiques de l'application
+        payload = get_home_payload()
         stats = {
-            'total_jobs': Job.objects.filter(status='published').count(),
-            'total_users': CandidateProfile.objects.filter(is_active=True).count(),
-            'total_applications': getattr(__import__('apps.applications.models', fromlist=['Application']), 'Application', None).objects.count() if hasattr(__import__('apps.applications.models', fromlist=['Application']), 'Application') else 0,
-            'uptime': 'active'
+            'total_jobs': payload['stats']['total_jobs'],
+            'total_users': payload['stats']['total_candidates'],
+            'total_applications': payload['total_applications'],
+            'uptime': 'active',
+            'generated_at': payload['generated_at'].isoformat(),
         }
         
         return JsonResponse({
@@ -130,42 +139,15 @@ class DeepHealthView(View):
 # =============================================================================
 
 def home(request):
-    """Page d'accueil"""
-    # Offres en vedette
-    featured_jobs = Job.objects.filter(
-        status='published', 
-        featured=True
-    ).select_related('category')[:6]
-    
-    # Offres récentes
-    recent_jobs = Job.objects.filter(
-        status='published'
-    ).select_related('category').order_by('-created_at')[:8]
-    
-    # Statistiques
-    stats = {
-        'total_jobs': Job.objects.filter(status='published').count(),
-        'total_companies': Job.objects.filter(status='published').values('company').distinct().count(),
-        'total_candidates': CandidateProfile.objects.filter(is_active=True).count(),
-        'total_categories': JobCategory.objects.filter(is_active=True).count(),
-    }
-    
-    # Catégories populaires
-    popular_categories = JobCategory.objects.filter(
-        is_active=True
-    ).annotate(
-        job_count=Count('jobs', filter=Q(jobs__status='published'))
-    ).order_by('-job_count')[:6]
-    
-    # Formulaire de newsletter
-    newsletter_form = NewsletterForm()
+    """Page d'accueil (contenu précalculé, voir apps.core.home)"""
+    payload = get_home_payload()
     
     context = {
-        'featured_jobs': featured_jobs,
-        'recent_jobs': recent_jobs,
-        'stats': stats,
-        'popular_categories': popular_categories,
-        'newsletter_form': newsletter_form,
+        'featured_jobs': payload['featured_jobs'],
+        'recent_jobs': payload['recent_jobs'],
+        'stats': payload['stats'],
+        'popular_categories': payload['popular_categories'],
+        'newsletter_form': NewsletterForm(),
     }
     
     return render(request, 'core/home.html', context)
@@ -177,10 +159,7 @@ def about(request):
     except PageContent.DoesNotExist:
         about_content = None
     
-    try:
-        site_settings = SiteSettings.objects.first()
-    except SiteSettings.DoesNotExist:
-        site_settings = None
+    site_settings = get_site_settings()
     
     # Récupérer les données dynamiques
     team_members = TeamMember.objects.filter(
@@ -194,12 +173,7 @@ def about(request):
     
     # Si pas de statistiques configurées, utiliser les valeurs par défaut
     if not statistics.exists():
-        stats = {
-            'jobs_posted': Job.objects.count(),
-            'candidates_registered': CandidateProfile.objects.count(),
-            'successful_placements': Job.objects.filter(status='filled').count(),
-            'companies_served': Job.objects.values('company').distinct().count(),
-        }
+        stats = get_home_payload()['about_stats']
     else:
         stats = {stat.title.lower().replace(' ', '_'): stat.value for stat in statistics}
     
@@ -405,10 +379,10 @@ def search(request):
         ).select_related('category')[:20]
         
         # Recherche des entreprises
-        companies = Job.objects.filter(
-            company__icontains=query,
-            status='published'
-        ).values('company').distinct()[:10]
+        companies = Company.objects.filter(
+            normalized_name__startswith=normalize_company_name(query),
+            published_jobs_count__gt=0,
+        ).order_by('-published_jobs_count', 'name')[:10]
         
         results = {
             'jobs': jobs,
@@ -436,15 +410,8 @@ def blog(request):
     # Articles récents pour la sidebar
     recent_posts = BlogPost.objects.filter(status='published').order_by('-published_at')[:5]
     
-    # Tags populaires
-    all_posts = BlogPost.objects.filter(status='published')
-    all_tags = []
-    for post in all_posts:
-        if post.tags:
-            all_tags.extend([tag.strip() for tag in post.tags.split(',')])
-    
-    from collections import Counter
-    popular_tags = Counter(all_tags).most_common(10)
+    # Tags populaires : compteurs dénormalisés, lus depuis le cache
+    popular_tags = get_popular_tags(10)
     
     context = {
         'page_obj': page_obj,
@@ -456,7 +423,7 @@ def blog(request):
 
 def blog_detail(request, slug):
     """Détail d'un article de blog"""
-    post = get_object_or_404(BlogPost, slug=slug, status='published')
+    post = get_object_or_404(BlogPost.objects.prefetch_related('blog_tags'), slug=slug, status='published')
     
     # Incrémenter le nombre de vues
     post.views_count += 1
@@ -480,23 +447,21 @@ def blog_detail(request, slug):
 
 def blog_by_tag(request, tag):
     """Articles par tag"""
-    posts = BlogPost.objects.filter(
-        status='published',
-        tags__icontains=tag
-    ).order_by('-published_at')
+    blog_tag = BlogTag.objects.filter(slug=slugify(tag)).first()
+    if blog_tag:
+        posts = blog_tag.posts.filter(status='published').select_related('author').order_by('-published_at')
+    else:
+        posts = BlogPost.objects.none()
     
     # Pagination
     paginator = Paginator(posts, 9)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # RAFRAÎCHIR LES VUES DEPUIS LA BASE DE DONNÉES
-    for post in page_obj:
-        post.refresh_from_db()
-    
     context = {
         'page_obj': page_obj,
-        'tag': tag,
+        'tag': blog_tag.name if blog_tag else tag,
+        'blog_tag': blog_tag,
     }
     
     return render(request, 'core/blog_by_tag.html', context)
@@ -514,7 +479,7 @@ def sitemap(request):
     ]
     
     # Catégories d'emploi
-    categories = JobCategory.objects.filter(is_active=True)
+    categories = get_active_categories()
     
     # Articles de blog récents
     recent_posts = BlogPost.objects.filter(status='published').order_by('-published_at')[:10]
@@ -527,6 +492,30 @@ def sitemap(request):
     
     return render(request, 'core/sitemap.html', context)
 
+def theme_stylesheet(request, digest):
+    """Feuille de style compilée du thème, servie depuis le stockage statique
+    
+    Le nom contient l'empreinte du contenu : la réponse est immuable et mise
+    en cache sans limite. Les fichiers générés après le démarrage ne sont pas
+    connus de WhiteNoise, d'où cette vue ; un fichier absent du stockage (autre
+    instance, redéploiement) est régénéré depuis le thème correspondant.
+    """
+    name = theme_stylesheet_name_for(digest)
+    if not staticfiles_storage.exists(name):
+        theme = ThemeSettings.objects.filter(stylesheet_digest=digest).first()
+        if theme is None:
+            raise Http404
+        write_theme_stylesheet(theme)
+    
+    compressed = 'gzip' in request.headers.get('Accept-Encoding', '') and staticfiles_storage.exists(f'{name}.gz')
+    with staticfiles_storage.open(f'{name}.gz' if compressed else name) as stylesheet:
+        response = HttpResponse(stylesheet.read(), content_type='text/css; charset=utf-8')
+    if compressed:
+        response['Content-Encoding'] = 'gzip'
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 def handler404(request, exception):
     """Page d'erreur 404 personnalisée"""
     return render(request, 'core/404.html', status=404)
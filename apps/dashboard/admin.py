@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DashboardWidget, SystemNotification, UserNotificationRead
+from .models import DashboardWidget, SystemNotification, UserNotificationRead, JobMatchScore, MatchRecommendation
 
 
 @admin.register(DashboardWidget)
@@ -15,7 +15,7 @@ class SystemNotificationAdmin(admin.ModelAdmin):
     list_display = ('title', 'notification_type', 'is_global', 'is_active', 'created_at', 'expires_at')
     list_filter = ('notification_type', 'is_global', 'is_active', 'created_at')
     search_fields = ('title', 'message')
-    filter_horizontal = ('target_users',)
+    autocomplete_fields = ('target_users',)
     date_hierarchy = 'created_at'
 
 
@@ -24,3 +24,20 @@ class UserNotificationReadAdmin(admin.ModelAdmin):
     list_display = ('user', 'notification', 'read_at')
     list_filter = ('read_at',)
     search_fields = ('user__first_name', 'user__last_name', 'notification__title')
+
+
+@admin.register(JobMatchScore)
+class JobMatchScoreAdmin(admin.ModelAdmin):
+    list_display = ('candidate', 'job', 'score', 'computed_at')
+    list_filter = ('computed_at',)
+    search_fields = ('candidate__user__first_name', 'candidate__user__last_name', 'job__title')
+    raw_id_fields = ('candidate', 'job')
+    readonly_fields = ('score', 'breakdown', 'computed_at')
+
+
+@admin.register(MatchRecommendation)
+class MatchRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('candidate', 'job', 'score', 'candidate_rank', 'job_rank', 'computed_at')
+    search_fields = ('candidate__user__first_name', 'candidate__user__last_name', 'job__title')
+    raw_id_fields = ('candidate', 'job')
+    readonly_fields = ('score', 'candidate_rank', 'job_rank', 'computed_at')
@@ -0,0 +1,100 @@
+import resource
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.match_kernel import LEVEL_BANDS, merge_job_tops
+from apps.dashboard.matching import (
+    MATCH_BLOCK_SIZE, MATCH_TOP_N, iter_block_results, store_match_recommendations
+)
+
+
+class Command(BaseCommand):
+    help = 'Calcule la matrice de correspondance candidats × offres et enregistre les recommandations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=MATCH_TOP_N, help='Nombre de couples conservés par candidat et par offre')
+        parser.add_argument('--block-size', type=int, default=MATCH_BLOCK_SIZE, help='Nombre de candidats par bloc')
+        parser.add_argument('--workers', type=int, default=None, help='Nombre de processus de calcul (défaut : nombre de CPU)')
+        parser.add_argument(
+            '--benchmark',
+            action='store_true',
+            help='Mesurer le calcul sur des données synthétiques, sans lire ni écrire la base',
+        )
+        parser.add_argument('--candidates', type=int, default=50000, help='Candidats synthétiques (benchmark)')
+        parser.add_argument('--jobs', type=int, default=5000, help='Offres synthétiques (benchmark)')
+        parser.add_argument('--skills', type=int, default=2000, help='Compétences distinctes (benchmark)')
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.benchmark(options)
+
+        start = time.perf_counter()
+        stored = store_match_recommendations(
+            top=options['top'], block_size=options['block_size'], workers=options['workers']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stored} recommandations enregistrées en {time.perf_counter() - start:.1f} s'
+        ))
+
+    def benchmark(self, options):
+        n_candidates, n_jobs, n_skills = options['candidates'], options['jobs'], options['skills']
+        block_size, top = options['block_size'], options['top']
+        rng = np.random.default_rng(42)
+
+        jobs = self.synthetic_jobs(rng, n_jobs, n_skills)
+        blocks = (
+            self.synthetic_candidates(rng, offset, min(block_size, n_candidates - offset), n_skills)
+            for offset in range(0, n_candidates, block_size)
+        )
+
+        self.stdout.write(
+            f'Matrice {n_candidates} × {n_jobs} ({n_skills} compétences), blocs de {block_size}, top {top}'
+        )
+        start = time.perf_counter()
+        job_tops = None
+        for count, result in enumerate(iter_block_results(blocks, jobs, top, options['workers']), start=1):
+            job_tops = merge_job_tops(job_tops, result, top)
+        elapsed = time.perf_counter() - start
+
+        pairs = n_candidates * n_jobs
+        peak = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        ) / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {count} blocs en {elapsed:.1f} s, {pairs / elapsed / 1e6:.1f} M couples/s, '
+            f'mémoire max par processus : {peak:.0f} Mo'
+        ))
+
+    def synthetic_jobs(self, rng, n_jobs, n_skills):
+        skill_weights = np.zeros((n_skills, n_jobs), dtype=np.float32)
+        for column in range(n_jobs):
+            required = rng.choice(n_skills, rng.integers(1, 9), replace=False)
+            skill_weights[required, column] = 1 / len(required)
+        salary = rng.uniform(1000, 6000, n_jobs).astype(np.float32)
+        salary[rng.random(n_jobs) < 0.3] = np.nan
+        return {
+            'ids': np.arange(1, n_jobs + 1, dtype=np.int64),
+            'n_skills': n_skills,
+            'skill_weights': skill_weights,
+            'band': rng.choice(list(set(LEVEL_BANDS.values())), n_jobs).astype(np.int8),
+            'city': rng.integers(0, 50, n_jobs, dtype=np.int32),
+            'remote': rng.random(n_jobs) < 0.2,
+            'salary': salary,
+        }
+
+    def synthetic_candidates(self, rng, offset, size, n_skills):
+        counts = rng.integers(0, 16, size)
+        salary = rng.uniform(800, 7000, size).astype(np.float32)
+        salary[rng.random(size) < 0.4] = np.nan
+        return {
+            'ids': np.arange(offset + 1, offset + size + 1, dtype=np.int64),
+            'skill_indptr': np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            'skill_indices': rng.integers(0, n_skills, counts.sum(), dtype=np.int64),
+            'band': rng.integers(0, 5, size, dtype=np.int8),
+            'city': rng.integers(-1, 50, size, dtype=np.int32),
+            'relocate': rng.random(size) < 0.3,
+            'salary': salary,
+        }
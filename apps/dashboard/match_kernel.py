@@ -0,0 +1,135 @@
+"""Calcul vectorisé de la matrice candidats × offres
+
+Ce module ne dépend que de NumPy pour pouvoir être importé tel quel par les
+processus de calcul, sans initialiser Django.
+"""
+import numpy as np
+
+# Pondération de chaque critère (total = 100 points)
+MATCH_WEIGHTS = {
+    'skills': 50,
+    'level': 20,
+    'location': 15,
+    'salary': 15,
+}
+
+# Tranches d'expérience communes aux candidats et aux offres
+LEVEL_BANDS = {
+    'entry': 0,
+    'junior': 1,
+    'mid': 2,
+    'senior': 3,
+    'lead': 4,
+    'principal': 4,
+    'director': 4,
+    'executive': 4,
+    'c_level': 4,
+}
+YEARS_BAND_LIMITS = [2, 5, 8, 12]
+
+# Tolérance au-delà du salaire maximum proposé
+SALARY_TOLERANCE = 1.25
+
+# Données des offres partagées par les processus de calcul
+_jobs = {}
+
+
+def years_to_band(years):
+    """Tranche d'expérience correspondant à un nombre d'années"""
+    return np.searchsorted(YEARS_BAND_LIMITS, years, side='right')
+
+
+def init_worker(jobs):
+    """Initialise un processus de calcul avec les caractéristiques des offres"""
+    _jobs.clear()
+    _jobs.update(jobs)
+
+
+def densify_skills(indptr, indices, n_skills):
+    """Matrice dense (candidats × compétences) à partir d'un stockage CSR"""
+    n_rows = len(indptr) - 1
+    dense = np.zeros((n_rows, n_skills), dtype=np.float32)
+    rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+    dense[rows, indices] = 1
+    return dense
+
+
+def score_matrix(candidates, jobs):
+    """Scores (bloc de candidats × offres) en float32"""
+    # Compétences : part des compétences requises couvertes
+    skills = densify_skills(candidates['skill_indptr'], candidates['skill_indices'], jobs['n_skills'])
+    scores = skills @ jobs['skill_weights']
+    scores *= MATCH_WEIGHTS['skills']
+
+    # Niveau : plein score dans la bonne tranche, moitié à une tranche d'écart
+    gap = np.abs(candidates['band'][:, None] - jobs['band'][None, :]).astype(np.float32)
+    scores += np.clip(1 - gap / 2, 0, 1) * MATCH_WEIGHTS['level']
+    del gap
+
+    # Localisation : télétravail ou même ville, sinon mobilité du candidat
+    same_city = (candidates['city'][:, None] == jobs['city'][None, :]) & (candidates['city'][:, None] >= 0)
+    location = np.where(
+        same_city | jobs['remote'][None, :],
+        np.float32(1),
+        np.where(candidates['relocate'][:, None], np.float32(0.5), np.float32(0)),
+    )
+    del same_city
+    scores += location * MATCH_WEIGHTS['location']
+    del location
+
+    # Salaire : prétention dans la fourchette, avec une tolérance ; neutre si inconnu
+    expected = candidates['salary'][:, None]
+    offered = jobs['salary'][None, :]
+    with np.errstate(invalid='ignore'):
+        salary = np.where(
+            expected <= offered,
+            np.float32(1),
+            np.where(expected <= offered * SALARY_TOLERANCE, np.float32(0.5), np.float32(0)),
+        )
+    salary[np.isnan(expected) | np.isnan(offered)] = 0.5
+    scores += salary * MATCH_WEIGHTS['salary']
+    return scores
+
+
+def top_n(scores, n, axis):
+    """Indices des n meilleurs scores le long d'un axe, triés par score décroissant"""
+    size = scores.shape[axis]
+    if n < size:
+        index = np.argpartition(-scores, n - 1, axis=axis)
+        index = np.take(index, np.arange(n), axis=axis)
+    else:
+        index = np.broadcast_to(
+            np.arange(size).reshape((-1, 1) if axis == 0 else (1, -1)), scores.shape
+        ).copy()
+    best = np.take_along_axis(scores, index, axis=axis)
+    order = np.argsort(-best, axis=axis, kind='stable')
+    return np.take_along_axis(index, order, axis=axis), np.take_along_axis(best, order, axis=axis)
+
+
+def score_block(candidates, top=20, jobs=None):
+    """Calcule un bloc de la matrice et n'en garde que les meilleurs couples
+
+    Retourne les n meilleures offres de chaque candidat du bloc, et les n
+    meilleurs candidats du bloc pour chaque offre.
+    """
+    jobs = jobs if jobs is not None else _jobs
+    scores = score_matrix(candidates, jobs)
+    job_index, job_scores = top_n(scores, top, axis=1)
+    candidate_index, candidate_scores = top_n(scores, top, axis=0)
+    return {
+        'candidate_ids': candidates['ids'],
+        'top_jobs': jobs['ids'][job_index],
+        'top_job_scores': job_scores,
+        'top_candidates': candidates['ids'][candidate_index],
+        'top_candidate_scores': candidate_scores,
+    }
+
+
+def merge_job_tops(current, block, top=20):
+    """Fusionne les meilleurs candidats par offre d'un bloc avec ceux déjà retenus"""
+    if current is None:
+        return block['top_candidates'], block['top_candidate_scores']
+    ids = np.concatenate([current[0], block['top_candidates']])
+    scores = np.concatenate([current[1], block['top_candidate_scores']])
+    index, best = top_n(scores, top, axis=0)
+    return np.take_along_axis(ids, index, axis=0), best
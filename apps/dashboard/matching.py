@@ -0,0 +1,209 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from django.utils import timezone
+
+from apps.accounts.models import CandidateProfile, Skill
+from apps.jobs.models import Job, JobSkill
+from .match_kernel import LEVEL_BANDS, init_worker, merge_job_tops, score_block, years_to_band
+from .models import MatchRecommendation
+
+MATCH_TOP_N = 20
+MATCH_BLOCK_SIZE = 1000
+STORE_BATCH_SIZE = 5000
+
+
+def normalize_city(city):
+    return (city or '').strip().lower()
+
+
+def load_job_features():
+    """Encode les offres publiées : matrice compétences × offres et vecteurs de critères"""
+    jobs = list(
+        Job.objects.filter(status='published').order_by('pk').values_list(
+            'id', 'experience_level', 'city', 'remote_work', 'work_environment', 'salary_max_annual_eur'
+        )
+    )
+    position = {job[0]: index for index, job in enumerate(jobs)}
+
+    # Seules les compétences demandées par au moins une offre forment des colonnes
+    skill_pairs = set(
+        JobSkill.objects.filter(job__status='published', canonical_skill__isnull=False)
+        .values_list('job_id', 'canonical_skill_id')
+    )
+    skill_columns = {}
+    for _, skill_id in skill_pairs:
+        skill_columns.setdefault(skill_id, len(skill_columns))
+
+    skill_weights = np.zeros((len(skill_columns), len(jobs)), dtype=np.float32)
+    for job_id, skill_id in skill_pairs:
+        skill_weights[skill_columns[skill_id], position[job_id]] = 1
+    required = skill_weights.sum(axis=0)
+    np.divide(skill_weights, required, out=skill_weights, where=required > 0)
+
+    city_codes = {}
+    for job in jobs:
+        if normalize_city(job[2]):
+            city_codes.setdefault(normalize_city(job[2]), len(city_codes))
+
+    features = {
+        'ids': np.array([job[0] for job in jobs], dtype=np.int64),
+        'n_skills': len(skill_columns),
+        'skill_weights': skill_weights,
+        'band': np.array([LEVEL_BANDS.get(job[1], 2) for job in jobs], dtype=np.int8),
+        'city': np.array([city_codes.get(normalize_city(job[2]), -1) for job in jobs], dtype=np.int32),
+        'remote': np.array([job[3] or job[4] == 'remote' for job in jobs], dtype=bool),
+        # Salaire annuel en euros, comparable au salaire attendu (inconnu si la devise ou la période l'est)
+        'salary': np.array(
+            [float(job[5]) if job[5] is not None else np.nan for job in jobs], dtype=np.float32
+        ),
+    }
+    return features, skill_columns, city_codes
+
+
+def iter_candidate_blocks(skill_columns, city_codes, block_size=MATCH_BLOCK_SIZE):
+    """Encode les candidats actifs par blocs (compétences au format CSR)"""
+    profiles = CandidateProfile.objects.filter(
+        is_active=True, user__is_active=True
+    ).order_by('pk').values_list(
+        'id', 'years_of_experience', 'city', 'willing_to_relocate', 'expected_salary'
+    )
+
+    last_pk = 0
+    while True:
+        rows = list(profiles.filter(pk__gt=last_pk)[:block_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+
+        skills = Skill.objects.filter(
+            candidate_id__gte=rows[0][0], candidate_id__lte=last_pk, canonical_skill__isnull=False
+        ).order_by('candidate_id').values_list('candidate_id', 'canonical_skill_id')
+        skills_by_candidate = {}
+        for candidate_id, skill_id in skills.iterator():
+            column = skill_columns.get(skill_id)
+            if column is not None:
+                skills_by_candidate.setdefault(candidate_id, []).append(column)
+
+        indptr = [0]
+        indices = []
+        for row in rows:
+            indices.extend(skills_by_candidate.get(row[0], ()))
+            indptr.append(len(indices))
+
+        yield {
+            'ids': np.array([row[0] for row in rows], dtype=np.int64),
+            'skill_indptr': np.array(indptr, dtype=np.int64),
+            'skill_indices': np.array(indices, dtype=np.int64),
+            'band': years_to_band(np.array([row[1] for row in rows])).astype(np.int8),
+            'city': np.array([city_codes.get(normalize_city(row[2]), -1) for row in rows], dtype=np.int32),
+            'relocate': np.array([row[3] for row in rows], dtype=bool),
+            'salary': np.array(
+                [float(row[4]) if row[4] is not None else np.nan for row in rows], dtype=np.float32
+            ),
+        }
+
+
+def iter_block_results(blocks, jobs, top=MATCH_TOP_N, workers=None):
+    """Calcule les blocs, en parallèle si plusieurs processus sont disponibles
+
+    Le nombre de blocs en vol est limité pour borner la mémoire.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for block in blocks:
+            yield score_block(block, top, jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(jobs,)) as executor:
+        pending = set()
+        for block in blocks:
+            pending.add(executor.submit(score_block, block, top))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def _upsert(recommendations, update_fields):
+    MatchRecommendation.objects.bulk_create(
+        recommendations,
+        batch_size=STORE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['candidate', 'job'],
+        update_fields=update_fields,
+    )
+
+
+def store_match_recommendations(top=MATCH_TOP_N, block_size=MATCH_BLOCK_SIZE, workers=None):
+    """Calcule la matrice candidats × offres et enregistre les meilleurs couples
+
+    Les couples de l'exécution précédente restent lisibles pendant le calcul
+    et sont supprimés à la fin.
+    """
+    started = timezone.now()
+    jobs, skill_columns, city_codes = load_job_features()
+    stored = 0
+
+    if len(jobs['ids']):
+        job_tops = None
+        blocks = iter_candidate_blocks(skill_columns, city_codes, block_size)
+        for result in iter_block_results(blocks, jobs, top, workers):
+            recommendations = [
+                MatchRecommendation(
+                    candidate_id=int(candidate_id), job_id=int(job_id), score=round(float(score), 1),
+                    candidate_rank=rank, job_rank=None, computed_at=started,
+                )
+                for candidate_id, job_ids, scores in zip(
+                    result['candidate_ids'], result['top_jobs'], result['top_job_scores']
+                )
+                for rank, (job_id, score) in enumerate(zip(job_ids, scores), start=1)
+                if score > 0
+            ]
+            _upsert(recommendations, ['score', 'candidate_rank', 'job_rank', 'computed_at'])
+            stored += len(recommendations)
+            job_tops = merge_job_tops(job_tops, result, top)
+
+        # Les couples non recalculés ne sont plus dans le top des candidats
+        MatchRecommendation.objects.filter(computed_at__lt=started).update(candidate_rank=None)
+
+        if job_tops is not None:
+            candidate_ids, scores = job_tops
+            recommendations = [
+                MatchRecommendation(
+                    candidate_id=int(candidate_ids[rank, column]), job_id=int(job_id),
+                    score=round(float(scores[rank, column]), 1),
+                    job_rank=rank + 1, computed_at=started,
+                )
+                for column, job_id in enumerate(jobs['ids'])
+                for rank in range(candidate_ids.shape[0])
+                if scores[rank, column] > 0
+            ]
+            _upsert(recommendations, ['score', 'job_rank', 'computed_at'])
+            stored += len(recommendations)
+
+    MatchRecommendation.objects.filter(computed_at__lt=started).delete()
+    return stored
+
+
+def get_recommended_jobs(candidate, limit=10):
+    """Meilleures offres publiées pour un candidat, d'après le dernier calcul nocturne"""
+    return Job.objects.filter(
+        status='published',
+        match_recommendations__candidate=candidate,
+        match_recommendations__candidate_rank__isnull=False,
+    ).order_by('match_recommendations__candidate_rank')[:limit]
+
+
+def get_recommended_candidates(job, limit=10):
+    """Meilleurs candidats pour une offre, d'après le dernier calcul nocturne"""
+    return CandidateProfile.objects.filter(
+        is_active=True,
+        match_recommendations__job=job,
+        match_recommendations__job_rank__isnull=False,
+    ).select_related('user').order_by('match_recommendations__job_rank')[:limit]
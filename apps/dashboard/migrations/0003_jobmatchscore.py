@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-19 04:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_candidateprofile_score'),
+        ('dashboard', '0002_alter_systemnotification_notification_type'),
+        ('jobs', '0003_job_job_description_file_alter_job_company_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobMatchScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0)),
+                ('breakdown', models.JSONField(blank=True, default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_match_scores', to='accounts.candidateprofile')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_match_scores', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Score de correspondance',
+                'verbose_name_plural': 'Scores de correspondance',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['job', '-score'], name='dashboard_j_job_id_42e406_idx'), models.Index(fields=['candidate', '-score'], name='dashboard_j_candida_82d39f_idx')],
+                'unique_together': {('candidate', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 04:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_backfill_canonical_skills'),
+        ('dashboard', '0003_jobmatchscore'),
+        ('jobs', '0004_jobskill_canonical_skill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0)),
+                ('candidate_rank', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('job_rank', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField()),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_recommendations', to='accounts.candidateprofile')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_recommendations', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Recommandation',
+                'verbose_name_plural': 'Recommandations',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['candidate', 'candidate_rank'], name='dashboard_m_candida_80c1dc_idx'), models.Index(fields=['job', 'job_rank'], name='dashboard_m_job_id_1b3136_idx'), models.Index(fields=['computed_at'], name='dashboard_m_compute_070d2a_idx')],
+                'unique_together': {('candidate', 'job')},
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from apps.accounts.models import CandidateProfile
+from apps.jobs.models import Job
 
 User = get_user_model()
 
@@ -66,3 +68,54 @@ class UserNotificationRead(models.Model):
 
     class Meta:
         unique_together = ['user', 'notification']
+
+
+
+class JobMatchScore(models.Model):
+    """Score de correspondance persistant entre un candidat et une offre"""
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='job_match_scores')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='candidate_match_scores')
+    score = models.FloatField(default=0)
+    breakdown = models.JSONField(default=dict, blank=True)  # Détail du score par critère
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Score de correspondance'
+        verbose_name_plural = 'Scores de correspondance'
+        unique_together = ['candidate', 'job']
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['job', '-score']),
+            models.Index(fields=['candidate', '-score']),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate} - {self.job.title}: {self.score}"
+
+
+class MatchRecommendation(models.Model):
+    """Couple candidat/offre retenu par le calcul nocturne de la matrice de correspondance
+    
+    Un couple est conservé s'il figure parmi les meilleures offres du candidat
+    (candidate_rank) ou parmi les meilleurs candidats de l'offre (job_rank).
+    """
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='match_recommendations')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='match_recommendations')
+    score = models.FloatField(default=0)
+    candidate_rank = models.PositiveSmallIntegerField(null=True, blank=True)
+    job_rank = models.PositiveSmallIntegerField(null=True, blank=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Recommandation'
+        verbose_name_plural = 'Recommandations'
+        unique_together = ['candidate', 'job']
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['candidate', 'candidate_rank']),
+            models.Index(fields=['job', 'job_rank']),
+            models.Index(fields=['computed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate} - {self.job.title}: {self.score}"
@@ -0,0 +1,236 @@
+from functools import partial
+
+import numpy as np
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from apps.accounts.models import CandidateProfile, Certification, Education, Skill
+from apps.accounts.utils import related_count
+from utils.cache import bump_cache_version, get_cache_version
+from .models import JobMatchScore
+
+# Pondération de chaque critère (total = 100 points)
+RANKING_WEIGHTS = {
+    'profile': 20,
+    'experience': 25,
+    'education': 15,
+    'skills': 30,
+    'documents': 10,
+}
+
+RANKING_CACHE_TIMEOUT = 60 * 60 * 6  # 6 heures, l'invalidation passe par la version de l'offre
+# Classement de tout le vivier : trop de candidats pour l'invalider à chaque modification d'un profil
+RANKING_POOL_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+# Recalcul des scores d'une offre déjà programmé dans la transaction en cours
+JOB_SCORES_REFRESH_LOCK = 'job_match_scores:{}:scheduled'
+CANDIDATE_SCORES_REFRESH_LOCK = 'candidate_match_scores:{}:scheduled'
+
+
+def job_ranking_namespace(job_id):
+    """Espace de cache du classement d'une offre"""
+    return f"job_ranking:{job_id}"
+
+
+def get_job_skill_ids(job):
+    """Identifiants des compétences de référence requises par une offre"""
+    return set(
+        job.required_skills.filter(canonical_skill__isnull=False)
+        .values_list('canonical_skill_id', flat=True)
+    )
+
+
+def get_candidate_pool(job, applicants_only=False, candidate_ids=None):
+    """Charge le vivier de candidats et leurs caractéristiques en trois requêtes"""
+    if candidate_ids is not None:
+        candidates = CandidateProfile.objects.filter(pk__in=candidate_ids)
+    else:
+        candidates = CandidateProfile.objects.filter(
+            is_active=True, user__is_active=True
+        )
+    if applicants_only:
+        candidates = candidates.filter(applications__job=job)
+
+    return candidates.annotate(
+        education_count=related_count(Education),
+        certification_count=related_count(Certification),
+    ).only(
+        'id', 'profile_completion', 'years_of_experience', 'cv_file', 'cover_letter'
+    ).prefetch_related(
+        Prefetch('skills', queryset=Skill.objects.only('id', 'candidate_id', 'canonical_skill_id'))
+    ).order_by('id')
+
+
+def score_candidate_pool(candidates, job_skills):
+    """Calcule les scores de tout le vivier sous forme vectorisée
+    
+    `job_skills` est l'ensemble des identifiants de compétences de référence requis.
+    """
+    rows = []
+    for candidate in candidates:
+        skill_ids = {skill.canonical_skill_id for skill in candidate.skills.all()}
+        skill_ids.discard(None)
+        rows.append((
+            candidate.id,
+            candidate.profile_completion,
+            candidate.years_of_experience,
+            candidate.education_count,
+            candidate.certification_count,
+            len(skill_ids),
+            len(skill_ids & job_skills),
+            1 if candidate.cv_file else 0,
+            1 if candidate.cover_letter else 0,
+        ))
+
+    if not rows:
+        return []
+
+    data = np.array(rows, dtype=np.float64)
+    (ids, completion, years, educations, certifications,
+     skills_count, matched_skills, has_cv, has_cover) = data.T
+
+    breakdown = {
+        'profile': completion / 100 * RANKING_WEIGHTS['profile'],
+        'experience': np.minimum(years * 2.5, RANKING_WEIGHTS['experience']),
+        'education': np.minimum(educations * 5, RANKING_WEIGHTS['education']),
+        'documents': np.minimum(
+            has_cv * 5 + has_cover * 3 + (certifications > 0) * 2,
+            RANKING_WEIGHTS['documents']
+        ),
+    }
+    if job_skills:
+        # Part des compétences requises couvertes par le candidat
+        breakdown['skills'] = matched_skills / len(job_skills) * RANKING_WEIGHTS['skills']
+    else:
+        # Pas de compétences requises : on valorise l'étendue des compétences
+        breakdown['skills'] = np.minimum(skills_count / 10, 1) * RANKING_WEIGHTS['skills']
+
+    total = np.sum(list(breakdown.values()), axis=0)
+    # Tri par score décroissant, puis par identifiant pour un ordre stable
+    order = np.lexsort((ids, -total))
+
+    ranking = []
+    for index in order:
+        ranking.append({
+            'candidate_id': int(ids[index]),
+            'score': round(float(total[index]), 1),
+            'matched_skills': int(matched_skills[index]),
+            'breakdown': {
+                feature: round(float(values[index]), 1)
+                for feature, values in breakdown.items()
+            },
+        })
+    return ranking
+
+
+def get_job_ranking(job, applicants_only=False):
+    """Retourne le classement complet (mis en cache) des candidats pour une offre
+
+    Les deux classements sont invalidés par la version de l'offre (offre,
+    compétences requises, candidatures et profils de ses candidats) ; celui de
+    tout le vivier expire en plus après RANKING_POOL_CACHE_TIMEOUT.
+    """
+    cache_key = "job_ranking:{}:{}:{}".format(
+        job.pk,
+        'applicants' if applicants_only else 'all',
+        get_cache_version(job_ranking_namespace(job.pk)),
+    )
+    ranking = cache.get(cache_key)
+    if ranking is None:
+        candidates = get_candidate_pool(job, applicants_only=applicants_only)
+        ranking = score_candidate_pool(candidates, get_job_skill_ids(job))
+        cache.set(cache_key, ranking, RANKING_CACHE_TIMEOUT if applicants_only else RANKING_POOL_CACHE_TIMEOUT)
+    return ranking
+
+
+def rank_candidates_for_job(job, page=1, per_page=20, applicants_only=False):
+    """Page du classement des meilleurs candidats pour une offre, avec le détail des scores"""
+    ranking = get_job_ranking(job, applicants_only=applicants_only)
+    page_obj = Paginator(ranking, per_page).get_page(page)
+
+    candidates = CandidateProfile.objects.select_related('user').in_bulk(
+        [entry['candidate_id'] for entry in page_obj.object_list]
+    )
+    page_obj.object_list = [
+        dict(entry, rank=page_obj.start_index() + position, candidate=candidates[entry['candidate_id']])
+        for position, entry in enumerate(page_obj.object_list)
+        if entry['candidate_id'] in candidates
+    ]
+    return page_obj
+
+
+def store_job_match_scores(job, candidate_ids=None):
+    """Calcule et enregistre les scores de correspondance des candidats d'une offre
+    
+    Sans liste explicite, les candidats ayant postulé à l'offre sont recalculés.
+    """
+    candidates = get_candidate_pool(
+        job,
+        applicants_only=candidate_ids is None,
+        candidate_ids=candidate_ids,
+    )
+    ranking = score_candidate_pool(candidates, get_job_skill_ids(job))
+    now = timezone.now()
+    JobMatchScore.objects.bulk_create(
+        [
+            JobMatchScore(
+                candidate_id=entry['candidate_id'],
+                job=job,
+                score=entry['score'],
+                breakdown=entry['breakdown'],
+                computed_at=now,
+            )
+            for entry in ranking
+        ],
+        update_conflicts=True,
+        unique_fields=['candidate', 'job'],
+        update_fields=['score', 'breakdown', 'computed_at'],
+    )
+    return len(ranking)
+
+
+def refresh_candidate_match_scores(candidate_id):
+    """Recalcule les scores de correspondance d'un candidat pour les offres auxquelles il a postulé
+
+    Les classements de ces offres sont invalidés au passage.
+    """
+    from apps.applications.models import Application
+    from apps.jobs.models import Job
+
+    cache.delete(CANDIDATE_SCORES_REFRESH_LOCK.format(candidate_id))
+    job_ids = Application.objects.filter(candidate_id=candidate_id).values('job_id')
+    for job in Job.objects.filter(id__in=job_ids):
+        store_job_match_scores(job, candidate_ids=[candidate_id])
+        bump_cache_version(job_ranking_namespace(job.pk))
+
+
+def refresh_job_match_scores(job_id):
+    """Recalcule les scores de correspondance d'une offre, si elle existe encore"""
+    from apps.jobs.models import Job
+
+    cache.delete(JOB_SCORES_REFRESH_LOCK.format(job_id))
+    job = Job.objects.filter(pk=job_id).first()
+    if job is not None:
+        store_job_match_scores(job)
+
+
+def schedule_job_match_scores(job_id):
+    """Programme un seul recalcul des scores d'une offre après validation
+
+    Un formulaire de N compétences déclenche N signaux : seul le premier
+    programme le recalcul.
+    """
+    if cache.add(JOB_SCORES_REFRESH_LOCK.format(job_id), True, 60):
+        transaction.on_commit(partial(refresh_job_match_scores, job_id))
+
+
+def schedule_candidate_match_scores(candidate_id):
+    """Programme un seul recalcul des scores d'un candidat après validation
+
+    Enregistrer N compétences ou expériences déclenche N signaux : seul le
+    premier programme le recalcul.
+    """
+    if cache.add(CANDIDATE_SCORES_REFRESH_LOCK.format(candidate_id), True, 60):
+        transaction.on_commit(partial(refresh_candidate_match_scores, candidate_id))
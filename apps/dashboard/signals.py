@@ -0,0 +1,69 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.accounts.models import CandidateProfile, Education, Experience, Skill, Certification
+from apps.accounts.utils import SCORE_FIELDS, deleted_with_candidate, fields_changed
+from apps.applications.models import Application
+from apps.jobs.models import Job, JobSkill
+from utils.cache import bump_cache_version
+from .ranking import (
+    job_ranking_namespace, schedule_candidate_match_scores, schedule_job_match_scores, store_job_match_scores
+)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def update_profile_match_scores(sender, instance, created, update_fields=None, **kwargs):
+    """Recalculer les scores de correspondance et les classements après modification du profil"""
+    if not created and fields_changed(update_fields, SCORE_FIELDS | {'is_active'}):
+        schedule_candidate_match_scores(instance.pk)
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Certification)
+@receiver(post_delete, sender=Certification)
+def update_related_match_scores(sender, instance, **kwargs):
+    """Recalculer les scores de correspondance et les classements après modification d'un élément du profil"""
+    if deleted_with_candidate(kwargs.get('origin')):
+        # Suppression du candidat lui-même : ses scores partent avec lui
+        return
+    schedule_candidate_match_scores(instance.candidate_id)
+
+
+@receiver(post_save, sender=Application)
+def create_application_match_score(sender, instance, created, **kwargs):
+    """Calculer le score de correspondance d'une nouvelle candidature, après validation"""
+    if created:
+        bump_cache_version(job_ranking_namespace(instance.job_id))
+        transaction.on_commit(partial(
+            store_job_match_scores, instance.job, candidate_ids=[instance.candidate_id]
+        ))
+
+
+@receiver(post_delete, sender=Application)
+def invalidate_job_ranking_on_withdrawal(sender, instance, **kwargs):
+    """Invalider le classement des candidats d'une offre quand une candidature disparaît"""
+    bump_cache_version(job_ranking_namespace(instance.job_id))
+
+
+@receiver(post_save, sender=Job)
+def invalidate_job_ranking(sender, instance, **kwargs):
+    """Invalider le classement d'une offre modifiée"""
+    bump_cache_version(job_ranking_namespace(instance.pk))
+
+
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def invalidate_job_ranking_on_skills(sender, instance, **kwargs):
+    """Invalider le classement et les scores quand les compétences requises changent"""
+    bump_cache_version(job_ranking_namespace(instance.job_id))
+    origin = kwargs.get('origin')
+    if isinstance(origin, Job) or getattr(origin, 'model', None) is Job:
+        # Suppression de l'offre elle-même : pas de scores à recalculer
+        return
+    schedule_job_match_scores(instance.job_id)
@@ -14,6 +14,8 @@ urlpatterns = [
     # Gestion des candidats
     path('candidates/', views.candidates_management, name='candidates'),
     path('candidate/<int:candidate_id>/', views.candidate_profile_view, name='candidate_profile'),
+    path('candidate/<int:candidate_id>/export/', views.export_candidate_profile, name='export_candidate_profile'),
+    path('job/<int:job_id>/top-candidates/', views.job_top_candidates, name='job_top_candidates'),
     
     # Export de données
     path('export/', views.export_data, name='export_data'),
@@ -7,6 +7,7 @@ from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
 from apps.accounts.models import User, CandidateProfile
+from apps.accounts.utils import calculate_candidate_score
 from apps.jobs.models import Job
 from apps.applications.models import Application, Interview
 
@@ -218,36 +219,6 @@ def generate_excel_report(report_type):
     return response
 
 
-def calculate_candidate_score(candidate):
-    """Calcule un score pour un candidat basé sur son profil"""
-    score = 0
-    
-    # Completion du profil (0-30 points)
-    score += (candidate.profile_completion / 100) * 30
-    
-    # Expérience (0-25 points)
-    exp_score = min(candidate.years_of_experience * 2.5, 25)
-    score += exp_score
-    
-    # Formation (0-20 points)
-    education_count = candidate.educations.count()
-    education_score = min(education_count * 5, 20)
-    score += education_score
-    
-    # Compétences (0-15 points)
-    skills_count = candidate.skills.count()
-    skills_score = min(skills_count * 1.5, 15)
-    score += skills_score
-    
-    # Documents (0-10 points)
-    if candidate.cv_file:
-        score += 5
-    if candidate.cover_letter:
-        score += 5
-    
-    return min(round(score, 1), 100)
-
-
 def get_recruitment_analytics():
     """Analyse avancée des données de recrutement"""
     analytics = {}
@@ -2,19 +2,26 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Count, Q, Avg
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse
 from django.utils import timezone
 from datetime import datetime, timedelta
 from django.core.paginator import Paginator
 import json
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 
 # Import des modèles
 from apps.accounts.models import User, CandidateProfile
+from apps.accounts.resumes import filter_candidates_by_resume
+from apps.accounts.snapshot import CandidateSnapshot
+from apps.accounts.search import candidate_facets, filter_candidates_by_search
 from apps.jobs.models import Job, JobCategory
+from apps.applications.calendar import calendar_token
 from apps.applications.models import Application, Interview
 from .models import SystemNotification, UserNotificationRead
 from .utils import generate_excel_report, get_dashboard_stats
+from utils.export import export_candidate_profile_to_excel
+from .ranking import get_job_skill_ids, rank_candidates_for_job
 
 
 @login_required
@@ -82,6 +89,9 @@ def admin_dashboard(request):
         'applications_by_status': json.dumps(applications_by_status),
         'top_jobs': top_jobs,
         'notifications': notifications,
+        'calendar_feed_url': request.build_absolute_uri(
+            reverse('applications:interview_calendar', args=[calendar_token(request.user)])
+        ),
     }
     
     return render(request, 'dashboard/admin_dashboard.html', context)
@@ -144,10 +154,7 @@ def statistics(request):
     monthly_data.reverse()
     
     # Top catégories
-    top_categories = JobCategory.objects.annotate(
-        job_count=Count('jobs', filter=Q(jobs__status='published')),
-        app_count=Count('jobs__applications')
-    ).order_by('-app_count')[:10]
+    top_categories = JobCategory.objects.order_by('-applications_count', 'name')[:10]
     
     # Statistiques par source (si implémenté)
     # source_stats = Application.objects.values('source').annotate(count=Count('id')).order_by('-count')
@@ -176,18 +183,16 @@ def candidates_management(request):
         messages.error(request, "Accès non autorisé.")
         return redirect('home')
     
-    candidates = CandidateProfile.objects.select_related('user').all()
+    candidates = CandidateProfile.objects.all()
     
     # Filtres
     search = request.GET.get('search')
     if search:
-        candidates = candidates.filter(
-            Q(user__first_name__icontains=search) |
-            Q(user__last_name__icontains=search) |
-            Q(user__email__icontains=search) |
-            Q(current_position__icontains=search) |
-            Q(current_company__icontains=search)
-        )
+        candidates = filter_candidates_by_search(candidates, search)
+    
+    cv_search = request.GET.get('cv_search')
+    if cv_search:
+        candidates = filter_candidates_by_resume(candidates, cv_search)
     
     experience_filter = request.GET.get('experience')
     if experience_filter:
@@ -201,30 +206,49 @@ def candidates_management(request):
     if location_filter:
         candidates = candidates.filter(city__icontains=location_filter)
     
+    experience_band = request.GET.get('experience_band')
+    if experience_band and experience_band.isdigit():
+        candidates = candidates.filter(search_document__experience_band=int(experience_band))
+    
+    completion_band = request.GET.get('completion_band')
+    if completion_band and completion_band.isdigit():
+        candidates = candidates.filter(search_document__completion_band=int(completion_band))
+    
+    score_filter = request.GET.get('min_score')
+    if score_filter:
+        try:
+            candidates = candidates.filter(score__gte=float(score_filter))
+        except ValueError:
+            pass
+    
+    # Statistiques et facettes en un seul agrégat
+    facets = candidate_facets(candidates)
+    
     # Tri
     sort_by = request.GET.get('sort', '-created_at')
-    if sort_by in ['-created_at', 'user__last_name', 'years_of_experience', 'profile_completion']:
-        candidates = candidates.order_by(sort_by)
+    if sort_by in ['-created_at', 'user__last_name', 'years_of_experience', 'profile_completion', '-score', 'score']:
+        candidates = candidates.order_by(sort_by, '-pk')
     
-    # Pagination
+    # Pagination (le total est déjà connu par l'agrégat)
+    candidates = candidates.select_related('user').annotate(
+        applications_total=Count('applications', distinct=True)
+    )
     paginator = Paginator(candidates, 20)
+    paginator.count = facets['stats']['total']
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Statistiques
-    candidate_stats = {
-        'total': candidates.count(),
-        'active': candidates.filter(is_active=True).count(),
-        'with_cv': candidates.exclude(cv_file='').count(),
-        'high_completion': candidates.filter(profile_completion__gte=80).count(),
-    }
-    
     context = {
         'page_obj': page_obj,
-        'candidate_stats': candidate_stats,
+        'candidate_stats': facets['stats'],
+        'facets': facets,
+        'experience_band': experience_band,
+        'completion_band': completion_band,
         'search': search,
+        'cv_search': cv_search,
         'experience_filter': experience_filter,
         'location_filter': location_filter,
+        'score_filter': score_filter,
         'current_sort': sort_by,
     }
     
@@ -331,23 +355,79 @@ def candidate_profile_view(request, candidate_id):
         messages.error(request, "Accès non autorisé.")
         return redirect('home')
     
-    candidate = get_object_or_404(CandidateProfile, id=candidate_id)
+    # Profil complet et statistiques lus depuis le cache du candidat
+    snapshot = CandidateSnapshot.get(candidate_id)
+    if snapshot is None:
+        raise Http404("Candidat introuvable")
     
     # Applications du candidat
-    applications = candidate.applications.select_related('job').order_by('-applied_at')
-    
-    # Statistiques du candidat
-    candidate_stats = {
-        'total_applications': applications.count(),
-        'pending_applications': applications.filter(status='pending').count(),
-        'interviews': applications.filter(status__in=['interview_scheduled', 'interview_completed']).count(),
-        'offers': applications.filter(status='offer_made').count(),
-    }
+    applications = Application.objects.filter(candidate_id=candidate_id).select_related(
+        'job__category'
+    ).order_by('-applied_at')
     
     context = {
-        'candidate': candidate,
+        'snapshot': snapshot,
+        'candidate': snapshot.profile,
         'applications': applications,
-        'candidate_stats': candidate_stats,
+        'candidate_stats': snapshot.application_stats,
     }
     
     return render(request, 'dashboard/candidate_profile.html', context)
+
+
+@login_required
+def export_candidate_profile(request, candidate_id):
+    """Export Excel du profil complet d'un candidat"""
+    if request.user.user_type not in ['admin', 'hr']:
+        messages.error(request, "Accès non autorisé.")
+        return redirect('home')
+    
+    snapshot = CandidateSnapshot.get(candidate_id)
+    if snapshot is None:
+        raise Http404("Candidat introuvable")
+    
+    return export_candidate_profile_to_excel(snapshot)
+
+
+@login_required
+def job_top_candidates(request, job_id):
+    """Classement des meilleurs candidats pour une offre"""
+    if request.user.user_type not in ['admin', 'hr']:
+        messages.error(request, "Accès non autorisé.")
+        return redirect('home')
+    
+    job = get_object_or_404(Job, id=job_id)
+    applicants_only = request.GET.get('scope') == 'applicants'
+    page_obj = rank_candidates_for_job(
+        job,
+        page=request.GET.get('page'),
+        applicants_only=applicants_only
+    )
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'job': job.id,
+            'count': page_obj.paginator.count,
+            'page': page_obj.number,
+            'num_pages': page_obj.paginator.num_pages,
+            'results': [
+                {
+                    'rank': entry['rank'],
+                    'candidate_id': entry['candidate_id'],
+                    'name': entry['candidate'].user.full_name,
+                    'score': entry['score'],
+                    'matched_skills': entry['matched_skills'],
+                    'breakdown': entry['breakdown'],
+                }
+                for entry in page_obj.object_list
+            ],
+        })
+    
+    context = {
+        'job': job,
+        'page_obj': page_obj,
+        'applicants_only': applicants_only,
+        'required_skills_count': len(get_job_skill_ids(job)),
+    }
+    
+    return render(request, 'dashboard/job_candidates.html', context)
@@ -1,25 +1,24 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import JobCategory, Job, JobSkill, SavedJob, JobAlert
+from .models import JobCategory, Job, Company, JobSkill, SavedJob, JobAlert
 from django.utils.text import slugify
 import uuid
 
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'is_active', 'jobs_count', 'created_at')
+    list_display = ('name', 'is_active', 'published_jobs_count', 'applications_count', 'created_at')
     list_filter = ('is_active', 'created_at')
     search_fields = ('name', 'description')
+    readonly_fields = ('published_jobs_count', 'applications_count')
     prepopulated_fields = {}
 
-    def jobs_count(self, obj):
-        return obj.jobs.count()
-    jobs_count.short_description = 'Nombre d\'offres'
-
 
 class JobSkillInline(admin.TabularInline):
     model = JobSkill
     extra = 1
+    # Rattachée par JobSkill.save (resolve_skill) : affichée seulement
+    readonly_fields = ('canonical_skill',)
 
 
 @admin.register(Job)
@@ -33,7 +32,11 @@ class JobAdmin(admin.ModelAdmin):
         'remote_work', 'featured', 'urgent', 'created_at'
     )
     search_fields = ('title', 'company', 'description', 'location', 'slug')
-    readonly_fields = ('views_count', 'applications_count', 'created_at', 'updated_at', 'slug')
+    readonly_fields = (
+        'views_count', 'applications_count', 'created_at', 'updated_at', 'slug',
+        'salary_min_annual_eur', 'salary_max_annual_eur',
+    )
+    autocomplete_fields = ('category', 'created_by')
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -50,7 +53,10 @@ class JobAdmin(admin.ModelAdmin):
             'fields': ('description', 'requirements', 'responsibilities', 'benefits')
         }),
         ('Salaire', {
-            'fields': ('salary_min', 'salary_max', 'salary_currency', 'salary_period')
+            'fields': (
+                'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+                'salary_min_annual_eur', 'salary_max_annual_eur',
+            )
         }),
         ('Statut et options', {
             'fields': ('status', 'featured', 'urgent')
@@ -98,11 +104,21 @@ class JobAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('category', 'created_by')
 
 
+@admin.register(Company)
+class CompanyAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'website', 'published_jobs_count', 'created_at')
+    list_filter = ('size',)
+    search_fields = ('name', 'normalized_name')
+    readonly_fields = ('normalized_name', 'slug', 'published_jobs_count', 'created_at')
+
+
 @admin.register(JobSkill)
 class JobSkillAdmin(admin.ModelAdmin):
-    list_display = ('job', 'skill_name', 'level', 'years_required')
+    list_display = ('job', 'skill_name', 'canonical_skill', 'level', 'years_required')
     list_filter = ('level', 'years_required')
     search_fields = ('job__title', 'skill_name')
+    autocomplete_fields = ('job',)
+    readonly_fields = ('canonical_skill',)
 
 
 @admin.register(SavedJob)
@@ -110,6 +126,7 @@ class SavedJobAdmin(admin.ModelAdmin):
     list_display = ('user', 'job', 'saved_at')
     list_filter = ('saved_at',)
     search_fields = ('user__first_name', 'user__last_name', 'job__title')
+    autocomplete_fields = ('user', 'job')
     date_hierarchy = 'saved_at'
 
 
@@ -119,6 +136,7 @@ class JobAlertAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'job_type', 'experience_level', 'email_frequency', 'created_at')
     search_fields = ('title', 'user__first_name', 'user__last_name', 'keywords')
     readonly_fields = ('created_at', 'last_sent')
+    autocomplete_fields = ('user', 'category')
     
     fieldsets = (
         ('Informations générales', {
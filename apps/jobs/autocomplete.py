@@ -0,0 +1,170 @@
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.db.models import Count, Q
+from django.urls import reverse_lazy
+from unidecode import unidecode
+
+from utils.cache import bump_cache_version, get_cache_version
+
+# Version partagée (cache Django) : incrémentée quand l'index d'un processus ne suffit plus (compétences, suppressions)
+AUTOCOMPLETE_VERSION = 'autocomplete_index'
+# Un processus ne reconstruit pas son index plus souvent que cela, même si la version change
+AUTOCOMPLETE_REBUILD_INTERVAL = 60  # secondes
+AUTOCOMPLETE_KINDS = ('title', 'company', 'location', 'skill')
+AUTOCOMPLETE_MIN_LENGTH = 2
+AUTOCOMPLETE_LIMIT = 8
+
+# Champs de l'offre indexés, par type de suggestion
+JOB_TERM_FIELDS = {'title': 'title', 'company': 'company', 'location': 'location'}
+
+_index = None
+
+
+def normalize_term(text):
+    """Clé de recherche : sans accents, en minuscules, espaces réduits"""
+    return ' '.join(unidecode(text or '').lower().split())
+
+
+def term_keys(label):
+    """Clés d'un libellé : le libellé entier puis la fin à partir de chaque mot
+
+    « Développeur Python » est trouvé par « dev » comme par « pyt ».
+    """
+    words = normalize_term(label).split(' ')
+    return {' '.join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+class PrefixIndex:
+    """Index des suggestions : tableau trié de (clé, type, libellé) et poids par (type, libellé)
+
+    Les lectures se font par bisect sur le tableau, sans verrou : une insertion
+    (insort) ou le remplacement du poids sont atomiques pour l'interpréteur.
+    """
+
+    def __init__(self, weights, version):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.weights = dict(weights)
+        self.entries = sorted(
+            (key, kind, label) for kind, label in self.weights for key in term_keys(label)
+        )
+
+    def set_weight(self, kind, label, weight):
+        """Met à jour le poids d'un libellé, en l'ajoutant au tableau s'il est nouveau"""
+        if (kind, label) not in self.weights:
+            for key in term_keys(label):
+                insort(self.entries, (key, kind, label))
+        self.weights[(kind, label)] = weight
+
+    def search(self, prefix, kinds=AUTOCOMPLETE_KINDS, limit=AUTOCOMPLETE_LIMIT):
+        """Libellés dont un mot commence par le préfixe, les plus fréquents d'abord"""
+        prefix = normalize_term(prefix)
+        if len(prefix) < AUTOCOMPLETE_MIN_LENGTH:
+            return []
+        found = {}
+        entries = self.entries
+        # Parcours par indice depuis la position : ni copie ni avance sur le début du tableau
+        for position in range(bisect_left(entries, (prefix,)), len(entries)):
+            key, kind, label = entries[position]
+            if not key.startswith(prefix):
+                break
+            weight = self.weights.get((kind, label), 0)
+            if kind in kinds and weight > 0:
+                found[(kind, label)] = weight
+        ranked = sorted(found.items(), key=lambda item: (-item[1], item[0][1]))
+        return [{'label': label, 'kind': kind} for (kind, label), _ in ranked[:limit]]
+
+
+def published_term_weights(terms=None):
+    """Nombre d'offres publiées par (type, libellé), pour tous les libellés ou ceux donnés"""
+    from .models import Job
+
+    weights = Counter()
+    published = Job.objects.filter(status='published')
+    for kind, field in JOB_TERM_FIELDS.items():
+        rows = published
+        if terms is not None:
+            labels = [label for term_kind, label in terms if term_kind == kind]
+            if not labels:
+                continue
+            rows = rows.filter(**{f'{field}__in': labels})
+        for label, total in rows.values_list(field).annotate(total=Count('pk')).order_by():
+            if label:
+                weights[(kind, label.strip())] += total
+    return weights
+
+
+def skill_weights():
+    """Compétences de référence, pondérées par le nombre d'offres publiées qui les demandent"""
+    from apps.accounts.models import CanonicalSkill
+
+    skills = CanonicalSkill.objects.annotate(
+        total=Count('job_skills', filter=Q(job_skills__job__status='published'))
+    ).values_list('name', 'total')
+    # Une compétence sans offre reste proposée, derrière les autres
+    return {('skill', name): total + 1 for name, total in skills}
+
+
+def build_index():
+    version = get_cache_version(AUTOCOMPLETE_VERSION)
+    weights = published_term_weights()
+    weights.update(skill_weights())
+    return PrefixIndex(weights, version)
+
+
+def get_index():
+    """Index du processus, reconstruit au plus toutes les AUTOCOMPLETE_REBUILD_INTERVAL secondes après un changement"""
+    global _index
+    if _index is None:
+        _index = build_index()
+    elif time.monotonic() - _index.built_at > AUTOCOMPLETE_REBUILD_INTERVAL:
+        if get_cache_version(AUTOCOMPLETE_VERSION) != _index.version:
+            _index = build_index()
+    return _index
+
+
+def autocomplete(prefix, kinds=AUTOCOMPLETE_KINDS, limit=AUTOCOMPLETE_LIMIT):
+    return get_index().search(prefix, kinds, limit)
+
+
+def job_terms(values):
+    """(type, libellé) d'une offre, depuis ses valeurs de champs"""
+    return {
+        (kind, (values.get(field) or '').strip())
+        for kind, field in JOB_TERM_FIELDS.items()
+        if (values.get(field) or '').strip()
+    }
+
+
+def update_job_terms(terms):
+    """Recalcule les poids des libellés donnés dans l'index du processus et invalide celui des autres
+
+    Appelé après l'enregistrement ou la suppression d'une offre : une requête
+    sur les seuls libellés concernés, sans reconstruire l'index.
+    """
+    global _index
+    if not terms:
+        return
+    weights = published_term_weights(terms)
+    version = bump_cache_version(AUTOCOMPLETE_VERSION)
+    if _index is not None:
+        for kind, label in terms:
+            _index.set_weight(kind, label, weights.get((kind, label), 0))
+        if version == _index.version + 1:
+            # Aucun autre changement depuis la construction : l'index du processus reste à jour
+            _index.version = version
+
+
+def invalidate_autocomplete():
+    bump_cache_version(AUTOCOMPLETE_VERSION)
+
+
+def autocomplete_attrs(*kinds):
+    """Attributs d'un champ de recherche branché sur les suggestions (static/js/custom.js)"""
+    return {
+        'data-autocomplete': ','.join(kinds),
+        'data-autocomplete-url': reverse_lazy('jobs:autocomplete'),
+        'autocomplete': 'off',
+    }
@@ -0,0 +1,56 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.safestring import mark_safe
+
+# Gabarits des cartes d'offre, un par présentation
+JOB_CARD_TEMPLATES = {
+    'list': 'jobs/cards/list.html',        # listes d'offres (recherche, catégories)
+    'grid': 'jobs/cards/grid.html',        # offres en vedette de l'accueil
+    'row': 'jobs/cards/row.html',          # dernières offres de l'accueil
+    'compact': 'jobs/cards/compact.html',  # offres similaires
+    'saved': 'jobs/cards/saved.html',      # favoris
+    'email': 'jobs/cards/email.html',      # newsletters et alertes
+}
+
+# La clé suit updated_at ; la durée borne l'âge affiché par timesince et les renommages de catégorie
+JOB_CARD_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+
+
+def job_card_key(job, variant, language, options):
+    """Clé d'une carte : (offre, date de modification, présentation, langue, options de rendu)"""
+    key = f"job_card:{variant}:{language}:{job.pk}:{job.updated_at.timestamp():.6f}"
+    if options:
+        key += ':' + hashlib.md5(repr(sorted(options.items())).encode()).hexdigest()[:12]
+    return key
+
+
+def attach_job_cards(jobs, variant, **options):
+    """Rend les cartes d'une liste d'offres et les place dans job.card_html
+
+    Les cartes en cache sont lues en un get_many, seules les absentes sont
+    rendues puis écrites en un set_many. Les options (ex. show_save,
+    site_url) entrent dans la clé : elles ne doivent pas dépendre d'autre
+    chose que de la présentation.
+    Retourne la liste des offres.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return jobs
+    template_name = JOB_CARD_TEMPLATES[variant]
+    language = translation.get_language() or settings.LANGUAGE_CODE
+    keys = {job.pk: job_card_key(job, variant, language, options) for job in jobs}
+    cached = cache.get_many(keys.values())
+
+    missing = {}
+    for job in jobs:
+        html = cached.get(keys[job.pk])
+        if html is None:
+            html = missing.setdefault(keys[job.pk], render_to_string(template_name, {'job': job, **options}))
+        job.card_html = mark_safe(html)
+    if missing:
+        cache.set_many(missing, JOB_CARD_CACHE_TIMEOUT)
+    return jobs
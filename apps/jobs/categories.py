@@ -0,0 +1,102 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from utils.cache import bump_cache_version, get_cache_version
+
+# Version partagée (cache Django) : incrémentée à chaque modification d'une catégorie ou de ses compteurs
+JOB_CATEGORIES_VERSION = 'job_categories'
+
+# (version, catégories actives) chargées par ce processus
+_snapshot = (None, [])
+
+
+def get_active_categories():
+    """Catégories actives triées par nom, avec leurs compteurs, en mémoire du processus
+
+    Les instances sont partagées par les requêtes du processus : lecture seule.
+    """
+    global _snapshot
+    version = get_cache_version(JOB_CATEGORIES_VERSION)
+    if _snapshot[0] != version:
+        from .models import JobCategory
+
+        _snapshot = (version, list(JobCategory.objects.filter(is_active=True).order_by('name')))
+    return _snapshot[1]
+
+
+def invalidate_categories():
+    """Recharge des catégories dans chaque processus, après validation de la transaction"""
+    transaction.on_commit(partial(bump_cache_version, JOB_CATEGORIES_VERSION))
+
+
+def count_subquery(queryset, category_path):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{category_path: OuterRef('pk')})
+            .values(category_path)
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def category_counts():
+    """Expressions des compteurs d'une catégorie, calculés par la base"""
+    from apps.applications.models import Application
+    from .models import Job
+
+    return {
+        'published_jobs_count': count_subquery(Job.objects.filter(status='published'), 'category_id'),
+        'applications_count': count_subquery(Application.objects.all(), 'job__category_id'),
+    }
+
+
+def refresh_category_counts(category_ids):
+    """Recalcule en un UPDATE les compteurs des catégories données"""
+    from .models import JobCategory
+
+    category_ids = {pk for pk in category_ids if pk}
+    if category_ids:
+        JobCategory.objects.filter(pk__in=category_ids).update(**category_counts())
+        invalidate_categories()
+
+
+def add_category_applications(job_id, delta):
+    """Ajoute delta au nombre de candidatures de la catégorie d'une offre"""
+    from .models import JobCategory
+
+    categories = JobCategory.objects.filter(jobs__pk=job_id)
+    if delta < 0:
+        categories = categories.filter(applications_count__gte=-delta)
+    if categories.update(applications_count=F('applications_count') + delta):
+        invalidate_categories()
+
+
+def reconcile_counters():
+    """Corrige les compteurs dénormalisés des catégories et des entreprises qui ont dérivé
+
+    Retourne le nombre de catégories et d'entreprises corrigées.
+    """
+    from .companies import published_jobs_subquery
+    from .models import Company, Job, JobCategory
+
+    counts = category_counts()
+    drifted_categories = list(
+        JobCategory.objects.annotate(**{f'actual_{name}': expression for name, expression in counts.items()})
+        .exclude(published_jobs_count=F('actual_published_jobs_count'), applications_count=F('actual_applications_count'))
+        .values_list('pk', flat=True)
+    )
+    refresh_category_counts(drifted_categories)
+
+    drifted_companies = Company.objects.annotate(actual=published_jobs_subquery(Job)).exclude(
+        published_jobs_count=F('actual')
+    )
+    fixed_companies = Company.objects.filter(pk__in=list(drifted_companies.values_list('pk', flat=True))).update(
+        published_jobs_count=published_jobs_subquery(Job)
+    )
+    return len(drifted_categories), fixed_companies
@@ -0,0 +1,63 @@
+import re
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from unidecode import unidecode
+
+_NON_NAME_CHARS = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_company_name(name):
+    """Normalise un nom d'entreprise : accents, casse, espaces et ponctuation
+
+    "ACME", "Acme " et "acmé" donnent la même clé.
+    """
+    return _NON_NAME_CHARS.sub(' ', unidecode(name or '').lower()).strip()[:200]
+
+
+def company_slug(normalized_name):
+    """Slug d'une entreprise, dérivé de sa clé normalisée (donc unique)"""
+    return normalized_name.replace(' ', '-')
+
+
+def resolve_company(job):
+    """Identifiant de l'entreprise d'une offre, créée depuis l'offre si elle n'existe pas encore"""
+    from .models import Company
+
+    key = normalize_company_name(job.company)
+    if not key:
+        return None
+    company, created = Company.objects.get_or_create(
+        normalized_name=key,
+        defaults={
+            'name': job.company.strip()[:200],
+            'slug': company_slug(key),
+            'size': job.company_size,
+            'website': job.company_website,
+            'logo': job.company_logo,
+        },
+    )
+    return company.pk
+
+
+def published_jobs_subquery(job_model):
+    """Nombre d'offres publiées d'une entreprise, calculé par la base"""
+    return Coalesce(
+        Subquery(
+            job_model.objects.filter(employer_id=OuterRef('pk'), status='published')
+            .values('employer_id')
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def refresh_company_counts(company_ids):
+    """Recalcule en un UPDATE le nombre d'offres publiées des entreprises données"""
+    from .models import Company, Job
+
+    company_ids = {pk for pk in company_ids if pk}
+    if company_ids:
+        Company.objects.filter(pk__in=company_ids).update(published_jobs_count=published_jobs_subquery(Job))
@@ -2,6 +2,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Submit, Row, Column, Div, HTML
+from .autocomplete import autocomplete_attrs
 from .models import Job, JobCategory, JobSkill, JobAlert
 
 
@@ -119,12 +120,15 @@ class JobSearchForm(forms.Form):
     keywords = forms.CharField(
         max_length=200, 
         required=False,
-        widget=forms.TextInput(attrs={'placeholder': 'Mots-clés, titre du poste...'})
+        widget=forms.TextInput(attrs={
+            'placeholder': 'Mots-clés, titre du poste...',
+            **autocomplete_attrs('title', 'company', 'skill'),
+        })
     )
     location = forms.CharField(
         max_length=200, 
         required=False,
-        widget=forms.TextInput(attrs={'placeholder': 'Ville, région...'})
+        widget=forms.TextInput(attrs={'placeholder': 'Ville, région...', **autocomplete_attrs('location')})
     )
     category = forms.ModelChoiceField(
         queryset=JobCategory.objects.filter(is_active=True),
@@ -145,7 +149,8 @@ class JobSearchForm(forms.Form):
         max_digits=10, 
         decimal_places=2, 
         required=False,
-        widget=forms.NumberInput(attrs={'placeholder': 'Salaire minimum'})
+        label='Salaire annuel minimum (€)',
+        widget=forms.NumberInput(attrs={'placeholder': 'Salaire annuel minimum (€)'})
     )
 
     def __init__(self, *args, **kwargs):
@@ -179,9 +184,12 @@ class JobAlertForm(forms.ModelForm):
             'experience_level', 'salary_min', 'remote_work', 'email_frequency'
         ]
         widgets = {
-            'keywords': forms.TextInput(attrs={'placeholder': 'Mots-clés séparés par des virgules'}),
-            'location': forms.TextInput(attrs={'placeholder': 'Ville, région...'}),
-            'salary_min': forms.NumberInput(attrs={'step': '0.01'}),
+            'keywords': forms.TextInput(attrs={
+                'placeholder': 'Mots-clés séparés par des virgules',
+                **autocomplete_attrs('title', 'skill'),
+            }),
+            'location': forms.TextInput(attrs={'placeholder': 'Ville, région...', **autocomplete_attrs('location')}),
+            'salary_min': forms.NumberInput(attrs={'step': '0.01', 'placeholder': 'Salaire annuel minimum (€)'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from apps.jobs.categories import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les compteurs des catégories et des entreprises qui ne correspondent plus aux offres et candidatures'
+
+    def handle(self, *args, **options):
+        categories, companies = reconcile_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {categories} catégories et {companies} entreprises corrigées')
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from apps.jobs.models import Job
+from apps.jobs.salaries import refresh_annual_salaries
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les salaires annuels en euros des offres (après une modification de SALARY_FX_RATES)'
+
+    def handle(self, *args, **options):
+        updated = refresh_annual_salaries(Job.objects.all())
+        self.stdout.write(self.style.SUCCESS(f'✅ {updated} offres mises à jour'))
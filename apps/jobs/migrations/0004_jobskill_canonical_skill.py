@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-19 04:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_canonicalskill_skill_canonical_skill_skillalias'),
+        ('jobs', '0003_job_job_description_file_alter_job_company_logo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobskill',
+            name='canonical_skill',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_skills', to='accounts.canonicalskill'),
+        ),
+    ]
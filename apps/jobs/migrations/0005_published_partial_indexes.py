@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_jobskill_canonical_skill'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-created_at'], name='job_published_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['application_deadline'], name='job_published_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:21
+
+import cloudinary.models
+import django.db.models.deletion
+import re
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from unidecode import unidecode
+
+NON_NAME_CHARS = re.compile(r'[^a-z0-9]+')
+
+
+# Copies figées de apps.jobs.companies au moment de la migration : le module peut évoluer
+def normalize_company_name(name):
+    return NON_NAME_CHARS.sub(' ', unidecode(name or '').lower()).strip()[:200]
+
+
+def company_slug(normalized_name):
+    return normalized_name.replace(' ', '-')
+
+
+def published_jobs_subquery(job_model):
+    return Coalesce(
+        Subquery(
+            job_model.objects.filter(employer_id=OuterRef('pk'), status='published')
+            .values('employer_id')
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def backfill_companies(apps, schema_editor):
+    """Dédoublonne les noms d'entreprise des offres et rattache chaque offre à son entreprise
+
+    Le nom retenu est la graphie la plus fréquente ; taille, site et logo
+    viennent de l'offre la plus récente qui les renseigne.
+    """
+    Job = apps.get_model('jobs', 'Job')
+    Company = apps.get_model('jobs', 'Company')
+
+    spellings = {}
+    details = {}
+    job_keys = []
+    rows = Job.objects.order_by('-created_at').values_list(
+        'pk', 'company', 'company_size', 'company_website', 'company_logo'
+    )
+    for pk, name, size, website, logo in rows.iterator():
+        key = normalize_company_name(name)
+        if not key:
+            continue
+        job_keys.append((pk, key))
+        spellings.setdefault(key, Counter())[name.strip()] += 1
+        current = details.setdefault(key, {'size': '', 'website': '', 'logo': None})
+        for field, value in (('size', size), ('website', website), ('logo', logo)):
+            if value and not current[field]:
+                current[field] = value
+
+    Company.objects.bulk_create(
+        [
+            Company(
+                name=spellings[key].most_common(1)[0][0][:200],
+                normalized_name=key,
+                slug=company_slug(key),
+                **details[key],
+            )
+            for key in spellings
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    company_ids = dict(Company.objects.values_list('normalized_name', 'pk'))
+    Job.objects.bulk_update(
+        [Job(pk=pk, employer_id=company_ids[key]) for pk, key in job_keys],
+        ['employer'],
+        batch_size=500,
+    )
+    Company.objects.update(published_jobs_count=published_jobs_subquery(Job))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_published_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('normalized_name', models.CharField(max_length=200, unique=True)),
+                ('slug', models.SlugField(max_length=200, unique=True)),
+                ('size', models.CharField(blank=True, choices=[('startup', 'Startup (1-10)'), ('small', 'Petite (11-50)'), ('medium', 'Moyenne (51-200)'), ('large', 'Grande (201-1000)'), ('enterprise', 'Entreprise (1000+)')], max_length=20)),
+                ('website', models.URLField(blank=True)),
+                ('logo', cloudinary.models.CloudinaryField(blank=True, max_length=255, null=True, verbose_name='image')),
+                ('published_jobs_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Entreprise',
+                'verbose_name_plural': 'Entreprises',
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['normalized_name'], name='company_name_prefix_idx', opclasses=['varchar_pattern_ops']), models.Index(fields=['-published_jobs_count', 'name'], name='company_popular_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='employer',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='jobs.company'),
+        ),
+        migrations.RunPython(backfill_companies, migrations.RunPython.noop),
+    ]
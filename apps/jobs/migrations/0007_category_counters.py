@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:23
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+# Copie figée de apps.jobs.categories au moment de la migration : le module peut évoluer
+def count_subquery(queryset, category_path):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{category_path: OuterRef('pk')})
+            .values(category_path)
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def backfill_category_counts(apps, schema_editor):
+    """Compteurs initiaux des catégories, en un UPDATE"""
+    JobCategory = apps.get_model('jobs', 'JobCategory')
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('applications', 'Application')
+    JobCategory.objects.update(
+        published_jobs_count=count_subquery(Job.objects.filter(status='published'), 'category_id'),
+        applications_count=count_subquery(Application.objects.all(), 'job__category_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_company'),
+        ('applications', '0005_sweeper_statuses'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcategory',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobcategory',
+            name='published_jobs_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_category_counts, migrations.RunPython.noop),
+    ]
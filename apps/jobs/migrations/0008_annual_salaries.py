@@ -0,0 +1,63 @@
+# Generated by Django 5.2.6 on 2026-10-19 05:32
+
+import django.db.models.functions.comparison
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Value
+
+# Copie figée de apps.jobs.salaries au moment de la migration : le module peut évoluer
+SALARY_PERIOD_MULTIPLIERS = {
+    'hour': Decimal(1820),
+    'day': Decimal(260),
+    'week': Decimal(52),
+    'month': Decimal(12),
+    'year': Decimal(1),
+}
+
+
+def annual_eur_factor(currency, period):
+    rate = settings.SALARY_FX_RATES.get((currency or '').upper())
+    multiplier = SALARY_PERIOD_MULTIPLIERS.get(period)
+    if rate is None or multiplier is None:
+        return None
+    return Decimal(str(rate)) * multiplier
+
+
+def backfill_annual_salaries(apps, schema_editor):
+    """Salaires annuels en euros des offres existantes, un UPDATE par couple (devise, période)"""
+    Job = apps.get_model('jobs', 'Job')
+    pairs = Job.objects.order_by().values_list('salary_currency', 'salary_period').distinct()
+    for currency, period in list(pairs):
+        factor = annual_eur_factor(currency, period)
+        Job.objects.filter(salary_currency=currency, salary_period=period).update(
+            salary_min_annual_eur=None if factor is None else F('salary_min') * Value(factor),
+            salary_max_annual_eur=None if factor is None else F('salary_max') * Value(factor),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_category_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='salary_max_annual_eur',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=15, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min_annual_eur',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=15, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(models.OrderBy(django.db.models.functions.comparison.Coalesce('salary_max_annual_eur', 'salary_min_annual_eur', models.Value(0), output_field=models.DecimalField(decimal_places=2, max_digits=15)), descending=True), condition=models.Q(('status', 'published')), name='job_published_salary_idx'),
+        ),
+        migrations.RunPython(backfill_annual_salaries, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 ﻿from django.db import models
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
@@ -6,6 +7,7 @@ import uuid
 from django.utils.text import slugify
 from unidecode import unidecode
 from cloudinary.models import CloudinaryField
+from .salaries import ANNUAL_SALARY_EUR, set_annual_salaries
 
 User = get_user_model()
 
@@ -16,6 +18,10 @@ class JobCategory(models.Model):
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Compteurs tenus à jour par les signaux des offres et des candidatures (voir categories.py)
+    published_jobs_count = models.PositiveIntegerField(default=0, editable=False)
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = 'Catégorie d\'emploi'
@@ -25,6 +31,17 @@ class JobCategory(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .categories import invalidate_categories
+        super().save(*args, **kwargs)
+        invalidate_categories()
+
+    def delete(self, *args, **kwargs):
+        from .categories import invalidate_categories
+        result = super().delete(*args, **kwargs)
+        invalidate_categories()
+        return result
+
 
 class Job(models.Model):
     """Offre d'emploi"""
@@ -82,6 +99,11 @@ class Job(models.Model):
 
     title = models.CharField(max_length=200)
     company = models.CharField(max_length=200)
+    # Entreprise résolue depuis le nom saisi à chaque enregistrement
+    employer = models.ForeignKey(
+        'Company', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='jobs', editable=False
+    )
     company_size = models.CharField(max_length=20, choices=COMPANY_SIZES, blank=True)
     company_description = models.TextField(blank=True)
     company_website = models.URLField(blank=True)
@@ -138,6 +160,9 @@ class Job(models.Model):
         ('month', 'Par mois'),
         ('year', 'Par an'),
     ], default='year')
+    # Montants annuels en euros (salaries.py), pour filtrer et trier entre devises et périodes
+    salary_min_annual_eur = models.DecimalField(max_digits=15, decimal_places=2, null=True, editable=False)
+    salary_max_annual_eur = models.DecimalField(max_digits=15, decimal_places=2, null=True, editable=False)
     salary_negotiable = models.BooleanField(default=True)
     bonus_structure = models.TextField(blank=True)
     equity_offered = models.BooleanField(default=False)
@@ -189,10 +214,35 @@ class Job(models.Model):
         verbose_name = 'Offre d\'emploi'
         verbose_name_plural = 'Offres d\'emploi'
         ordering = ['-created_at']
+        indexes = [
+            # Catalogue : les offres expirées sont sorties de « published » par le balayage périodique
+            models.Index(
+                fields=['-created_at'], name='job_published_recent_idx',
+                condition=models.Q(status='published'),
+            ),
+            models.Index(
+                fields=['application_deadline'], name='job_published_deadline_idx',
+                condition=models.Q(status='published'),
+            ),
+            # Filtre « salaire minimum » et tri par salaire décroissant (salaries.ANNUAL_SALARY_EUR)
+            models.Index(
+                ANNUAL_SALARY_EUR.desc(), name='job_published_salary_idx',
+                condition=models.Q(status='published'),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.company}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Catégorie et libellés chargés, pour recalculer compteurs et suggestions d'avant (signals)
+        instance._loaded_category_id = instance.__dict__.get('category_id')
+        from .autocomplete import job_terms
+        instance._loaded_terms = job_terms(instance.__dict__) if instance.__dict__.get('status') == 'published' else set()
+        return instance
+
     def get_absolute_url(self):
         return reverse('job_detail', kwargs={'slug': self.slug})
 
@@ -209,6 +259,20 @@ class Job(models.Model):
             # Vérifier l'unicité
             self._ensure_unique_slug()
         
+        update_fields = kwargs.get('update_fields')
+        salary_fields = {'salary_min', 'salary_max', 'salary_currency', 'salary_period'}
+        if update_fields is None or salary_fields & set(update_fields):
+            set_annual_salaries(self)
+            if update_fields is not None:
+                update_fields = kwargs['update_fields'] = {*update_fields, 'salary_min_annual_eur', 'salary_max_annual_eur'}
+        if update_fields is None or 'company' in update_fields:
+            from .companies import resolve_company
+            # Ancienne entreprise conservée pour recalculer son compteur (signals)
+            self._previous_employer_id = self.employer_id
+            self.employer_id = resolve_company(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'employer'}
+        
         super().save(*args, **kwargs)
 
     def _has_title_changed(self):
@@ -263,7 +327,11 @@ class Job(models.Model):
 
     @property
     def is_active(self):
-        """Vérifie si l'offre est encore active"""
+        """Vérifie si l'offre est encore active
+        
+        Les offres échues passent en « expiré » au balayage périodique ; la date
+        limite est revérifiée ici pour l'intervalle entre deux passages.
+        """
         if self.status != 'published':
             return False
         if self.application_deadline and self.application_deadline < timezone.now():
@@ -282,14 +350,57 @@ class Job(models.Model):
         return "Salaire à négocier"
 
     def increment_views(self):
-        """Incrémenter le nombre de vues"""
+        """Incrémenter le nombre de vues (incrément atomique en base, sans signaux)"""
+        Job.objects.filter(pk=self.pk).update(views_count=F('views_count') + 1)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
 
     def increment_applications(self):
-        """Incrémenter le nombre de candidatures"""
+        """Incrémenter le nombre de candidatures (incrément atomique en base, sans signaux)"""
+        Job.objects.filter(pk=self.pk).update(applications_count=F('applications_count') + 1)
         self.applications_count += 1
-        self.save(update_fields=['applications_count'])
+
+
+class Company(models.Model):
+    """Entreprise, regroupant les offres publiées sous un même nom"""
+    name = models.CharField(max_length=200)
+    # Clé de dédoublonnage (voir companies.normalize_company_name), aussi utilisée pour la recherche par préfixe
+    normalized_name = models.CharField(max_length=200, unique=True)
+    slug = models.SlugField(max_length=200, unique=True)
+    size = models.CharField(max_length=20, choices=Job.COMPANY_SIZES, blank=True)
+    website = models.URLField(blank=True)
+    logo = CloudinaryField(
+        'image',
+        folder='recruitment/company_logos/',
+        null=True,
+        blank=True,
+        transformation=[
+            {'width': 200, 'height': 200, 'crop': 'fill'},
+            {'quality': 'auto'},
+            {'format': 'webp'}
+        ]
+    )
+    # Nombre d'offres publiées, tenu à jour par les signaux des offres
+    published_jobs_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Entreprise'
+        verbose_name_plural = 'Entreprises'
+        ordering = ['name']
+        indexes = [
+            # LIKE 'préfixe%' indexé sous PostgreSQL quelle que soit la collation
+            models.Index(
+                fields=['normalized_name'], name='company_name_prefix_idx',
+                opclasses=['varchar_pattern_ops'],
+            ),
+            models.Index(fields=['-published_jobs_count', 'name'], name='company_popular_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse('jobs:company_detail', kwargs={'slug': self.slug})
 
 
 class JobSkill(models.Model):
@@ -302,6 +413,10 @@ class JobSkill(models.Model):
 
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='required_skills')
     skill_name = models.CharField(max_length=100)
+    canonical_skill = models.ForeignKey(
+        'accounts.CanonicalSkill', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='job_skills', editable=False
+    )
     level = models.CharField(max_length=20, choices=SKILL_LEVELS, default='required')
     years_required = models.PositiveIntegerField(default=0)
 
@@ -313,6 +428,11 @@ class JobSkill(models.Model):
     def __str__(self):
         return f"{self.skill_name} ({self.get_level_display()})"
 
+    def save(self, *args, **kwargs):
+        from apps.accounts.skills import resolve_skill
+        self.canonical_skill_id = resolve_skill(self.skill_name)
+        super().save(*args, **kwargs)
+
 
 class SavedJob(models.Model):
     """Emplois sauvegardés par les candidats"""
@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThanOrEqual
+
+# Périodes de salaire -> nombre de périodes payées dans l'année (35 h par semaine)
+SALARY_PERIOD_MULTIPLIERS = {
+    'hour': Decimal(1820),
+    'day': Decimal(260),
+    'week': Decimal(52),
+    'month': Decimal(12),
+    'year': Decimal(1),
+}
+
+CENTS = Decimal('0.01')
+
+# Salaire annuel en euros de référence d'une offre : le maximum, sinon le minimum, sinon 0.
+# Indexé tel quel (job_published_salary_idx) : filtres et tri doivent utiliser cette expression.
+ANNUAL_SALARY_EUR = Coalesce(
+    'salary_max_annual_eur', 'salary_min_annual_eur', Value(0),
+    output_field=DecimalField(max_digits=15, decimal_places=2),
+)
+
+
+def annual_eur_factor(currency, period):
+    """Coefficient qui convertit un salaire (devise, période) en montant annuel en euros
+
+    Les taux viennent de settings.SALARY_FX_RATES (montant en EUR pour une unité
+    de la devise). None si la devise ou la période est inconnue : l'offre est
+    alors exclue des filtres de salaire.
+    """
+    rate = settings.SALARY_FX_RATES.get((currency or '').upper())
+    multiplier = SALARY_PERIOD_MULTIPLIERS.get(period)
+    if rate is None or multiplier is None:
+        return None
+    return Decimal(str(rate)) * multiplier
+
+
+def annual_eur(amount, currency, period):
+    factor = annual_eur_factor(currency, period)
+    if amount is None or factor is None:
+        return None
+    return (Decimal(amount) * factor).quantize(CENTS)
+
+
+def set_annual_salaries(job):
+    """Renseigne les salaires annuels en euros d'une offre, avant enregistrement"""
+    job.salary_min_annual_eur = annual_eur(job.salary_min, job.salary_currency, job.salary_period)
+    job.salary_max_annual_eur = annual_eur(job.salary_max, job.salary_currency, job.salary_period)
+
+
+def refresh_annual_salaries(queryset):
+    """Recalcule les salaires annuels en euros des offres données, après un changement des taux
+
+    Un UPDATE par couple (devise, période) présent, calculé par la base.
+    Retourne le nombre d'offres mises à jour.
+    """
+    updated = 0
+    pairs = queryset.order_by().values_list('salary_currency', 'salary_period').distinct()
+    for currency, period in list(pairs):
+        factor = annual_eur_factor(currency, period)
+        updated += queryset.filter(salary_currency=currency, salary_period=period).update(
+            salary_min_annual_eur=None if factor is None else F('salary_min') * Value(factor),
+            salary_max_annual_eur=None if factor is None else F('salary_max') * Value(factor),
+        )
+    return updated
+
+
+def salary_at_least(amount):
+    """Condition « le salaire annuel en euros de l'offre atteint le montant », pour filter()"""
+    return GreaterThanOrEqual(ANNUAL_SALARY_EUR, amount)
@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.conf import settings
-from .models import Job
+from .autocomplete import invalidate_autocomplete, job_terms, update_job_terms
+from .categories import refresh_category_counts
+from .companies import refresh_company_counts
+from .models import Job, JobSkill
 from apps.core.tasks import send_newsletter_task
 from apps.core.models import Newsletter
 
@@ -29,3 +34,52 @@ def send_new_job_notification(sender, instance, created, **kwargs):
                 context_list.append(context)
             
             send_newsletter_task.delay(subject, template_name, context_list, recipient_emails)
+
+
+@receiver(post_save, sender=Job)
+def update_company_counts(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Compteur d'offres publiées de l'entreprise (et de l'ancienne si le nom a changé)"""
+    if raw or (update_fields is not None and not {'status', 'company'} & set(update_fields)):
+        return
+    refresh_company_counts({instance.employer_id, getattr(instance, '_previous_employer_id', None)})
+
+
+@receiver(post_delete, sender=Job)
+def update_company_counts_on_delete(sender, instance, **kwargs):
+    refresh_company_counts({instance.employer_id})
+
+
+@receiver(post_save, sender=Job)
+def update_category_counts(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Compteurs de la catégorie de l'offre (et de l'ancienne si elle a changé)"""
+    if raw or (update_fields is not None and not {'status', 'category'} & set(update_fields)):
+        return
+    refresh_category_counts({instance.category_id, getattr(instance, '_loaded_category_id', None)})
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(post_delete, sender=Job)
+def update_category_counts_on_delete(sender, instance, **kwargs):
+    refresh_category_counts({instance.category_id})
+
+
+@receiver(post_save, sender=Job)
+def update_autocomplete_terms(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Suggestions de recherche : poids des libellés de l'offre, avant et après modification"""
+    if raw or (update_fields is not None and not {'status', 'title', 'company', 'location'} & set(update_fields)):
+        return
+    terms = job_terms(instance.__dict__) | getattr(instance, '_loaded_terms', set())
+    instance._loaded_terms = job_terms(instance.__dict__) if instance.status == 'published' else set()
+    transaction.on_commit(partial(update_job_terms, terms))
+
+
+@receiver(post_delete, sender=Job)
+def update_autocomplete_terms_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(partial(update_job_terms, job_terms(instance.__dict__)))
+
+
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def invalidate_autocomplete_on_skills(sender, instance, **kwargs):
+    """Poids des compétences recalculés à la prochaine reconstruction des index"""
+    transaction.on_commit(invalidate_autocomplete)
@@ -8,6 +8,8 @@ urlpatterns = [
     path('', views.job_list, name='job_list'),
     path('categories/', views.job_categories, name='job_categories'),
     path('category/<int:category_id>/', views.jobs_by_category, name='jobs_by_category'),
+    path('company/<slug:slug>/', views.company_detail, name='company_detail'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
     
     # Favoris
     path('save/<int:job_id>/', views.toggle_save_job, name='toggle_save_job'),
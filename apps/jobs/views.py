@@ -2,10 +2,15 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.http import JsonResponse, Http404
+from django.views.decorators.cache import cache_control
 from django.views.decorators.http import require_http_methods
-from .models import Job, JobCategory, SavedJob, JobAlert
+from . import autocomplete as suggestions
+from .cards import attach_job_cards
+from .categories import get_active_categories
+from .models import Company, Job, JobCategory, SavedJob, JobAlert
+from .salaries import ANNUAL_SALARY_EUR, salary_at_least
 from .forms import JobForm, JobSearchForm, JobAlertForm
 from apps.applications.models import Application
 
@@ -48,25 +53,25 @@ def job_list(request):
             jobs = jobs.filter(remote_work=True)
         
         if salary_min:
-            jobs = jobs.filter(
-                Q(salary_min__gte=salary_min) | Q(salary_max__gte=salary_min)
-            )
+            # Montant annuel en euros, comparé aux salaires convertis des offres
+            jobs = jobs.filter(salary_at_least(salary_min))
     
     # Tri
     sort_by = request.GET.get('sort', '-created_at')
-    if sort_by in ['-created_at', 'title', '-salary_max', '-applications_count']:
+    if sort_by == '-salary_max':
+        jobs = jobs.order_by(ANNUAL_SALARY_EUR.desc())
+    elif sort_by in ['-created_at', 'title', '-applications_count']:
         jobs = jobs.order_by(sort_by)
     
     # Pagination
     paginator = Paginator(jobs, 12)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    attach_job_cards(page_obj, 'list', show_save=request.user.is_authenticated and request.user.user_type == 'candidate')
     
     # Statistiques
     total_jobs = jobs.count()
-    categories = JobCategory.objects.filter(is_active=True).annotate(
-        job_count=Count('jobs', filter=Q(jobs__status='published'))
-    )
+    categories = get_active_categories()
     
     context = {
         'form': form,
@@ -83,7 +88,7 @@ def job_detail(request, slug):
     """Détail d'une offre d'emploi"""
     try:
         # Essayer de trouver le job par son slug
-        job = get_object_or_404(Job, slug=slug, status='published')
+        job = get_object_or_404(Job.objects.select_related('employer'), slug=slug, status='published')
     except Http404:
         # Si le job n'existe pas, vérifier s'il a été déplacé ou renommé
         try:
@@ -125,10 +130,10 @@ def job_detail(request, slug):
             ).exists()
     
     # Offres similaires
-    similar_jobs = Job.objects.filter(
-        category=job.category,
-        status='published'
-    ).exclude(id=job.id)[:4]
+    similar_jobs = attach_job_cards(
+        Job.objects.filter(category=job.category, status='published').exclude(id=job.id)[:4],
+        'compact',
+    )
     
     context = {
         'job': job,
@@ -217,6 +222,15 @@ def toggle_save_job(request, job_id):
     })
 
 
+@cache_control(public=True, max_age=300)
+def autocomplete(request):
+    """Suggestions de recherche (titres, entreprises, villes, compétences) depuis l'index en mémoire"""
+    query = request.GET.get('q', '')[:100]
+    kinds = [kind for kind in request.GET.get('kind', '').split(',') if kind in suggestions.AUTOCOMPLETE_KINDS]
+    results = suggestions.autocomplete(query, kinds or suggestions.AUTOCOMPLETE_KINDS)
+    return JsonResponse({'query': query, 'results': results})
+
+
 @login_required
 def saved_jobs(request):
     """Liste des offres sauvegardées par l'utilisatGNF"""
@@ -226,6 +240,7 @@ def saved_jobs(request):
     paginator = Paginator(saved_jobs, 10)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    attach_job_cards([saved_job.job for saved_job in page_obj], 'saved')
     
     return render(request, 'jobs/saved_jobs.html', {'page_obj': page_obj})
 
@@ -299,9 +314,7 @@ def toggle_job_alert(request, alert_id):
 
 def job_categories(request):
     """Liste des catégories d'emploi"""
-    categories = JobCategory.objects.filter(is_active=True).annotate(
-        job_count=Count('jobs', filter=Q(jobs__status='published'))
-    ).order_by('name')
+    categories = get_active_categories()
     
     return render(request, 'jobs/job_categories.html', {'categories': categories})
 
@@ -309,14 +322,32 @@ def job_categories(request):
 def jobs_by_category(request, category_id):
     """Offres d'emploi par catégorie"""
     category = get_object_or_404(JobCategory, id=category_id, is_active=True)
-    jobs = Job.objects.filter(category=category, status='published').order_by('-created_at')
+    jobs = Job.objects.filter(category=category, status='published').select_related('category').order_by('-created_at')
     
     # Pagination
     paginator = Paginator(jobs, 12)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    attach_job_cards(page_obj, 'list', show_save=request.user.is_authenticated and request.user.user_type == 'candidate')
     
     return render(request, 'jobs/jobs_by_category.html', {
         'category': category,
         'page_obj': page_obj
     })
+
+
+def company_detail(request, slug):
+    """Offres publiées d'une entreprise"""
+    company = get_object_or_404(Company, slug=slug)
+    jobs = company.jobs.filter(status='published').select_related('category').order_by('-created_at')
+    
+    # Pagination
+    paginator = Paginator(jobs, 12)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    attach_job_cards(page_obj, 'list', show_save=request.user.is_authenticated and request.user.user_type == 'candidate')
+    
+    return render(request, 'jobs/company_detail.html', {
+        'company': company,
+        'page_obj': page_obj
+    })
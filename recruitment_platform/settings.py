@@ -6,6 +6,7 @@ from pathlib import Path
 from decouple import config, Csv
 import os
 import dj_database_url
+from celery.schedules import crontab
 import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -176,6 +178,8 @@ CLOUDINARY_ACTIVE = all([
 
 if CLOUDINARY_ACTIVE:
     DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+    # Stockage des documents déposés (CV, pièces jointes) par le pipeline asynchrone
+    UPLOAD_STORAGE_BACKEND = 'cloudinary_storage.storage.RawMediaCloudinaryStorage'
     # Configuration Cloudinary supplémentaire
     import cloudinary
     cloudinary.config(
@@ -186,6 +190,7 @@ if CLOUDINARY_ACTIVE:
 else:
     # Fallback vers le stockage local si Cloudinary n'est pas configuré
     DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+    UPLOAD_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
     print("⚠️ Cloudinary non configuré - utilisation du stockage local")
 
 # Media URL configuration
@@ -193,6 +198,10 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 os.makedirs(MEDIA_ROOT, exist_ok=True)
 
+# Répertoire local des fichiers déposés en attente d'envoi au stockage
+# (doit être partagé entre le serveur web et les workers Celery)
+UPLOAD_SPOOL_DIR = config('UPLOAD_SPOOL_DIR', default=str(BASE_DIR / 'tmp' / 'uploads'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -284,16 +293,79 @@ else:
     CELERY_BROKER_URL = 'memory://'
     CELERY_RESULT_BACKEND = 'cache+memory://'
 
+# Cache partagé : les versions de cache (paramètres du site, thème, catégories...)
+# et le contenu préparé par les tâches doivent être vus par tous les processus
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    # Développement local : un seul processus, tâches exécutées en synchrone
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Tâches planifiées (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    'compute-match-recommendations': {
+        'task': 'apps.core.tasks.compute_match_recommendations',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'extract-resume-documents': {
+        'task': 'apps.core.tasks.extract_resume_documents',
+        'schedule': crontab(minute='*/10'),
+    },
+    'store-uploaded-files': {
+        'task': 'apps.core.tasks.store_uploaded_files',
+        'schedule': crontab(minute='*/5'),
+    },
+    'run-sweepers': {
+        'task': 'apps.core.tasks.run_sweepers',
+        'schedule': crontab(minute='*/15'),
+    },
+    'refresh-home-payload': {
+        'task': 'apps.core.tasks.refresh_home_payload_task',
+        'schedule': crontab(minute='*/10'),
+    },
+    'reconcile-job-counters': {
+        'task': 'apps.core.tasks.reconcile_job_counters',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'refresh-experience-years': {
+        'task': 'apps.core.tasks.refresh_experience_years',
+        'schedule': crontab(hour=1, minute=30),
+    },
+}
+
 # =============================================================================
 # FIN CONFIGURATION CELERY
 # =============================================================================
 
+# Salaires des offres : conversion en montant annuel en euros (filtres et tri)
+# Taux locaux, en EUR pour une unité de la devise ; après modification :
+# python manage.py refresh_job_salaries
+SALARY_FX_RATES = {
+    'EUR': 1,
+    'USD': 0.92,
+    'GBP': 1.17,
+    'CHF': 1.05,
+    'CAD': 0.68,
+    'MAD': 0.092,
+    'XOF': 0.001524,
+    'GNF': 0.000107,
+}
+
 # Configuration de la langue française
 LOCALE_PATHS = [
     BASE_DIR / 'locale',
@@ -366,6 +438,7 @@ if DEBUG:
     print("DEBUG MODE ACTIVATED")
     print(f"Database: {DATABASES['default']['ENGINE']}")
     print(f"Redis URL: {REDIS_URL}")
+    print(f"Cache: {CACHES['default']['BACKEND'].rsplit('.', 1)[-1]}")
     print(f"Celery Mode: {'SYNCHRONE' if CELERY_TASK_ALWAYS_EAGER else 'ASYNCHRONE'}")
     print(f"Cloudinary: {'ACTIVE' if CLOUDINARY_ACTIVE else 'INACTIVE'}")
     print(f"Keep-alive: {'ACTIVE' if ENABLE_KEEP_ALIVE else 'INACTIVE'}")
@@ -381,6 +381,39 @@ class RecruitmentPlatform {
                 input.closest('.search-form').classList.remove('focused');
             });
         });
+
+        document.querySelectorAll('input[data-autocomplete]').forEach(input => {
+            this.initAutocomplete(input);
+        });
+    }
+
+    initAutocomplete(input) {
+        // Suggestions servies par jobs:autocomplete, affichées dans une datalist native
+        const list = document.createElement('datalist');
+        list.id = `${input.name || 'search'}-suggestions-${Math.random().toString(36).slice(2, 8)}`;
+        input.after(list);
+        input.setAttribute('list', list.id);
+
+        input.addEventListener('input', this.debounce(async () => {
+            const query = input.value.trim();
+            if (query.length < 2) {
+                list.innerHTML = '';
+                return;
+            }
+            const params = new URLSearchParams({ q: query, kind: input.dataset.autocomplete });
+            try {
+                const response = await fetch(`${input.dataset.autocompleteUrl}?${params}`);
+                const data = await response.json();
+                list.innerHTML = '';
+                data.results.forEach(result => {
+                    const option = document.createElement('option');
+                    option.value = result.label;
+                    list.appendChild(option);
+                });
+            } catch (error) {
+                list.innerHTML = '';
+            }
+        }, 200));
     }
 
     initAnimations() {
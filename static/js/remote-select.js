@@ -0,0 +1,17 @@
+// Listes de choix alimentées par un service JSON paginé (utils/widgets.py)
+$(function () {
+    $('select[data-remote-url]').each(function () {
+        const $select = $(this);
+        $select.select2({
+            width: '100%',
+            placeholder: $select.data('placeholder') || '',
+            allowClear: !$select.prop('required') && !$select.prop('multiple'),
+            ajax: {
+                url: $select.data('remote-url'),
+                dataType: 'json',
+                delay: 250,
+                data: params => ({ q: params.term || '', page: params.page || 1 }),
+            },
+        });
+    });
+});
@@ -0,0 +1,22 @@
+from django.core.cache import cache
+
+
+def get_cache_version(namespace):
+    """Retourne la version courante d'un espace de cache"""
+    key = f"cache_version:{namespace}"
+    version = cache.get(key)
+    if version is None:
+        version = 1
+        cache.add(key, version, None)
+    return version
+
+
+def bump_cache_version(namespace):
+    """Invalide toutes les entrées d'un espace de cache en incrémentant sa version"""
+    key = f"cache_version:{namespace}"
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Clé absente ou expirée : repartir d'une version supérieure à la valeur par défaut
+        cache.set(key, 2, None)
+        return 2
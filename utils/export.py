@@ -263,6 +263,68 @@ def export_candidates_to_excel():
     return exporter.get_response(filename)
 
 
+def export_candidate_profile_to_excel(snapshot):
+    """Exporte le profil complet d'un candidat vers Excel, à partir de son snapshot"""
+    profile = snapshot.profile
+    exporter = ExcelExporter("Profil candidat")
+    
+    exporter.add_title(
+        f"Profil de {snapshot.user['full_name']}",
+        profile['current_position'] or None
+    )
+    
+    exporter.add_summary_section("Informations", {
+        'Email': snapshot.user['email'],
+        'Téléphone': profile['mobile_phone'],
+        'Ville': profile['city'],
+        'Pays': profile['country'],
+        'Entreprise': profile['current_company'],
+        'Expérience (années)': profile['years_of_experience'],
+        'Salaire souhaité': f"{profile['expected_salary']} €" if profile['expected_salary'] else '',
+        'Mobilité': 'Oui' if profile['willing_to_relocate'] else 'Non',
+        'Profil (%)': f"{profile['profile_completion']}%",
+        'Candidatures': snapshot.application_stats['total_applications'],
+    })
+    
+    exporter.add_headers(['Poste', 'Entreprise', 'Début', 'Fin', 'Durée (années)'])
+    for experience in snapshot.experiences:
+        exporter.add_data_row([
+            experience['position'],
+            experience['company'],
+            experience['start_date'].strftime('%m/%Y'),
+            'En cours' if experience['is_current'] else (
+                experience['end_date'].strftime('%m/%Y') if experience['end_date'] else ''
+            ),
+            experience['duration_in_years'],
+        ])
+    exporter.current_row += 1
+    
+    exporter.add_headers(['Diplôme', 'Établissement', 'Domaine', 'Niveau', 'Début'])
+    for education in snapshot.educations:
+        exporter.add_data_row([
+            education['degree'],
+            education['institution'],
+            education['field_of_study'],
+            education['degree_level_display'],
+            education['start_date'].strftime('%Y'),
+        ])
+    exporter.current_row += 1
+    
+    exporter.add_headers(['Compétence', 'Niveau', 'Catégorie', 'Années'])
+    for skill in snapshot.skills:
+        exporter.add_data_row([
+            skill['name'], skill['level_display'], skill['category_display'], skill['years_of_experience']
+        ])
+    exporter.current_row += 1
+    
+    exporter.add_headers(['Langue', 'Niveau'])
+    for language in snapshot.languages:
+        exporter.add_data_row([language['language'], language['proficiency_display']])
+    
+    filename = f'profil_{profile["id"]}_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    return exporter.get_response(filename)
+
+
 def export_jobs_to_excel():
     """Exporte les offres d'emploi vers Excel"""
     from apps.jobs.models import Job
@@ -0,0 +1,61 @@
+class DirtyFieldsMixin:
+    """Mixin de modèle qui n'écrit que les champs modifiés depuis le chargement
+
+    Les valeurs lues en base sont mémorisées dans from_db(). Un save() sans
+    update_fields sur une instance existante devient un UPDATE limité aux
+    champs modifiés (plus les champs auto_now), ou n'écrit rien du tout si
+    aucun champ n'a changé. Les valeurs mutables modifiées sur place ne sont
+    pas détectées.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_dirty_fields(self):
+        """Noms des champs modifiés, ou None si l'état chargé est inconnu"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        dirty = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            # Un champ différé puis affecté n'a pas de valeur chargée : il est à écrire
+            if field.attname not in loaded or self.__dict__[field.attname] != loaded[field.attname]:
+                dirty.append(field.name)
+        return dirty
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            dirty = self.get_dirty_fields()
+            if dirty is not None:
+                if not dirty:
+                    return
+                auto_now = [
+                    field.name for field in self._meta.concrete_fields
+                    if getattr(field, 'auto_now', False) and field.name not in dirty
+                ]
+                kwargs['update_fields'] = dirty + auto_now
+        super().save(*args, **kwargs)
+
+        loaded = getattr(self, '_loaded_values', None) or {}
+        update_fields = kwargs.get('update_fields')
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (
+                update_fields is None or field.name in update_fields or field.attname in update_fields
+            ):
+                loaded[field.attname] = self.__dict__[field.attname]
+        self._loaded_values = loaded
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is not None:
+            for field in self._meta.concrete_fields:
+                if field.attname in self.__dict__ and (
+                    fields is None or field.name in fields or field.attname in fields
+                ):
+                    loaded[field.attname] = self.__dict__[field.attname]
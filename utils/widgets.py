@@ -0,0 +1,48 @@
+from django import forms
+
+SELECT2_VERSION = '4.1.0-rc.0'
+
+
+class RemoteSelect(forms.Select):
+    """Liste de choix d'un ModelChoiceField alimentée par un service JSON paginé (Select2)
+
+    Seules les valeurs sélectionnées sont rendues en <option>, chargées par
+    leur clé : le poids de la page et le temps de rendu ne dépendent plus du
+    nombre d'objets proposés. Le service renvoie
+    {'results': [{'id', 'text'}], 'pagination': {'more'}}.
+    """
+
+    def __init__(self, url, placeholder='', attrs=None):
+        super().__init__(attrs)
+        self.url = url
+        self.placeholder = placeholder
+
+    class Media:
+        css = {'all': (f'https://cdn.jsdelivr.net/npm/select2@{SELECT2_VERSION}/dist/css/select2.min.css',)}
+        js = (
+            f'https://cdn.jsdelivr.net/npm/select2@{SELECT2_VERSION}/dist/js/select2.min.js',
+            'js/remote-select.js',
+        )
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.update({'data-remote-url': str(self.url), 'data-placeholder': self.placeholder})
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        """Options des seules valeurs sélectionnées, en une requête sur leurs clés"""
+        selected = [str(v) for v in value if str(v).isdigit()]
+        options = []
+        if not self.allow_multiple_selected and not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        if selected:
+            objects = self.choices.queryset.filter(pk__in=selected)
+            for index, obj in enumerate(objects, start=len(options)):
+                option_value, label = self.choices.choice(obj)
+                options.append(self.create_option(name, option_value, label, True, index))
+        return [(None, options, 0)]
+
+
+class RemoteSelectMultiple(RemoteSelect, forms.SelectMultiple):
+    """Variante à choix multiples de RemoteSelect (ModelMultipleChoiceField)"""
+    allow_multiple_selected = True